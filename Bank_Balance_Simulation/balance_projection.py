@@ -0,0 +1,185 @@
+# balance_projection.py
+#
+# Balance-sheet projection for many entities (branches, subsidiaries) over
+# many periods. Balances live in one array of shape
+# (entities, periods + 1, line items); period 0 is the opening balance.
+#
+# - The line items and their Asset / Liability / Equity classification come
+#   from a dict in the format of `data` in bank_balance_simulation.py.
+# - Balances are projected with monthly growth and runoff rates per item
+#   (optionally per entity and per period) with a cumulative product.
+# - RWA uses a configurable risk-weight table: one weight per item, or per
+#   entity and item, or per period and item.
+# - Consolidation sums entities by group with one reduction over the entity
+#   axis; consolidated ratios are computed from the summed balances and the
+#   summed RWA.
+
+import numpy as np
+import pandas as pd
+
+TYPES = ["Asset", "Liability", "Equity"]
+DEFAULT_DATA = {
+    "Item": ["Loans", "Reserves", "Investments", "Deposits",
+             "Interbank Loans", "Short-term Debt", "Capital"],
+    "Type": ["Asset", "Asset", "Asset", "Liability",
+             "Liability", "Liability", "Equity"],
+}
+DEFAULT_RISK_WEIGHTS = {"Loans": 1.0, "Investments": 0.5, "Reserves": 0.0}
+# Items used by the ratios of bank_balance_simulation.py
+RATIO_ITEMS = {"capital": "Capital", "reserves": "Reserves", "deposits": "Deposits"}
+
+
+# === 1. SCHEMA ===
+
+class BalanceSchema:
+
+    def __init__(self, items, types):
+        unknown = set(types) - set(TYPES)
+        if unknown:
+            raise ValueError(f"Unknown item types: {', '.join(sorted(unknown))}")
+        if len(items) != len(types):
+            raise ValueError("items and types must have the same length")
+        self.items = list(items)
+        self.types = np.asarray(types)
+        self.index = {item: i for i, item in enumerate(self.items)}
+        self.assets = self.types == "Asset"
+        self.liabilities = self.types == "Liability"
+        self.equity = self.types == "Equity"
+
+    @classmethod
+    def from_data(cls, data):
+        # data: {"Item": [...], "Type": [...], ...} like bank_balance_simulation.py
+        return cls(data["Item"], data["Type"])
+
+    def vector(self, values, default=0.0):
+        # Dict {item: value} -> array over the items (missing items = default)
+        unknown = set(values) - set(self.items)
+        if unknown:
+            raise KeyError(f"Unknown line items: {', '.join(sorted(unknown))}")
+        out = np.full(len(self.items), default, dtype=float)
+        for item, value in values.items():
+            out[self.index[item]] = value
+        return out
+
+    def item_array(self, rates):
+        # Dicts become item vectors; arrays are used as given (last axis = items)
+        return self.vector(rates) if isinstance(rates, dict) else np.asarray(rates, dtype=float)
+
+DEFAULT_SCHEMA = BalanceSchema.from_data(DEFAULT_DATA)
+
+
+# === 2. PROJECTION ===
+
+class BalanceProjection:
+
+    def __init__(self, balances, entities=None, groups=None, schema=DEFAULT_SCHEMA):
+        # balances: (entities, periods + 1, items)
+        self.balances = np.asarray(balances, dtype=float)
+        if self.balances.ndim != 3 or self.balances.shape[2] != len(schema.items):
+            raise ValueError(f"Balances must be (entities, periods + 1, {len(schema.items)}), "
+                             f"got {self.balances.shape}")
+        n = self.balances.shape[0]
+        self.entities = list(entities) if entities is not None else [f"Entity {i+1}" for i in range(n)]
+        self.groups = np.asarray(groups) if groups is not None else np.full(n, "Group")
+        self.schema = schema
+
+    @classmethod
+    def project(cls, opening, growth=0.0, runoff=0.0, n_periods=36, entities=None,
+                groups=None, schema=DEFAULT_SCHEMA):
+        # opening: (entities, items) balances, or dict {item: array per entity}
+        # growth, runoff: monthly rates as a dict {item: rate} or an array
+        # broadcastable to (entities, periods, items), e.g. (items,),
+        # (entities, 1, items) or (periods, items).
+        # balance[t] = balance[t-1] * (1 + growth[t] - runoff[t])
+        if isinstance(opening, dict):
+            n = len(np.atleast_1d(next(iter(opening.values()))))
+            opening = np.column_stack([np.broadcast_to(np.asarray(opening.get(item, 0.0), dtype=float), n)
+                                       for item in schema.items])
+        opening = np.atleast_2d(np.asarray(opening, dtype=float))
+        n_entities, n_items = opening.shape
+        factors = np.empty((n_entities, n_periods, n_items))
+        factors[:] = 1 + schema.item_array(growth) - schema.item_array(runoff)
+        np.cumprod(factors, axis=1, out=factors)
+        balances = np.empty((n_entities, n_periods + 1, n_items))
+        balances[:, 0] = opening
+        np.multiply(opening[:, None, :], factors, out=balances[:, 1:])
+        return cls(balances, entities, groups, schema)
+
+    @property
+    def n_periods(self):
+        return self.balances.shape[1] - 1
+
+    def item(self, name):
+        # (entities, periods + 1) balances of one line item
+        return self.balances[..., self.schema.index[name]]
+
+    def totals(self):
+        # Total assets, liabilities and equity, each (entities, periods + 1)
+        return (self.balances @ self.schema.assets,
+                self.balances @ self.schema.liabilities,
+                self.balances @ self.schema.equity)
+
+    def rwa(self, risk_weights=None):
+        # risk_weights: dict {item: weight} (items not listed weigh 0) or an
+        # array broadcastable to (entities, periods + 1, items)
+        weights = self.schema.item_array(DEFAULT_RISK_WEIGHTS if risk_weights is None else risk_weights)
+        return (self.balances * weights).sum(axis=-1)
+
+    def ratios(self, risk_weights=None, rwa=None, ratio_items=None):
+        # Indicators of bank_balance_simulation.py for every entity and period,
+        # as a long DataFrame (Entity, Period, ...)
+        items = {**RATIO_ITEMS, **(ratio_items or {})}
+        assets, liabilities, _ = self.totals()
+        rwa = self.rwa(risk_weights) if rwa is None else rwa
+        capital = self.item(items["capital"])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            columns = {
+                "Total Assets": assets,
+                "Total Liabilities": liabilities,
+                "Equity": assets - liabilities,
+                "RWA": rwa,
+                "Liquidity Ratio": self.item(items["reserves"]) / self.item(items["deposits"]),
+                "Leverage Ratio": assets / capital,
+                "Basel Ratio": capital / rwa,
+            }
+        n_entities, n_dates = assets.shape
+        frame = pd.DataFrame({
+            "Entity": np.repeat(self.entities, n_dates),
+            "Period": np.tile(np.arange(n_dates), n_entities),
+        })
+        for name, values in columns.items():
+            frame[name] = values.ravel()
+        return frame
+
+    # === 3. CONSOLIDATION ===
+
+    def _group_sum(self, values):
+        # Sums the entity axis by group with one reduceat over sorted entities
+        codes, names = pd.factorize(self.groups, sort=True)
+        order = np.argsort(codes, kind="stable")
+        starts = np.flatnonzero(np.r_[True, np.diff(codes[order]) != 0])
+        return np.add.reduceat(values[order], starts, axis=0), list(names)
+
+    def consolidate(self):
+        # New projection with one entity per group (balances summed)
+        balances, names = self._group_sum(self.balances)
+        return BalanceProjection(balances, names, names, self.schema)
+
+    def consolidated_ratios(self, risk_weights=None, ratio_items=None):
+        # Ratios per group: summed balances, and RWA summed from each entity's
+        # own risk weights (so per-entity weight tables are respected)
+        group_rwa, _ = self._group_sum(self.rwa(risk_weights))
+        return self.consolidate().ratios(rwa=group_rwa, ratio_items=ratio_items)
+
+
+def random_network(opening, n_entities=500, n_groups=10, n_periods=36, growth=0.0, runoff=0.0,
+                   seed=None, schema=DEFAULT_SCHEMA):
+    # Synthetic branches scaled around one bank: opening is its balance sheet,
+    # {item: value}; each branch gets a random size and mix around it, and
+    # its growth rates are scaled by a random factor between 0.5 and 1.5.
+    rng = np.random.default_rng(seed)
+    base = schema.vector(opening)
+    opening = base * rng.lognormal(0, 0.5, (n_entities, 1)) * rng.uniform(0.8, 1.2, (n_entities, len(base)))
+    growth = schema.item_array(growth) * rng.uniform(0.5, 1.5, (n_entities, 1, 1))
+    groups = np.char.add("Subsidiary ", rng.integers(1, n_groups + 1, n_entities).astype(str))
+    return BalanceProjection.project(opening, growth, runoff, n_periods, groups=groups, schema=schema)
@@ -1,6 +1,8 @@
-import matplotlib.pyplot as plt
 import pandas as pd
 
+from balance_projection import BalanceProjection, BalanceSchema, random_network
+from stress_engine import breach_summary, random_scenarios, stress_test
+
 # === 1. INPUT DATA ===
 
 # Main entries (R$)
@@ -19,56 +21,122 @@ rw_loans = 1.0
 rw_investments = 0.5
 rw_reserves = 0.0
 
-# === 2. BALANCE SHEET CALCULATION ===
-
-# Assets and liabilities
-total_assets = loans + reserves + investments
-total_liabilities = deposits + interbank_loans + short_term_debt
-equity = total_assets - total_liabilities
-
-# Risk-weighted assets
-risk_weighted_assets = (loans * rw_loans +
-                        investments * rw_investments +
-                        reserves * rw_reserves)
-
-# Financial indicators
-liquidity_ratio = reserves / deposits
-leverage_ratio = total_assets / capital
-basel_index = capital / risk_weighted_assets
-
-# === 3. SUMMARY TABLE ===
-
-data = {
-    "Item": ["Loans", "Reserves", "Investments", "Deposits",
-             "Interbank Loans", "Short-term Debt", "Capital"],
-    "Value (R$)": [loans, reserves, investments, deposits,
-                   interbank_loans, short_term_debt, capital],
-    "Type": ["Asset", "Asset", "Asset", "Liability",
-             "Liability", "Liability", "Equity"]
-}
-df = pd.DataFrame(data)
-
-# === 4. BAR CHART - BALANCE SHEET COMPOSITION ===
-
-colors = {"Asset": "#4CAF50", "Liability": "#F44336", "Equity": "#2196F3"}
-df_sorted = df.sort_values(by="Type", ascending=False)
-
-plt.figure(figsize=(10, 6))
-plt.bar(df_sorted["Item"], df_sorted["Value (R$)"],
-        color=[colors[t] for t in df_sorted["Type"]])
-plt.title("📊 Bank Balance Sheet Composition")
-plt.ylabel("R$ (millions)")
-plt.xticks(rotation=45)
-plt.grid(axis='y', linestyle='--', alpha=0.5)
-plt.tight_layout()
-plt.show()
-
-# === 5. METRICS REPORT ===
-
-print("\n📈 Key Financial Indicators:")
-print(f" - Total Assets: R$ {total_assets:,.2f}")
-print(f" - Total Liabilities: R$ {total_liabilities:,.2f}")
-print(f" - Equity (Net Worth): R$ {equity:,.2f}")
-print(f" - Liquidity Ratio (Reserves / Deposits): {liquidity_ratio:.2f}")
-print(f" - Leverage Ratio (Assets / Capital): {leverage_ratio:.2f}")
-print(f" - Basel Ratio (Capital / RWA): {basel_index:.2%}")
+base = {"deposits": deposits, "loans": loans, "reserves": reserves, "capital": capital,
+        "investments": investments, "interbank_loans": interbank_loans,
+        "short_term_debt": short_term_debt, "rw_loans": rw_loans,
+        "rw_investments": rw_investments, "rw_reserves": rw_reserves}
+
+# Monthly growth and runoff per item for the projection
+growth = {"Loans": 0.010, "Investments": 0.005, "Deposits": 0.008, "Capital": 0.004}
+runoff = {"Loans": 0.004, "Deposits": 0.003, "Short-term Debt": 0.02}
+
+def run(balance=None, n_scenarios=10_000, n_periods=36, n_branches=1_000, seed=42):
+    # balance: items overriding `base` (same keys)
+    b = {**base, **(balance or {})}
+
+    # === 2. BALANCE SHEET CALCULATION ===
+
+    # Assets and liabilities
+    total_assets = b["loans"] + b["reserves"] + b["investments"]
+    total_liabilities = b["deposits"] + b["interbank_loans"] + b["short_term_debt"]
+
+    # Risk-weighted assets
+    risk_weighted_assets = (b["loans"] * b["rw_loans"] +
+                            b["investments"] * b["rw_investments"] +
+                            b["reserves"] * b["rw_reserves"])
+
+    # === 3. SUMMARY TABLE ===
+
+    data = {
+        "Item": ["Loans", "Reserves", "Investments", "Deposits",
+                 "Interbank Loans", "Short-term Debt", "Capital"],
+        "Value (R$)": [b["loans"], b["reserves"], b["investments"], b["deposits"],
+                       b["interbank_loans"], b["short_term_debt"], b["capital"]],
+        "Type": ["Asset", "Asset", "Asset", "Liability",
+                 "Liability", "Liability", "Equity"]
+    }
+
+    # === 4. STRESS TEST ===
+
+    # Random scenarios of deposit runs, loan losses, investment markdowns
+    # and risk-weight increases (see stress_engine.py)
+    stress = stress_test(random_scenarios(n_scenarios, seed=seed), b)
+
+    # === 5. PROJECTION ===
+
+    # Line items and their classification come from `data` (see
+    # balance_projection.py for many entities at once)
+    schema = BalanceSchema.from_data(data)
+    projection = BalanceProjection.project([data["Value (R$)"]], growth=growth, runoff=runoff,
+                                           n_periods=n_periods, schema=schema)
+    risk_weights = {"Loans": b["rw_loans"], "Investments": b["rw_investments"], "Reserves": b["rw_reserves"]}
+    ratios = projection.ratios(risk_weights=risk_weights)
+
+    # Synthetic branches around this bank, consolidated into 10 subsidiaries
+    network = random_network(dict(zip(data["Item"], data["Value (R$)"])), n_entities=n_branches,
+                             n_groups=10, n_periods=n_periods, growth=growth, runoff=runoff,
+                             seed=seed, schema=schema)
+    consolidated = network.consolidated_ratios(risk_weights=risk_weights)
+
+    return {
+        "balance_sheet": pd.DataFrame(data),
+        "total_assets": total_assets,
+        "total_liabilities": total_liabilities,
+        "equity": total_assets - total_liabilities,
+        # Financial indicators
+        "liquidity_ratio": b["reserves"] / b["deposits"],
+        "leverage_ratio": total_assets / b["capital"],
+        "basel_index": b["capital"] / risk_weighted_assets,
+        "stress": stress,
+        "ratios": ratios,
+        "consolidated": consolidated,
+    }
+
+# === 6. BAR CHART - BALANCE SHEET COMPOSITION ===
+
+def plot_composition(resultado):
+    import matplotlib.pyplot as plt
+
+    colors = {"Asset": "#4CAF50", "Liability": "#F44336", "Equity": "#2196F3"}
+    df_sorted = resultado["balance_sheet"].sort_values(by="Type", ascending=False)
+
+    fig = plt.figure(figsize=(10, 6))
+    plt.bar(df_sorted["Item"], df_sorted["Value (R$)"],
+            color=[colors[t] for t in df_sorted["Type"]])
+    plt.title("📊 Bank Balance Sheet Composition")
+    plt.ylabel("R$ (millions)")
+    plt.xticks(rotation=45)
+    plt.grid(axis='y', linestyle='--', alpha=0.5)
+    plt.tight_layout()
+    return [fig]
+
+# === 7. METRICS REPORT ===
+
+def report(resultado):
+    stress, ratios, consolidated = resultado["stress"], resultado["ratios"], resultado["consolidated"]
+    n_periods = ratios["Period"].max()
+    return "\n".join([
+        "\n📈 Key Financial Indicators:",
+        f" - Total Assets: R$ {resultado['total_assets']:,.2f}",
+        f" - Total Liabilities: R$ {resultado['total_liabilities']:,.2f}",
+        f" - Equity (Net Worth): R$ {resultado['equity']:,.2f}",
+        f" - Liquidity Ratio (Reserves / Deposits): {resultado['liquidity_ratio']:.2f}",
+        f" - Leverage Ratio (Assets / Capital): {resultado['leverage_ratio']:.2f}",
+        f" - Basel Ratio (Capital / RWA): {resultado['basel_index']:.2%}",
+        f"\n🧪 Stress Test ({len(stress):,} scenarios):",
+        f" - Median Basel Ratio: {stress['Basel_Ratio'].median():.2%}",
+        f" - 1st percentile Basel Ratio: {stress['Basel_Ratio'].quantile(0.01):.2%}",
+        breach_summary(stress).to_string(formatters={"Share": "{:.2%}".format}),
+        "\n📅 Projected Indicators (every 12 months):",
+        ratios[ratios["Period"] % 12 == 0].drop(columns="Entity").to_string(index=False),
+        f"\n🏢 Consolidated Indicators after {n_periods} months (synthetic branches):",
+        consolidated[consolidated["Period"] == n_periods].drop(columns="Period").to_string(index=False),
+    ])
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    resultado = run()
+    plot_composition(resultado)
+    print(report(resultado))
+    plt.show()
@@ -0,0 +1,225 @@
+# credit_filters.py
+#
+# Indexed filtering for the credit explorer: Age range x Credit_Score range x
+# set of Risk_Levels, on millions of clients, without re-scanning the table
+# on every slider move.
+#
+# - Risk_Level is stored as categorical codes; Age and Credit_Score as
+#   positions in their sorted unique values.
+# - For every numeric column, count / sum / sum of squares are accumulated in
+#   (levels x ages x scores) cubes and turned into 2-D prefix sums, so the
+#   count, sum, mean and standard deviation of any rectangle of ages x scores
+#   take four lookups per level, whatever the number of rows.
+# - Min and max cannot be taken from prefix sums: they are kept per
+#   (level, age, score) cell and a query reduces the cells of its rectangle,
+#   so the cost depends on the number of ages x scores, not of rows.
+#   Quartiles are not available (they would need the rows).
+# - The rows themselves are pre-sorted by (level, age, score): a query slices
+#   each level's age range by binary search and only checks the scores
+#   inside that slice.
+# - Rows with a missing Risk_Level, Age or Credit_Score are left out of the
+#   index: like the mask filters (between / isin), no query can match them.
+# Works with plain pandas; nothing here depends on Jupyter.
+
+import numpy as np
+import pandas as pd
+
+SUMMARY_STATS = ["count", "mean", "std", "min", "max", "sum"]
+DEFAULT_MAX_CELLS = 50_000_000
+
+
+class CreditIndex:
+
+    def __init__(self, df, value_cols=None, age_col="Age", score_col="Credit_Score",
+                 level_col="Risk_Level", max_cells=DEFAULT_MAX_CELLS):
+        self.df = df
+        self.value_cols = list(value_cols) if value_cols is not None else \
+            list(df.select_dtypes("number").columns)
+        # Levels in order of appearance, like df["Risk_Level"].unique();
+        # missing levels get code -1
+        codes, levels = pd.factorize(df[level_col])
+        keep = (codes >= 0) & df[age_col].notna().to_numpy() & df[score_col].notna().to_numpy()
+        self._rows = np.flatnonzero(keep)  # positions in df of the indexed rows
+        self.n_missing = len(df) - len(self._rows)
+        codes = codes[self._rows]
+        self.levels = list(levels)
+        self._level_code = {level: i for i, level in enumerate(self.levels)}
+        self.ages, age_pos = np.unique(df[age_col].to_numpy()[self._rows], return_inverse=True)
+        self.scores, score_pos = np.unique(df[score_col].to_numpy()[self._rows], return_inverse=True)
+        shape = (len(self.levels), len(self.ages), len(self.scores))
+        n_stats = 1 + 5 * len(self.value_cols)
+        if np.prod(shape) * n_stats > max_cells:
+            raise ValueError(f"Index would need {np.prod(shape) * n_stats:,} cells (max {max_cells:,}); "
+                             f"round {age_col}/{score_col} or pass fewer value_cols")
+        self._build_cubes(codes, age_pos, score_pos, shape)
+        self._build_sorted(codes, age_pos, score_pos)
+        self._build_extremes(codes, age_pos, score_pos, shape)
+
+    # === 1. INDEX ===
+
+    def _build_cubes(self, codes, age_pos, score_pos, shape):
+        # stats: rows, then per column (count, sum, sum of squares); values are
+        # shifted by the column mean before squaring to keep the variance
+        # accurate. Prefix sums get a leading zero row/column per axis.
+        cell = (codes * shape[1] + age_pos) * shape[2] + score_pos
+        n_cells = int(np.prod(shape))
+        stats = [np.bincount(cell, minlength=n_cells)]
+        self._shift = {}
+        for col in self.value_cols:
+            values = self.df[col].to_numpy(dtype=float)[self._rows]
+            present = ~np.isnan(values)
+            shift = values[present].mean() if present.any() else 0.0
+            centered = np.where(present, values - shift, 0.0)
+            self._shift[col] = shift
+            stats += [np.bincount(cell, weights=present, minlength=n_cells),
+                      np.bincount(cell, weights=centered, minlength=n_cells),
+                      np.bincount(cell, weights=centered ** 2, minlength=n_cells)]
+        cubes = np.stack(stats).reshape(len(stats), *shape).astype(float)
+        self._prefix = np.zeros((len(stats), shape[0], shape[1] + 1, shape[2] + 1))
+        self._prefix[:, :, 1:, 1:] = cubes.cumsum(axis=2).cumsum(axis=3)
+
+    def _build_sorted(self, codes, age_pos, score_pos):
+        order = np.lexsort((score_pos, age_pos, codes))
+        self._order = self._rows[order]
+        self._sorted_age = age_pos[order]
+        self._sorted_score = score_pos[order]
+        self._level_bounds = np.searchsorted(codes[order], np.arange(len(self.levels) + 1))
+
+    def _build_extremes(self, codes, age_pos, score_pos, shape):
+        # Min / max of every value column per cell, NaN for empty cells. The
+        # sorted rows are grouped by cell, so each is one reduceat.
+        cell = ((codes * shape[1] + age_pos) * shape[2] + score_pos)[np.lexsort((score_pos, age_pos, codes))]
+        starts = np.flatnonzero(np.r_[True, cell[1:] != cell[:-1]]) if len(cell) else np.empty(0, dtype=int)
+        self._min = np.full((len(self.value_cols), int(np.prod(shape))), np.nan)
+        self._max = self._min.copy()
+        for i, col in enumerate(self.value_cols):
+            if len(starts):
+                values = self.df[col].to_numpy(dtype=float)[self._order]
+                # fmin / fmax skip missing values; an all-missing cell stays NaN
+                self._min[i, cell[starts]] = np.fmin.reduceat(values, starts)
+                self._max[i, cell[starts]] = np.fmax.reduceat(values, starts)
+        self._min = self._min.reshape(len(self.value_cols), *shape)
+        self._max = self._max.reshape(len(self.value_cols), *shape)
+
+    def _box(self, age_range, score_range):
+        # Inclusive ranges (like Series.between) -> half-open positions
+        a0 = np.searchsorted(self.ages, age_range[0], side="left")
+        a1 = np.searchsorted(self.ages, age_range[1], side="right")
+        s0 = np.searchsorted(self.scores, score_range[0], side="left")
+        s1 = np.searchsorted(self.scores, score_range[1], side="right")
+        return a0, max(a0, a1), s0, max(s0, s1)
+
+    def _codes(self, risk_levels):
+        if risk_levels is None:
+            return np.arange(len(self.levels))
+        return np.array([self._level_code[l] for l in risk_levels if l in self._level_code], dtype=int)
+
+    # === 2. QUERIES ===
+
+    def _totals(self, age_range, score_range, risk_levels, by_level=False):
+        a0, a1, s0, s1 = self._box(age_range, score_range)
+        # Only the four corners of each selected level (stats, levels, 2, 2)
+        p = self._prefix[np.ix_(np.arange(len(self._prefix)), self._codes(risk_levels), [a0, a1], [s0, s1])]
+        rect = p[:, :, 1, 1] - p[:, :, 0, 1] - p[:, :, 1, 0] + p[:, :, 0, 0]
+        return rect if by_level else rect.sum(axis=1)
+
+    def _extremes(self, age_range, score_range, risk_levels, by_level=False):
+        # (min, max) per value column, each (columns,) or (columns, levels)
+        a0, a1, s0, s1 = self._box(age_range, score_range)
+        codes = self._codes(risk_levels)
+        shape = (len(self.value_cols), len(codes)) if by_level else (len(self.value_cols),)
+        if a0 == a1 or s0 == s1 or not len(codes):
+            return np.full(shape, np.nan), np.full(shape, np.nan)
+        axes = (2, 3) if by_level else (1, 2, 3)
+        return (np.fmin.reduce(self._min[:, codes, a0:a1, s0:s1], axis=axes),
+                np.fmax.reduce(self._max[:, codes, a0:a1, s0:s1], axis=axes))
+
+    def _stats(self, totals, mins, maxs):
+        # SUMMARY_STATS per value column from the summed cubes and the extremes
+        linhas = {}
+        for i, col in enumerate(self.value_cols):
+            n, s, ss = totals[1 + 3 * i: 4 + 3 * i]
+            n = np.rint(n)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mean_c = s / n
+                var = np.maximum(ss - n * mean_c ** 2, 0) / (n - 1)
+            linhas[col] = [n, mean_c + self._shift[col], np.sqrt(var), mins[i], maxs[i], s + n * self._shift[col]]
+        return linhas
+
+    def count(self, age_range, score_range, risk_levels=None):
+        return int(round(self._totals(age_range, score_range, risk_levels)[0]))
+
+    def summary(self, age_range, score_range, risk_levels=None):
+        # count / mean / std / min / max / sum of every value column in the
+        # selection, in the orientation of DataFrame.describe()
+        stats = self._stats(self._totals(age_range, score_range, risk_levels),
+                            *self._extremes(age_range, score_range, risk_levels))
+        return pd.DataFrame(stats, index=SUMMARY_STATS)
+
+    def summary_by_level(self, age_range, score_range, risk_levels=None, stat="mean"):
+        # One row per selected Risk_Level with `stat` of every value column
+        codes = self._codes(risk_levels)
+        totals = self._totals(age_range, score_range, risk_levels, by_level=True)
+        stats = self._stats(totals, *self._extremes(age_range, score_range, risk_levels, by_level=True))
+        k = SUMMARY_STATS.index(stat)
+        return pd.DataFrame({col: v[k] for col, v in stats.items()},
+                            index=pd.Index([self.levels[c] for c in codes], name="Risk_Level"))
+
+    def rows(self, age_range, score_range, risk_levels=None):
+        # The matching rows of the original DataFrame, in their original order
+        a0, a1, s0, s1 = self._box(age_range, score_range)
+        partes = []
+        for code in self._codes(risk_levels):
+            lo, hi = self._level_bounds[code], self._level_bounds[code + 1]
+            # Age range inside the level block by binary search
+            i0 = lo + np.searchsorted(self._sorted_age[lo:hi], a0, side="left")
+            i1 = lo + np.searchsorted(self._sorted_age[lo:hi], a1, side="left")
+            scores = self._sorted_score[i0:i1]
+            partes.append(self._order[i0:i1][(scores >= s0) & (scores < s1)])
+        selected = np.sort(np.concatenate(partes)) if partes else np.empty(0, dtype=int)
+        return self.df.iloc[selected]
+
+
+def random_clients(n_clients=1_000_000, seed=None):
+    # Synthetic clients with the columns of client_credit_risk_base_en.xlsx
+    rng = np.random.default_rng(seed)
+    score = rng.normal(600, 100, n_clients).clip(300, 850).round().astype(int)
+    nivel = np.where(score >= 650, "Low", np.where(score >= 500, "Medium", "High"))
+    pd_ = np.select([nivel == "Low", nivel == "Medium"], [0.02, 0.10], 0.25)
+    lgd = rng.choice([0.3, 0.5, 0.7], n_clients, p=[0.2, 0.6, 0.2])
+    ead = np.round(rng.uniform(1_000, 60_000, n_clients), 2)
+    return pd.DataFrame({
+        "Client_ID": np.arange(1, n_clients + 1),
+        "Age": rng.integers(18, 75, n_clients),
+        "Monthly_Income": np.round(rng.lognormal(8, 0.6, n_clients), 2),
+        "Credit_Score": score,
+        "Risk_Level": nivel,
+        "Loan_Amount": ead,
+        "PD": pd_,
+        "LGD": lgd,
+        "EAD": ead,
+        "Expected_Loss": np.round(pd_ * lgd * ead, 2),
+    })
+
+
+if __name__ == "__main__":
+    import time
+
+    df = random_clients(1_000_000, seed=0)
+    inicio = time.perf_counter()
+    index = CreditIndex(df)
+    print(f"Index of {len(df):,} clients built in {time.perf_counter() - inicio:.2f}s")
+
+    inicio = time.perf_counter()
+    mask = (df["Age"].between(25, 60) & df["Credit_Score"].between(400, 800)
+            & df["Risk_Level"].isin(["Low", "Medium"]))
+    esperado = df[mask].describe()
+    scan = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    summary = index.summary((25, 60), (400, 800), ["Low", "Medium"])
+    consulta = time.perf_counter() - inicio
+    stats = ["count", "mean", "std", "min", "max"]
+    erro = (summary.loc[stats] - esperado.loc[stats]).abs().max().max()
+    print(f"Mask + describe(): {scan * 1000:.0f} ms | index summary: {consulta * 1000:.2f} ms "
+          f"(largest difference {erro:.2e})")
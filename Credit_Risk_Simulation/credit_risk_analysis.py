@@ -0,0 +1,84 @@
+# credit_risk_analysis.py
+#
+# Script version of credit_risk_simulation.ipynb without widgets: loads the
+# client base, summarizes PD / LGD / EAD / Expected Loss by Risk Level and
+# simulates the portfolio loss distribution (see credit_loss.py).
+
+import os
+
+import pandas as pd
+
+from credit_loss import loss_summary, simulate_credit_losses
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+file_path = os.path.join(HERE, "client_credit_risk_base_en.xlsx")
+
+def run(path=file_path, n_scenarios=50_000, correlation=0.15, seed=42):
+    df = pd.read_excel(path)
+    simulation = simulate_credit_losses(df, n_scenarios=n_scenarios, correlation=correlation, seed=seed)
+    return {
+        "clients": df,
+        # Risk level summary (notebook cells 4 and 12)
+        "grouped_stats": df.groupby("Risk_Level")[["PD", "LGD", "EAD", "Expected_Loss"]].mean().round(2),
+        "summary": df.groupby("Risk_Level")["Expected_Loss"].agg(["count", "mean", "sum"]).round(2),
+        "simulation": simulation,
+        "loss_table": loss_summary(simulation),
+    }
+
+def report(resultado):
+    simulation = resultado["simulation"]
+    return "\n".join([
+        f"✅ {len(resultado['clients']):,} clients loaded",
+        "\n📈 Grouped summary by Risk Level:",
+        resultado["grouped_stats"].to_string(),
+        "\n📤 Expected Loss by Risk Level:",
+        resultado["summary"].to_string(),
+        f"\n🎲 {simulation['n_scenarios']:,} scenarios in {simulation['segundos']:.1f}s",
+        resultado["loss_table"].round(2).to_string(),
+    ])
+
+def plot_results(resultado):
+    import matplotlib.pyplot as plt
+
+    df = resultado["clients"]
+    levels = sorted(df["Risk_Level"].unique())
+    figures = []
+
+    # Risk distribution
+    figures.append(plt.figure(figsize=(8, 4)))
+    counts = df["Risk_Level"].value_counts().reindex(levels)
+    plt.bar(counts.index, counts.values, color=plt.cm.coolwarm([0.1, 0.5, 0.9][:len(levels)]))
+    plt.title("Risk Level Distribution")
+
+    # Expected Loss by Risk
+    figures.append(plt.figure(figsize=(8, 5)))
+    plt.boxplot([df.loc[df["Risk_Level"] == level, "Expected_Loss"] for level in levels])
+    plt.xticks(range(1, len(levels) + 1), levels)
+    plt.title("Expected Loss by Risk Level")
+    plt.ylabel("Expected Loss (R$)")
+
+    # Score vs Expected Loss
+    figures.append(plt.figure(figsize=(10, 5)))
+    for level in levels:
+        grupo = df[df["Risk_Level"] == level]
+        plt.scatter(grupo["Credit_Score"], grupo["Expected_Loss"], alpha=0.6, label=level)
+    plt.title("Credit Score vs Expected Loss")
+    plt.legend()
+
+    # Simulated loss distribution
+    figures.append(plt.figure(figsize=(10, 5)))
+    plt.hist(resultado["simulation"]["perdas"].sum(axis=1), bins=100, color="steelblue")
+    plt.axvline(resultado["loss_table"].loc["Total", "Credit_VaR"], color="red", linestyle="--",
+                label="Credit VaR 99.9%")
+    plt.title("Simulated Portfolio Loss Distribution")
+    plt.xlabel("Loss (R$)")
+    plt.legend()
+    return figures
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    resultado = run()
+    print(report(resultado))
+    plot_results(resultado)
+    plt.show()
@@ -0,0 +1,196 @@
+# amortization_store.py
+#
+# Disk-backed schedules for loan books too large for memory. The book is
+# computed loan batch by loan batch with amortization_engine and written
+# either to memory-mapped .npy files (one months x loans matrix per column) or
+# to a Parquet dataset (one long-format file per loan batch). Readers open the
+# book lazily and only touch the slices a lookup needs, e.g. the balance of
+# one loan at one month or one month across every loan.
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from amortization_engine import SCHEDULE_COLUMNS, amortization_arrays, amortization_frame
+
+DEFAULT_BATCH_SIZE = 10_000
+FORMATS = ["memmap", "parquet"]
+METADATA_FILE = "book.json"
+LOANS_FILE = "loans.npz"
+
+
+# === 1. WRITING ===
+
+def _batches(n_loans, batch_size):
+    for start in range(0, n_loans, batch_size):
+        yield start, min(start + batch_size, n_loans)
+
+def write_book(principal, annual_rate, n_periods, path, format="memmap",
+               batch_size=DEFAULT_BATCH_SIZE, columns=SCHEDULE_COLUMNS, progress=None):
+    # Writes the schedules of every loan to the directory `path`. Only one
+    # batch of schedules is in memory at a time. `columns` limits the
+    # output to the columns downstream jobs need (e.g. ["Balance"]).
+    # progress: optional callback(loans_done, n_loans)
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format {format!r}, expected one of {FORMATS}")
+    unknown = set(columns) - set(SCHEDULE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+    principal, annual_rate, n_periods = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(principal, dtype=float)),
+        np.atleast_1d(np.asarray(annual_rate, dtype=float)),
+        np.atleast_1d(np.asarray(n_periods, dtype=np.int64)))
+    n_loans, max_periods = len(principal), int(n_periods.max())
+
+    os.makedirs(path, exist_ok=True)
+    np.savez(os.path.join(path, LOANS_FILE), principal=principal, annual_rate=annual_rate,
+             n_periods=n_periods)
+
+    if format == "memmap":
+        files = {name: np.lib.format.open_memmap(
+                     os.path.join(path, _memmap_name(name)), mode="w+",
+                     dtype=np.float64, shape=(max_periods, n_loans))
+                 for name in columns}
+    for part, (start, end) in enumerate(_batches(n_loans, batch_size)):
+        batch = slice(start, end)
+        if format == "memmap":
+            schedule = amortization_arrays(principal[batch], annual_rate[batch], n_periods[batch])
+            for name in columns:
+                width = schedule[name].shape[1]
+                files[name][:width, batch] = schedule[name].T
+                files[name][width:, batch] = np.nan
+        else:
+            frame = amortization_frame(principal[batch], annual_rate[batch], n_periods[batch])
+            frame["Loan"] += start
+            frame[["Loan", "Month", *columns]].to_parquet(
+                os.path.join(path, _part_name(part)), index=False)
+        if progress is not None:
+            progress(end, n_loans)
+    if format == "memmap":
+        for mm in files.values():
+            mm.flush()
+        del files
+
+    metadata = {"format": format, "n_loans": n_loans, "max_periods": max_periods,
+                "batch_size": batch_size, "columns": list(columns)}
+    with open(os.path.join(path, METADATA_FILE), "w") as f:
+        json.dump(metadata, f, indent=2)
+    return open_book(path)
+
+def _memmap_name(column):
+    return column.lower().replace(" ", "_") + ".npy"
+
+def _part_name(part):
+    return f"part-{part:05d}.parquet"
+
+
+# === 2. READING ===
+
+class _Book:
+
+    def __init__(self, path, metadata):
+        self.path = path
+        self.n_loans = metadata["n_loans"]
+        self.max_periods = metadata["max_periods"]
+        self.batch_size = metadata["batch_size"]
+        self.columns = metadata["columns"]
+        self._loans = None
+
+    @property
+    def loans(self):
+        # Loan inputs (principal, annual_rate, n_periods), loaded on first use
+        if self._loans is None:
+            with np.load(os.path.join(self.path, LOANS_FILE)) as data:
+                self._loans = pd.DataFrame({k: data[k] for k in data.files})
+        return self._loans
+
+    def _check(self, loan=None, month=None, column=None):
+        if loan is not None and not 0 <= loan < self.n_loans:
+            raise IndexError(f"Loan {loan} out of range (0-{self.n_loans - 1})")
+        if month is not None and not 1 <= month <= self.max_periods:
+            raise IndexError(f"Month {month} out of range (1-{self.max_periods})")
+        if column is not None and column not in self.columns:
+            raise KeyError(f"Column {column!r} not in this book ({', '.join(self.columns)})")
+
+
+class MemmapBook(_Book):
+    # Months x loans matrices opened with mmap_mode="r", so a month across
+    # every loan is one contiguous row of the file. A loan's schedule reads
+    # one value per month, a page per month at most, and never the whole file.
+    # array() always returns the loans x months view.
+
+    def __init__(self, path, metadata):
+        super().__init__(path, metadata)
+        self._arrays = {}
+
+    def array(self, column="Balance"):
+        self._check(column=column)
+        if column not in self._arrays:
+            mm = np.load(os.path.join(self.path, _memmap_name(column)), mmap_mode="r")
+            self._arrays[column] = mm.T
+        return self._arrays[column]
+
+    def get(self, loan, month, column="Balance"):
+        # Value of one loan at one month (NaN after the loan's term)
+        self._check(loan, month, column)
+        return float(self.array(column)[loan, month - 1])
+
+    def loan(self, loan):
+        # Full schedule of one loan
+        self._check(loan)
+        term = int(self.loans["n_periods"].iloc[loan])
+        frame = pd.DataFrame({"Month": np.arange(1, term + 1)})
+        for name in self.columns:
+            frame[name] = self.array(name)[loan, :term]
+        return frame
+
+    def month(self, month, column="Balance"):
+        # One column for every loan at a given month
+        self._check(month=month, column=column)
+        return np.array(self.array(column)[:, month - 1])
+
+
+class ParquetBook(_Book):
+    # One Parquet file per loan batch, sorted by loan and month: a loan lookup
+    # opens only the file of its batch, a month lookup reads only the needed
+    # columns of every file
+
+    def _read(self, files, columns, filters):
+        import pyarrow.parquet as pq
+
+        tables = [pq.read_table(os.path.join(self.path, f), columns=columns, filters=filters)
+                  for f in files]
+        return pd.concat([t.to_pandas() for t in tables], ignore_index=True)
+
+    def _files(self):
+        n_parts = -(-self.n_loans // self.batch_size)
+        return [_part_name(p) for p in range(n_parts)]
+
+    def get(self, loan, month, column="Balance"):
+        self._check(loan, month, column)
+        frame = self._read([_part_name(loan // self.batch_size)], [column],
+                           [("Loan", "==", loan), ("Month", "==", month)])
+        return float(frame[column].iloc[0]) if len(frame) else float("nan")
+
+    def loan(self, loan):
+        self._check(loan)
+        frame = self._read([_part_name(loan // self.batch_size)], ["Month", *self.columns],
+                           [("Loan", "==", loan)])
+        return frame.sort_values("Month", ignore_index=True)
+
+    def month(self, month, column="Balance"):
+        self._check(month=month, column=column)
+        frame = self._read(self._files(), ["Loan", column], [("Month", "==", month)])
+        values = np.full(self.n_loans, np.nan)
+        values[frame["Loan"].to_numpy()] = frame[column].to_numpy()
+        return values
+
+
+def open_book(path):
+    with open(os.path.join(path, METADATA_FILE)) as f:
+        metadata = json.load(f)
+    if metadata["format"] == "memmap":
+        return MemmapBook(path, metadata)
+    return ParquetBook(path, metadata)
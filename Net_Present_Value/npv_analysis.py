@@ -1,51 +1,73 @@
 # npv_irr_analysis.py
+#
+# Usage: python npv_analysis.py [input] [-o output] [--no-cache]
+# Input and output may be .xlsx, .csv, .parquet or .feather/.arrow
 
-import pandas as pd
-import numpy as np
-import numpy_financial as npf  # substituto oficial para npv e irr
-
-# Load Excel file
-file_path = "C:/Users/pedro/OneDrive/Área de Trabalho/Códigos/3net present value/project_cashflows.xlsx"  # Update if necessary
-df = pd.read_excel(file_path)
-
-# Prepare empty result table
-projects = df['Project'].unique()
-resultados = []
-
-# Calculate metrics for each project
-for projeto in projects:
-    dados = df[df['Project'] == projeto].sort_values('Year')
-    cashflows = dados['Cash_Flow'].values
-    rate = dados['Discount_Rate'].iloc[0]
-
-    # NPV
-    npv = npf.npv(rate, cashflows)
-
-    # IRR
-    try:
-        irr = npf.irr(cashflows)
-    except:
-        irr = None
-
-    # Payback: ano em que o saldo acumulado fica positivo
-    cumulative = np.cumsum(cashflows)
-    payback = next((i for i, val in enumerate(cumulative) if val >= 0), None)
-
-    # ROI
-    total_investment = -cashflows[0]
-    total_return = np.sum(cashflows[1:])
-    roi = (total_return - total_investment) / total_investment
-
-    resultados.append({
-        "Project": projeto,
-        "NPV": round(npv, 2),
-        "IRR": round(irr, 4) if irr is not None else None,
-        "Payback_Year": payback,
-        "ROI": round(roi, 4)
-    })
-
-# Convert to DataFrame and export
-df_result = pd.DataFrame(resultados)
-df_result.to_excel("project_financial_summary.xlsx", index=False)
-print("✅ Analysis complete. File 'project_financial_summary.xlsx' generated.")
-df_result
+import argparse
+import os
+import time
+
+from npv_engine import evaluate_projects
+from npv_io import read_table, write_table
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run(path=os.path.join(HERE, "project_cashflows.xlsx"), use_cache=True):
+    # Load cash flows
+    inicio = time.perf_counter()
+    df = read_table(path, use_cache=use_cache)
+    leitura = time.perf_counter() - inicio
+
+    # Calculate metrics for all projects at once (see npv_engine.py)
+    return {"summary": evaluate_projects(df), "leitura": leitura}
+
+
+def report(resultado, top=20):
+    df_result = resultado["summary"]
+    linhas = [f"{len(df_result):,} projects (input read in {resultado['leitura']:.2f}s)",
+              df_result.sort_values("NPV", ascending=False).head(top).to_string(index=False)]
+    if len(df_result) > top:
+        linhas.append(f"... top {top} by NPV")
+    return "\n".join(linhas)
+
+
+def plot_results(resultado, top=20):
+    # NPV of the projects with the largest absolute NPV
+    import matplotlib.pyplot as plt
+
+    df_result = resultado["summary"]
+    df_plot = df_result.loc[df_result["NPV"].abs().sort_values(ascending=False).index[:top]]
+    fig, ax = plt.subplots(figsize=(10, 5))
+    ax.bar(df_plot["Project"].astype(str), df_plot["NPV"],
+           color=["seagreen" if v >= 0 else "indianred" for v in df_plot["NPV"]])
+    ax.axhline(0, color="black", linewidth=1)
+    ax.set_title("NPV by Project")
+    ax.set_ylabel("NPV (R$)")
+    ax.tick_params(axis="x", rotation=45)
+    fig.tight_layout()
+    return [fig]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NPV, IRR, payback and ROI for every project in a cash-flow table")
+    parser.add_argument("input", nargs="?", default=os.path.join(HERE, "project_cashflows.xlsx"),
+                        help="Cash flows with columns Project, Year, Cash_Flow, Discount_Rate")
+    parser.add_argument("-o", "--output", default="project_financial_summary.xlsx",
+                        help="Summary file (default: project_financial_summary.xlsx)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always parse Excel inputs instead of using the cached columnar copy")
+    args = parser.parse_args(argv)
+
+    resultado = run(args.input, use_cache=not args.no_cache)
+    df_result = resultado["summary"]
+
+    # Export
+    write_table(df_result, args.output)
+    print(f"✅ Analysis complete. File '{args.output}' generated "
+          f"({len(df_result):,} projects, input read in {resultado['leitura']:.2f}s).")
+    return df_result
+
+
+if __name__ == "__main__":
+    main()
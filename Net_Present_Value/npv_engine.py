@@ -0,0 +1,205 @@
+# npv_engine.py
+#
+# NPV, IRR, payback and ROI for many projects at once. The long table
+# (Project, Year, Cash_Flow, Discount_Rate) is pivoted a single time into a
+# padded projects x years matrix, and every metric is an array operation over
+# that matrix instead of a filter + sort per project.
+#
+# IRR is solved for all projects together. NPV as a function of
+# x = 1/(1+rate) is the polynomial sum(CF_t * x^t); its sign is scanned on a
+# grid of rates to bracket every root, and each bracket is refined with Newton
+# steps that fall back to bisection when a step leaves the bracket. Like
+# npf.irr, the root closest to a zero rate is returned. Projects whose cash
+# flows have more than one IRR, none, or that did not converge are flagged in
+# IRR_Status.
+
+import numpy as np
+import pandas as pd
+
+CASHFLOW_COLUMNS = ["Project", "Year", "Cash_Flow", "Discount_Rate"]
+IRR_STATUS = ["ok", "multiple", "no_root", "not_converged"]
+IRR_RATE_RANGE = (-0.99, 100.0)  # roots outside this range are not searched
+IRR_GRID_POINTS = 256
+DEFAULT_CHUNK_SIZE = 4_096
+
+
+# === 1. PIVOT ===
+
+def pivot_cashflows(df):
+    # Returns (projects, cash, lengths, rates): cash is (projects, years),
+    # zero-padded after each project's last year, with years in ascending
+    # order; rates is the discount rate of each project's first year.
+    # Projects keep the order of df['Project'].unique().
+    missing = set(CASHFLOW_COLUMNS) - set(df.columns)
+    if missing:
+        raise ValueError(f"Missing cash-flow columns: {', '.join(sorted(missing))}")
+    codes, projects = pd.factorize(df["Project"])
+    years = df["Year"].to_numpy()
+    order = np.lexsort((years, codes))
+    codes = codes[order]
+    lengths = np.bincount(codes, minlength=len(projects))
+    starts = np.cumsum(lengths) - lengths
+    positions = np.arange(len(codes)) - starts[codes]
+
+    cash = np.zeros((len(projects), lengths.max() if len(codes) else 0))
+    cash[codes, positions] = df["Cash_Flow"].to_numpy(dtype=float)[order]
+    rates = df["Discount_Rate"].to_numpy(dtype=float)[order][starts]
+    return projects, cash, lengths, rates
+
+
+# === 2. METRICS ===
+
+def npv_batch(cash, rates):
+    # Same formula as npf.npv: sum(CF_t / (1+rate)^t), t = 0..n
+    t = np.arange(cash.shape[1])
+    return (cash / (1 + np.asarray(rates, dtype=float)[:, None]) ** t).sum(axis=1)
+
+def payback_batch(cash):
+    # First year (position) where the cumulative cash flow is >= 0, -1 if never.
+    # Zero padding keeps the cumulative sum flat, so it never adds a payback.
+    reached = np.cumsum(cash, axis=1) >= 0
+    return np.where(reached.any(axis=1), reached.argmax(axis=1), -1)
+
+def roi_batch(cash):
+    total_investment = -cash[:, 0]
+    total_return = cash[:, 1:].sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (total_return - total_investment) / total_investment
+
+
+# === 3. IRR ===
+
+def _polyval(cash, x):
+    # Horner evaluation of p(x) = sum(CF_t x^t) and p'(x) for every project
+    # (rows of cash) at the points x (same number of rows)
+    p = np.zeros_like(x)
+    dp = np.zeros_like(x)
+    for t in range(cash.shape[1] - 1, -1, -1):
+        dp *= x
+        dp += p
+        p *= x
+        p += cash[:, t, None]
+    return p, dp
+
+def _refine(cash, lo, hi, tol, maxiter):
+    # Safeguarded Newton inside brackets [lo, hi] (one column per candidate
+    # root); returns the roots in x and a convergence mask
+    p_lo, _ = _polyval(cash, lo.copy())
+    x = (lo + hi) / 2
+    converged = np.zeros(x.shape, dtype=bool)
+    for _ in range(maxiter):
+        p, dp = _polyval(cash, x.copy())
+        # Keep the half of the bracket that still has the sign change
+        same = np.sign(p) == np.sign(p_lo)
+        lo = np.where(same, x, lo)
+        p_lo = np.where(same, p, p_lo)
+        hi = np.where(same, hi, x)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = x - p / dp
+        inside = (newton > lo) & (newton < hi)
+        x_new = np.where(inside, newton, (lo + hi) / 2)
+        converged = (np.abs(x_new - x) <= tol * x) | (p == 0)
+        x = np.where(p == 0, x, x_new)
+        if converged.all():
+            break
+    return x, converged
+
+def irr_batch(cash, tol=1e-12, maxiter=100, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Returns (irr, status, n_roots) per project. irr is NaN when no root was
+    # found in IRR_RATE_RANGE. Two roots closer than one grid step (about 2%
+    # in 1+rate) fall in the same bracket and are not told apart.
+    cash = np.asarray(cash, dtype=float)
+    n = len(cash)
+    irr = np.full(n, np.nan)
+    status = np.full(n, "no_root", dtype=object)
+    n_roots = np.zeros(n, dtype=np.int64)
+    lo_rate, hi_rate = IRR_RATE_RANGE
+    # Grid in x = 1/(1+rate), increasing; x = 1 (rate 0) is one of the points
+    grid = np.unique(np.concatenate([
+        np.geomspace(1 / (1 + hi_rate), 1 / (1 + lo_rate), IRR_GRID_POINTS), [1.0]]))
+
+    for start in range(0, n, chunk_size):
+        block = cash[start:start + chunk_size]
+        rows = np.arange(len(block))
+        p, _ = _polyval(block, np.broadcast_to(grid, (len(block), len(grid))).copy())
+        change = (p[:, :-1] >= 0) != (p[:, 1:] >= 0)
+        n_roots[start:start + len(block)] = change.sum(axis=1)
+
+        # Candidate brackets: the nearest sign change at rate >= 0 (x <= 1)
+        # and the nearest one at rate < 0 (x > 1); the closest root to zero
+        # is one of the two
+        cell = np.arange(len(grid) - 1)
+        below = np.where(change & (grid[1:] <= 1), cell, -1).max(axis=1)
+        above = np.where(change & (grid[:-1] >= 1), cell, len(grid)).min(axis=1)
+        candidates = np.stack([below, above], axis=1)
+        valid = (candidates >= 0) & (candidates < len(grid) - 1)
+        cells = np.clip(candidates, 0, len(grid) - 2)
+        x, converged = _refine(block, grid[cells], grid[cells + 1], tol, maxiter)
+
+        rate = np.where(valid, 1 / x - 1, np.inf)
+        best = np.abs(rate).argmin(axis=1)
+        found = valid[rows, best]
+        chunk_irr = np.where(found, rate[rows, best], np.nan)
+        chunk_status = np.where(n_roots[start:start + len(block)] > 1, "multiple", "ok").astype(object)
+        chunk_status[~converged[rows, best]] = "not_converged"
+        chunk_status[~found] = "no_root"
+        irr[start:start + len(block)] = chunk_irr
+        status[start:start + len(block)] = chunk_status
+    return irr, status, n_roots
+
+
+# === 4. SUMMARY ===
+
+def evaluate_projects(df):
+    # Same columns as the summary of npv_analysis.py, plus IRR_Status
+    projects, cash, lengths, rates = pivot_cashflows(df)
+    irr, status, _ = irr_batch(cash)
+    payback = payback_batch(cash)
+    return pd.DataFrame({
+        "Project": projects,
+        "NPV": np.round(npv_batch(cash, rates), 2),
+        "IRR": np.round(irr, 4),
+        "Payback_Year": pd.Series(payback, dtype="Int64").mask(payback < 0),
+        "ROI": np.round(roi_batch(cash), 4),
+        "IRR_Status": status,
+    })
+
+
+# === 5. VERIFICATION ===
+
+def random_cashflows(n_projects=10_000, max_years=15, seed=0):
+    # Synthetic long table in the format of project_cashflows.xlsx, with a
+    # share of non-conventional projects (negative flows after year 0)
+    rng = np.random.default_rng(seed)
+    years = rng.integers(2, max_years + 1, n_projects)
+    project = np.repeat(np.arange(n_projects), years)
+    year = np.arange(years.sum()) - np.repeat(np.cumsum(years) - years, years)
+    flows = rng.normal(20_000, 15_000, len(year)).round()
+    flows[year == 0] = -rng.uniform(30_000, 150_000, n_projects).round()
+    return pd.DataFrame({
+        "Project": np.char.add("Projeto ", project.astype(str)),
+        "Year": year,
+        "Cash_Flow": flows,
+        "Discount_Rate": np.repeat(rng.choice([0.08, 0.1, 0.12, 0.15], n_projects), years),
+    })
+
+def check_against_npf(n_projects=2_000, seed=0):
+    # Largest differences vs. the per-project numpy_financial loop, over
+    # the projects both methods give a single IRR for
+    import numpy_financial as npf
+
+    df = random_cashflows(n_projects, seed=seed)
+    result = evaluate_projects(df).set_index("Project")
+    projects, cash, lengths, rates = pivot_cashflows(df)
+    worst_npv = worst_irr = 0.0
+    for i, projeto in enumerate(projects):
+        cashflows = cash[i, :lengths[i]]
+        worst_npv = max(worst_npv, abs(result.at[projeto, "NPV"] - round(npf.npv(rates[i], cashflows), 2)))
+        irr = npf.irr(cashflows)
+        if result.at[projeto, "IRR_Status"] == "ok" and IRR_RATE_RANGE[0] <= irr <= IRR_RATE_RANGE[1]:
+            worst_irr = max(worst_irr, abs(result.at[projeto, "IRR"] - round(irr, 4)))
+    return worst_npv, worst_irr
+
+if __name__ == "__main__":
+    worst_npv, worst_irr = check_against_npf()
+    print(f"Largest difference vs. numpy_financial: NPV {worst_npv:.2f} | IRR {worst_irr:.4f}")
@@ -0,0 +1,111 @@
+# npv_io.py
+#
+# Reading and writing the cash-flow and summary tables by file extension:
+# CSV, Parquet, Arrow/Feather and Excel. Parsing xlsx with openpyxl is by far
+# the slowest step, so an Excel input is converted once into a Feather copy in
+# a cache directory. Later runs read the copy as long as the workbook is
+# unchanged: same size and modification time, or, if only the modification
+# time changed (e.g. the file was copied), the same SHA-256 hash.
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".xlsx": "excel",
+    ".xls": "excel",
+}
+CACHE_DIR = ".npv_cache"
+
+
+def table_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Unsupported file type {ext!r}, expected one of {', '.join(FORMATS)}")
+    return FORMATS[ext]
+
+
+# === 1. XLSX CACHE ===
+
+def _file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _cache_paths(path, cache_dir):
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR)
+    # The absolute path goes into the name so same-named workbooks in
+    # different folders never share a cache entry
+    key = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:16]
+    stem = f"{os.path.splitext(os.path.basename(path))[0]}-{key}"
+    return os.path.join(cache_dir, stem + ".feather"), os.path.join(cache_dir, stem + ".json")
+
+def _has_pyarrow():
+    # Feather needs pyarrow; without it the workbook is parsed on every run
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _read_excel_cached(path, cache_dir=None):
+    # Returns (df, hit)
+    data_path, meta_path = _cache_paths(path, cache_dir)
+    stat = os.stat(path)
+    meta = None
+    if os.path.exists(data_path) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta["size"] == stat.st_size and meta["mtime_ns"] == stat.st_mtime_ns:
+            return pd.read_feather(data_path), True
+
+    digest = _file_hash(path)
+    if meta is not None and meta["sha256"] == digest:
+        df = pd.read_feather(data_path)
+        hit = True
+    else:
+        df = pd.read_excel(path)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        df.to_feather(data_path)
+        hit = False
+    with open(meta_path, "w") as f:
+        json.dump({"source": os.path.abspath(path), "size": stat.st_size,
+                   "mtime_ns": stat.st_mtime_ns, "sha256": digest}, f, indent=2)
+    return df, hit
+
+
+# === 2. READ / WRITE ===
+
+def read_table(path, use_cache=True, cache_dir=None):
+    # Loads a table by extension. Excel inputs go through the Feather cache
+    # unless use_cache=False (or pyarrow is not installed).
+    fmt = table_format(path)
+    if fmt == "csv":
+        return pd.read_csv(path)
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    if fmt == "feather":
+        return pd.read_feather(path)
+    if use_cache and _has_pyarrow():
+        return _read_excel_cached(path, cache_dir)[0]
+    return pd.read_excel(path)
+
+def write_table(df, path):
+    fmt = table_format(path)
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        df.to_parquet(path, index=False)
+    elif fmt == "feather":
+        df.reset_index(drop=True).to_feather(path)
+    else:
+        df.to_excel(path, index=False)
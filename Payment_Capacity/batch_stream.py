@@ -0,0 +1,117 @@
+# batch_stream.py
+#
+# Streaming mode for the CSV batch: the input is read in fixed-size chunks,
+# each chunk is scored with score_batch and appended to the output file, so
+# peak memory depends on the chunk size and not on the size of the input.
+
+import os
+
+import pandas as pd
+
+from scoring import INPUT_COLUMNS, score_batch
+
+DEFAULT_CHUNKSIZE = 50_000
+OUTPUT_FORMATS = ["csv", "parquet"]
+
+
+class _CsvSink:
+    def __init__(self, path):
+        self.path = path
+        self.header = True
+
+    def write(self, frame):
+        frame.to_csv(self.path, mode="w" if self.header else "a", header=self.header)
+        self.header = False
+
+    def close(self):
+        # Every write opens and closes the file itself
+        pass
+
+
+class _ParquetSink:
+    def __init__(self, path):
+        # pyarrow is only needed for Parquet output
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._pq = pq
+        self.path = path
+        self.writer = None
+
+    def write(self, frame):
+        table = self._pa.Table.from_pandas(frame, preserve_index=True)
+        if self.writer is None:
+            self.writer = self._pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def _source_size(handle):
+    size = getattr(handle, "size", None)  # Streamlit UploadedFile
+    if size is None:
+        pos = handle.tell()
+        size = handle.seek(0, os.SEEK_END)
+        handle.seek(pos)
+    return size
+
+
+def _read_chunks(handle, chunksize):
+    # Only the columns the rules use are parsed. A 0-byte file has no header
+    # and yields no chunk; a header-only file yields one empty chunk.
+    try:
+        reader = pd.read_csv(handle, chunksize=chunksize, usecols=INPUT_COLUMNS + ["valor_garantia"])
+    except pd.errors.EmptyDataError:
+        return
+    with reader:
+        yield from reader
+
+
+def stream_scores(source, out_path, fmt="csv", chunksize=DEFAULT_CHUNKSIZE, progress=None):
+    # source: path or binary file-like object with the batch CSV
+    # progress: optional callback(fraction_done, rows_done)
+    # Returns the number of rows scored and the rating counts. The output has
+    # the columns of score_batch, indexed by Company (1-based), even when the
+    # input has no rows.
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}, expected one of {OUTPUT_FORMATS}")
+
+    own_handle = isinstance(source, (str, os.PathLike))
+    handle = open(source, "rb") if own_handle else source
+    total_bytes = _source_size(handle)
+    sink = _CsvSink(out_path) if fmt == "csv" else _ParquetSink(out_path)
+    rating_counts = pd.Series(0, index=["A", "B", "C", "D"])
+    rows_done = 0
+    n_chunks = 0
+
+    try:
+        for chunk in _read_chunks(handle, chunksize):
+            result = score_batch(chunk)
+            result.index = pd.RangeIndex(rows_done + 1, rows_done + len(result) + 1, name="Company")
+            sink.write(result)
+
+            n_chunks += 1
+            rows_done += len(result)
+            rating_counts = rating_counts.add(result["Rating"].value_counts(), fill_value=0)
+            if progress is not None:
+                # The parser reads ahead, so the byte position is approximate
+                fraction = min(handle.tell() / total_bytes, 1.0) if total_bytes else 0.0
+                progress(fraction, rows_done)
+
+        if not n_chunks:
+            # Empty file: write the output columns anyway, so the result is a
+            # readable CSV/Parquet file with zero rows
+            empty = score_batch(pd.DataFrame({c: pd.Series(dtype=float) for c in INPUT_COLUMNS + ["valor_garantia"]}))
+            empty.index = pd.RangeIndex(1, 1, name="Company")
+            sink.write(empty)
+    finally:
+        sink.close()
+        if own_handle:
+            handle.close()
+
+    if progress is not None:
+        progress(1.0, rows_done)
+    return rows_done, rating_counts.astype(int)
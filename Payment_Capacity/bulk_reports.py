@@ -0,0 +1,74 @@
+# bulk_reports.py
+#
+# One PDF report per company of a CSV batch, rendered in parallel across a
+# process pool and written into a single ZIP file as the reports come back.
+
+import itertools
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from matplotlib.figure import Figure
+
+from report_cache import REPORT_INPUTS, build_report
+
+# Per-worker figures, created once by the pool initializer and cleared after
+# every chart instead of building a new Figure per report
+_bar_fig = None
+_radar_fig = None
+
+
+def _init_worker():
+    global _bar_fig, _radar_fig
+    _bar_fig = Figure(figsize=(10, 5))
+    _radar_fig = Figure()
+
+
+def _render_company(item):
+    number, data = item
+    report = build_report(data, bar_fig=_bar_fig, radar_fig=_radar_fig)
+    return f"company_{number:06d}_{report['rating']}.pdf", report["pdf"]
+
+
+def export_reports_zip(df, out, max_workers=None, batch_size=None, progress=None):
+    # df: batch DataFrame with the REPORT_INPUTS columns
+    # out: path or binary file-like object for the ZIP
+    # progress: optional callback(reports_done, total_reports)
+    # Returns the number of reports, elapsed seconds and reports per second.
+    missing = [c for c in REPORT_INPUTS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns for the reports: {', '.join(missing)}")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    # Tasks are submitted one batch at a time so only a bounded number of
+    # finished PDFs waits in memory before being written to the ZIP
+    batch_size = batch_size or max_workers * 16
+    total = len(df)
+    done = 0
+    start = time.perf_counter()
+
+    # spawn instead of fork: forking the multi-threaded Streamlit server is unsafe
+    context = multiprocessing.get_context("spawn")
+    # PDFs are already compressed, so they are stored without deflating again
+    with ProcessPoolExecutor(max_workers, mp_context=context, initializer=_init_worker) as pool, \
+            zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED) as archive:
+        companies = enumerate(df[REPORT_INPUTS].to_dict("records"), start=1)
+        while True:
+            batch = list(itertools.islice(companies, batch_size))
+            if not batch:
+                break
+            chunksize = max(1, len(batch) // (max_workers * 4))
+            for name, pdf in pool.map(_render_company, batch, chunksize=chunksize):
+                archive.writestr(name, pdf)
+                done += 1
+            if progress is not None:
+                progress(done, total)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "reports": done,
+        "seconds": elapsed,
+        "reports_per_second": done / elapsed if elapsed > 0 else float("inf"),
+    }
@@ -2,54 +2,23 @@
 
 import streamlit as st
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from fpdf import FPDF
-import tempfile
-import io
+import os
+
+from scoring import INDICATOR_NAMES, score_batch
+from batch_stream import DEFAULT_CHUNKSIZE, OUTPUT_FORMATS, stream_scores
+from outputs import discard, new_output_path
+from report_cache import ReportCache
+from bulk_reports import export_reports_zip
 
 st.set_page_config(page_title="Payment Capacity Analysis - Agribusiness Sector", layout="wide")
 st.title("🏦 Corporate Payment Capacity Analysis")
 
 tabs = st.tabs(["📋 Manual Input", "📁 Import CSV Batch"])
 
-# Helper functions
-def safe_div(n, d):
-    return round(n / d, 2) if d else None
-
-def normalize(v, mi, ma):
-    return max(0, min((v - mi) / (ma - mi), 1)) if v is not None else 0
-
-def calculate_indicators(row):
-    indicators = {}
-    indicators["Current Liquidity"] = safe_div(row["ativo_circulante"], row["passivo_circulante"])
-    indicators["Quick Ratio"] = safe_div(row["ativo_circulante"] - row["estoques"], row["passivo_circulante"])
-    indicators["Immediate Liquidity"] = safe_div(row["disponivel"], row["passivo_circulante"])
-    indicators["Total Debt Ratio"] = safe_div(row["passivo_total"], row["ativo_total"])
-    indicators["ROE"] = safe_div(row["lucro_liquido"], row["patrimonio_liquido"])
-    indicators["DSCR"] = safe_div(row["fluxo_caixa_operacional"], row["servico_divida"])
-    indicators["Interest Coverage"] = safe_div(row["ebitda"], row["servico_divida"])
-    return indicators
-
-def classify_rating(ind):
-    score = 0
-    if ind["Current Liquidity"] is not None:
-        score += 3 if ind["Current Liquidity"] >= 1.5 else 2 if ind["Current Liquidity"] >= 1 else 1
-    if ind["Total Debt Ratio"] is not None:
-        score += 3 if ind["Total Debt Ratio"] <= 0.5 else 2 if ind["Total Debt Ratio"] <= 0.7 else 1
-    if ind["DSCR"] is not None:
-        score += 6 if ind["DSCR"] >= 2 else 4 if ind["DSCR"] >= 1.2 else 2
-    if ind["ROE"] is not None:
-        score += 3 if ind["ROE"] >= 0.15 else 2 if ind["ROE"] >= 0.05 else 1
-
-    if score >= 14:
-        return "A", 0.90
-    elif score >= 10:
-        return "B", 0.75
-    elif score >= 7:
-        return "C", 0.50
-    else:
-        return "D", 0.00
+@st.cache_resource
+def get_report_cache():
+    # One report cache per server process, shared by every session
+    return ReportCache()
 
 # Variable to store the PDF
 pdf_bytes = None
@@ -86,9 +55,10 @@ with tabs[0]:
             "servico_divida": servico_divida,
             "ebitda": ebitda
         }
-        indicators = calculate_indicators(data)
-        rating, coverage_pct = classify_rating(indicators)
-        accepted_value = valor_garantia * coverage_pct
+        report, cache_hit = get_report_cache().get_or_build({**data, "valor_garantia": valor_garantia})
+        indicators = report["indicators"]
+        rating, coverage_pct = report["rating"], report["coverage_pct"]
+        accepted_value = report["accepted_value"]
 
         st.subheader("📊 Calculated Indicators")
         for name, value in indicators.items():
@@ -101,99 +71,126 @@ with tabs[0]:
         st.markdown(f"📉 Bank's Accepted Coverage: {coverage_pct * 100:.0f}%")
 
         st.subheader("📈 Indicator Bar Chart")
-        fig_bar, ax = plt.subplots(figsize=(10, 5))
-        ax.bar(indicators.keys(), [v if v is not None else 0 for v in indicators.values()])
-        ax.set_xticks(range(len(indicators)))
-        ax.set_xticklabels(indicators.keys(), rotation=30, ha="right")
-        st.pyplot(fig_bar)
+        st.image(report["bar_png"])
 
         st.markdown("This bar chart shows the individual distribution of each financial indicator. Higher liquidity and DSCR values indicate better financial health. High debt signals risk.")
 
         st.subheader("🕸️ Performance Radar")
-        radar_vals = [
-            normalize(indicators["Current Liquidity"], 0, 3),
-            normalize(indicators["DSCR"], 0, 3),
-            normalize(indicators["ROE"], 0, 0.3),
-            normalize(1 - indicators["Total Debt Ratio"], 0, 1),
-            normalize(indicators["Interest Coverage"], 0, 5),
-        ]
-        labels = ["Liquidity", "DSCR", "ROE", "Solvency", "Coverage"]
-        radar_vals += radar_vals[:1]
-        angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
-        angles += angles[:1]
-        fig_radar = plt.figure()
-        ax = plt.subplot(111, polar=True)
-        ax.plot(angles, radar_vals, "o-", linewidth=2)
-        ax.fill(angles, radar_vals, alpha=0.25)
-        ax.set_thetagrids(np.degrees(angles[:-1]), labels)
-        st.pyplot(fig_radar)
+        st.image(report["radar_png"])
 
         st.markdown("The radar chart summarizes the company's overall performance. Ideally, all areas should be evenly filled, indicating financial balance. Retracted areas suggest specific weaknesses.")
 
         st.subheader("🧐 Recommendations")
-        recommendations = []
-        if rating == "D": recommendations.append("❌ Avoid credit approval.")
-        if rating == "C": recommendations.append("⚠️ Real collateral required.")
-        if indicators["DSCR"] and indicators["DSCR"] < 1.2:
-            recommendations.append("🔴 Limited payment capacity.")
-        if recommendations:
-            for r in recommendations:
+        if report["recommendations"]:
+            for r in report["recommendations"]:
                 st.markdown(f"- {r}")
         else:
             st.markdown("No critical recommendations.")
 
-        # Save chart images
-        bar_path = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-        fig_bar.savefig(bar_path.name, bbox_inches="tight")
-
-        radar_path = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-        fig_radar.savefig(radar_path.name, bbox_inches="tight")
-
-        # Generate PDF
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", size=12)
-        pdf.cell(0, 10, "Payment Capacity Analysis Report", ln=True)
-        pdf.ln(5)
-        for name, value in indicators.items():
-            if value is not None:
-                text = f"{name}: {value:.2f}".encode("latin-1", "ignore").decode("latin-1")
-                pdf.cell(0, 8, text, ln=True)
-        pdf.cell(0, 8, f"Rating: {rating}", ln=True)
-        pdf.cell(0, 8, f"Suggested Limit: R$ {accepted_value:,.2f}", ln=True)
-        for rec in recommendations:
-            rec_text = f"- {rec}".encode("latin-1", "ignore").decode("latin-1")
-            pdf.multi_cell(0, 8, rec_text)
-
-        pdf.add_page()
-        pdf.set_font("Arial", 'B', 12)
-        pdf.cell(0, 10, "Indicator Bar Chart", ln=True)
-        pdf.image(bar_path.name, x=10, y=25, w=180)
-
-        pdf.add_page()
-        pdf.set_font("Arial", 'B', 12)
-        pdf.cell(0, 10, "Performance Radar", ln=True)
-        pdf.image(radar_path.name, x=25, y=30, w=150)
-
-        pdf_bytes = pdf.output(dest='S').encode("latin-1")
+        pdf_bytes = report["pdf"]
         st.download_button("📄 Click here to download the PDF", pdf_bytes, file_name="company_report.pdf")
+        if cache_hit:
+            st.caption("♻️ Report served from cache (same financials analyzed before).")
+
+def show_rating_counts(counts):
+    counts = counts.reindex(["A", "B", "C", "D"], fill_value=0)
+    cols = st.columns(len(counts))
+    for col, (rating, count) in zip(cols, counts.items()):
+        col.metric(f"Rating {rating}", f"{count:,}")
 
 with tabs[1]:
     st.subheader("📁 Batch Analysis via CSV")
+    mode = st.radio("Mode", ["Interactive", "Streaming (large files)"], horizontal=True,
+                    help="Streaming reads the file in chunks and writes the results to a downloadable file, keeping memory flat for multi-GB inputs.")
     file = st.file_uploader("📤 Upload your CSV file", type=["csv"])
 
-    if file:
+    if mode == "Interactive" and file:
         df = pd.read_csv(file)
-        st.success("✅ File successfully loaded!")
-        st.dataframe(df)
-
-        for i, row in df.iterrows():
-            st.markdown(f"### Company {i + 1}")
-            indicators = calculate_indicators(row)
-            rating, coverage_pct = classify_rating(indicators)
-            accepted_value = row["valor_garantia"] * coverage_pct
-            for name, value in indicators.items():
-                st.markdown(f"**{name}: {value if value is not None else 'n/a'}**")
-            st.markdown(f"**Rating: {rating}**")
-            st.markdown(f"**Suggested Limit: R$ {accepted_value:,.2f}**")
-            st.markdown("---")
+        st.success(f"✅ File successfully loaded! {len(df):,} companies.")
+
+        results = score_batch(df)
+        results.index = pd.RangeIndex(1, len(results) + 1, name="Company")
+
+        st.subheader("📌 Rating Distribution")
+        show_rating_counts(results["Rating"].value_counts())
+
+        st.subheader("📊 Results")
+        page_size = st.selectbox("Rows per page", [50, 100, 500, 1000], index=1)
+        n_pages = max(1, -(-len(results) // page_size))
+        page = st.number_input(f"Page (1-{n_pages})", min_value=1, max_value=n_pages, value=1, step=1)
+        start = (page - 1) * page_size
+        st.dataframe(results.iloc[start:start + page_size].style.format(
+            {**{name: "{:.2f}" for name in INDICATOR_NAMES}, "Suggested Limit": "R$ {:,.2f}", "Coverage": "{:.0%}"},
+            na_rep="n/a",
+        ))
+
+        st.subheader("📦 PDF Reports")
+        workers = st.number_input("Worker processes", min_value=1, max_value=64, value=os.cpu_count() or 1, step=1)
+        if st.button(f"Generate {len(df):,} PDF reports (ZIP)"):
+            previous = st.session_state.pop("reports_zip", None)
+            if previous:
+                discard(previous["path"])
+
+            zip_path = new_output_path(".zip")
+            bar = st.progress(0.0)
+            stats = export_reports_zip(
+                df, zip_path, max_workers=int(workers),
+                progress=lambda done, total: bar.progress(done / total, text=f"{done:,} of {total:,} reports"),
+            )
+            st.session_state["reports_zip"] = {"path": zip_path, **stats}
+
+        reports_zip = st.session_state.get("reports_zip")
+        if reports_zip:
+            st.success(f"✅ {reports_zip['reports']:,} reports in {reports_zip['seconds']:.1f}s "
+                       f"({reports_zip['reports_per_second']:.1f} reports/s)")
+            if os.path.exists(reports_zip["path"]):
+                with open(reports_zip["path"], "rb") as f:
+                    st.download_button("📥 Download reports (ZIP)", f, file_name="company_reports.zip")
+            else:
+                st.warning("The ZIP file has expired. Generate the reports again to download them.")
+
+    elif mode != "Interactive":
+        # Uploads are held in memory by Streamlit, so very large exports can be
+        # read straight from a path on the server instead
+        server_path = st.text_input("...or path to a CSV file on the server", "").strip()
+        source = server_path or file
+        out_format = st.selectbox("Output format", OUTPUT_FORMATS)
+        chunksize = st.number_input("Rows per chunk", min_value=1_000, max_value=1_000_000,
+                                    value=DEFAULT_CHUNKSIZE, step=10_000)
+        # st.download_button keeps the whole file in the server's memory while
+        # the button is shown, so very large results can be written to a path
+        # on the server instead of being downloaded
+        dest_path = st.text_input("Write the results to this path on the server (optional)", "",
+                                  help="Leave empty to download the results. The download is served from memory: "
+                                       "the server holds a copy of the whole result file while the button is shown.").strip()
+
+        if server_path and not os.path.isfile(server_path):
+            st.error(f"❌ File not found: {server_path}")
+        elif source and st.button("▶️ Run streaming analysis"):
+            # Only the latest output is kept per session; older ones in the
+            # shared output directory are evicted by age and total size
+            previous = st.session_state.pop("stream_output", None)
+            if previous and previous["managed"]:
+                discard(previous["path"])
+
+            out_path = dest_path or new_output_path(f".{out_format}")
+            bar = st.progress(0.0)
+            rows, counts = stream_scores(
+                source, out_path, fmt=out_format, chunksize=int(chunksize),
+                progress=lambda fraction, done: bar.progress(fraction, text=f"{done:,} companies scored"),
+            )
+            st.session_state["stream_output"] = {"path": out_path, "format": out_format, "rows": rows,
+                                                 "counts": counts, "managed": not dest_path}
+
+        output = st.session_state.get("stream_output")
+        if output:
+            st.success(f"✅ {output['rows']:,} companies scored.")
+            st.subheader("📌 Rating Distribution")
+            show_rating_counts(output["counts"])
+            if not output["managed"]:
+                st.info(f"Results written to {output['path']}")
+            elif os.path.exists(output["path"]):
+                with open(output["path"], "rb") as f:
+                    st.download_button("📥 Download results", f, file_name=f"payment_capacity_scores.{output['format']}")
+            else:
+                st.warning("The results file has expired. Run the analysis again to download it.")
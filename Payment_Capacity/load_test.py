@@ -0,0 +1,111 @@
+# load_test.py
+#
+# Local load test for scoring_service.py: keeps `concurrency` keep-alive
+# connections busy for `duration` seconds with random companies, then prints
+# the client-side latency percentiles and throughput next to the service's own
+# /metrics. Starts an in-process service unless --url points to a running one.
+#
+# Usage: python load_test.py [--concurrency 64] [--duration 10] [--companies-per-request 1] [--url http://host:port]
+
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from scoring import random_financials
+from scoring_service import REQUEST_FIELDS, ScoringService
+
+
+def random_companies(n, seed=None):
+    return random_financials(n, seed)[REQUEST_FIELDS].to_dict(orient="records")
+
+
+async def _request(reader, writer, method, path, body=b""):
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    tamanho = 0
+    while True:
+        linha = await reader.readline()
+        if linha in (b"\r\n", b""):
+            break
+        nome, _, valor = linha.decode("latin-1").partition(":")
+        if nome.strip().lower() == "content-length":
+            tamanho = int(valor)
+    return status, json.loads(await reader.readexactly(tamanho))
+
+
+async def _client(host, port, corpos, fim, latencias, erros):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = 0
+    try:
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            status, _ = await _request(reader, writer, "POST", "/score", corpos[i % len(corpos)])
+            latencias.append(time.perf_counter() - inicio)
+            if status != 200:
+                erros.append(status)
+            i += 1
+    finally:
+        writer.close()
+
+
+async def load_test(host, port, concurrency=64, duration=10.0, companies_per_request=1, seed=0):
+    empresas = random_companies(1_000 * companies_per_request, seed)
+    corpos = [json.dumps(empresas[k] if companies_per_request == 1 else
+                         {"companies": empresas[k:k + companies_per_request]}).encode()
+              for k in range(0, len(empresas), companies_per_request)]
+    latencias, erros = [], []
+    inicio = time.perf_counter()
+    await asyncio.gather(*[_client(host, port, corpos, inicio + duration, latencias, erros)
+                           for _ in range(concurrency)])
+    segundos = time.perf_counter() - inicio
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, metrics = await _request(reader, writer, "GET", "/metrics")
+    writer.close()
+    ms = np.array(latencias) * 1000
+    return {
+        "requests": len(latencias),
+        "errors": len(erros),
+        "requests_per_s": len(latencias) / segundos,
+        "companies_per_s": len(latencias) * companies_per_request / segundos,
+        "latency_ms": dict(zip(["p50", "p95", "p99"], np.percentile(ms, [50, 95, 99]).round(2).tolist())),
+        "service": metrics,
+    }
+
+
+async def main(args):
+    service = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        service = ScoringService(args.max_batch, args.max_wait_ms)
+        host, port = await service.start("127.0.0.1", 0)
+    try:
+        resultado = await load_test(host, port, args.concurrency, args.duration, args.companies_per_request)
+    finally:
+        if service is not None:
+            await service.stop()
+    print(f"{resultado['requests']:,} requests in {args.duration:g}s with {args.concurrency} connections "
+          f"({resultado['errors']} errors)")
+    print(f"Throughput: {resultado['requests_per_s']:,.0f} requests/s "
+          f"({resultado['companies_per_s']:,.0f} companies/s)")
+    print(f"Client latency (ms): {resultado['latency_ms']}")
+    print("Service metrics:", json.dumps(resultado["service"], indent=1))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for the scoring service")
+    parser.add_argument("--url", help="Running service (default: start one in-process)")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--companies-per-request", type=int, default=1)
+    parser.add_argument("--max-batch", type=int, default=512)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,64 @@
+# outputs.py
+#
+# Result files the app offers for download (streamed batch scores, report
+# ZIPs) live in one directory, OUTPUT_DIR. Streamlit has no hook for the end
+# of a session, so the files are not tied to sessions: every new output first
+# evicts the files older than MAX_AGE_SECONDS and then, oldest first, as many
+# as needed to keep the directory under MAX_TOTAL_BYTES. A session also
+# deletes its previous output when it produces a new one.
+
+import os
+import tempfile
+import time
+
+OUTPUT_DIR = os.environ.get("PAYMENT_CAPACITY_OUTPUT_DIR",
+                            os.path.join(tempfile.gettempdir(), "payment_capacity_outputs"))
+MAX_AGE_SECONDS = 6 * 3600
+MAX_TOTAL_BYTES = 20 * 2**30
+
+
+def evict(directory=OUTPUT_DIR, max_age=MAX_AGE_SECONDS, max_total_bytes=MAX_TOTAL_BYTES, now=None):
+    # Returns the paths removed. Files another process removed meanwhile, or
+    # cannot be removed, are skipped.
+    if not os.path.isdir(directory):
+        return []
+    now = time.time() if now is None else now
+    files = []
+    for entry in os.scandir(directory):
+        try:
+            if entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            continue
+    files.sort()
+
+    removed = []
+    total = sum(size for _, size, _ in files)
+    for mtime, size, path in files:
+        if now - mtime <= max_age and total <= max_total_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        removed.append(path)
+        total -= size
+    return removed
+
+
+def new_output_path(suffix, directory=OUTPUT_DIR):
+    # An empty file with a unique name in the output directory, after eviction
+    evict(directory)
+    os.makedirs(directory, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=directory)
+    os.close(fd)
+    return path
+
+
+def discard(path):
+    # A session's previous output; it may already have been evicted
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
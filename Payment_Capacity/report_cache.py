@@ -0,0 +1,208 @@
+# report_cache.py
+#
+# Chart rendering, PDF assembly and a content-addressed cache for the single
+# company report. Reports are keyed by a hash of the input financials, so
+# identical inputs (from any analyst) reuse the charts and the PDF already
+# built instead of rendering them again.
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from matplotlib.figure import Figure
+from PIL import Image
+from fpdf import FPDF
+
+from scoring import INPUT_COLUMNS, calculate_indicators, classify_rating, normalize
+
+REPORT_INPUTS = INPUT_COLUMNS + ["valor_garantia"]
+RADAR_LABELS = ["Liquidity", "DSCR", "ROE", "Solvency", "Coverage"]
+
+
+# === 1. REPORT CONTENT ===
+
+def report_key(data):
+    # Canonical JSON of the inputs the report depends on: same financials,
+    # same key, regardless of dict order or int/float spelling
+    payload = {k: float(data[k]) for k in REPORT_INPUTS}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+def recommendations_for(rating, indicators):
+    recommendations = []
+    if rating == "D": recommendations.append("❌ Avoid credit approval.")
+    if rating == "C": recommendations.append("⚠️ Real collateral required.")
+    if indicators["DSCR"] and indicators["DSCR"] < 1.2:
+        recommendations.append("🔴 Limited payment capacity.")
+    return recommendations
+
+def radar_values(indicators):
+    debt = indicators["Total Debt Ratio"]
+    return [
+        normalize(indicators["Current Liquidity"], 0, 3),
+        normalize(indicators["DSCR"], 0, 3),
+        normalize(indicators["ROE"], 0, 0.3),
+        normalize(1 - debt if debt is not None else None, 0, 1),
+        normalize(indicators["Interest Coverage"], 0, 5),
+    ]
+
+
+# === 2. CHARTS (in-memory PNG) ===
+
+def _png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    # Leave the figure empty so callers rendering many reports can reuse it
+    fig.clear()
+    # matplotlib writes RGBA; fpdf splits the alpha channel pixel by pixel in
+    # pure Python, which costs more than drawing the chart, so flatten to RGB
+    rgb = io.BytesIO()
+    Image.open(buffer).convert("RGB").save(rgb, format="png")
+    return rgb.getvalue()
+
+def render_bar_chart(indicators, fig=None):
+    # Figure objects are built directly (no pyplot), so nothing is left in
+    # pyplot's global figure registry between reruns
+    fig = fig if fig is not None else Figure(figsize=(10, 5))
+    ax = fig.subplots()
+    ax.bar(indicators.keys(), [v if v is not None else 0 for v in indicators.values()])
+    ax.set_xticks(range(len(indicators)))
+    ax.set_xticklabels(indicators.keys(), rotation=30, ha="right")
+    return _png(fig)
+
+def render_radar_chart(indicators, fig=None):
+    radar_vals = radar_values(indicators)
+    radar_vals += radar_vals[:1]
+    angles = np.linspace(0, 2 * np.pi, len(RADAR_LABELS), endpoint=False).tolist()
+    angles += angles[:1]
+    fig = fig if fig is not None else Figure()
+    ax = fig.add_subplot(111, polar=True)
+    ax.plot(angles, radar_vals, "o-", linewidth=2)
+    ax.fill(angles, radar_vals, alpha=0.25)
+    ax.set_thetagrids(np.degrees(angles[:-1]), RADAR_LABELS)
+    return _png(fig)
+
+
+# === 3. PDF ===
+
+def build_pdf(indicators, rating, accepted_value, recommendations, bar_png, radar_png):
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    pdf.cell(0, 10, "Payment Capacity Analysis Report", ln=True)
+    pdf.ln(5)
+    for name, value in indicators.items():
+        if value is not None:
+            text = f"{name}: {value:.2f}".encode("latin-1", "ignore").decode("latin-1")
+            pdf.cell(0, 8, text, ln=True)
+    pdf.cell(0, 8, f"Rating: {rating}", ln=True)
+    pdf.cell(0, 8, f"Suggested Limit: R$ {accepted_value:,.2f}", ln=True)
+    for rec in recommendations:
+        rec_text = f"- {rec}".encode("latin-1", "ignore").decode("latin-1")
+        pdf.multi_cell(0, 8, rec_text)
+
+    # fpdf only reads images from a path: the PNGs are spilled to a private
+    # directory that is removed as soon as the document is assembled
+    with tempfile.TemporaryDirectory() as tmp:
+        bar_path = os.path.join(tmp, "bar.png")
+        radar_path = os.path.join(tmp, "radar.png")
+        with open(bar_path, "wb") as f:
+            f.write(bar_png)
+        with open(radar_path, "wb") as f:
+            f.write(radar_png)
+
+        pdf.add_page()
+        pdf.set_font("Arial", 'B', 12)
+        pdf.cell(0, 10, "Indicator Bar Chart", ln=True)
+        pdf.image(bar_path, x=10, y=25, w=180)
+
+        pdf.add_page()
+        pdf.set_font("Arial", 'B', 12)
+        pdf.cell(0, 10, "Performance Radar", ln=True)
+        pdf.image(radar_path, x=25, y=30, w=150)
+
+        return pdf.output(dest='S').encode("latin-1")
+
+def build_report(data, bar_fig=None, radar_fig=None):
+    indicators = calculate_indicators(data)
+    rating, coverage_pct = classify_rating(indicators)
+    accepted_value = data["valor_garantia"] * coverage_pct
+    recommendations = recommendations_for(rating, indicators)
+    bar_png = render_bar_chart(indicators, bar_fig)
+    radar_png = render_radar_chart(indicators, radar_fig)
+    return {
+        "indicators": indicators,
+        "rating": rating,
+        "coverage_pct": coverage_pct,
+        "accepted_value": accepted_value,
+        "recommendations": recommendations,
+        "bar_png": bar_png,
+        "radar_png": radar_png,
+        "pdf": build_pdf(indicators, rating, accepted_value, recommendations, bar_png, radar_png),
+    }
+
+
+# === 4. LRU CACHE ===
+
+def _report_size(report):
+    return len(report["pdf"]) + len(report["bar_png"]) + len(report["radar_png"])
+
+class ReportCache:
+    # Least-recently-used cache bounded by total bytes and number of reports.
+    # Safe to share between Streamlit sessions; two sessions missing on the
+    # same key at once may both build it, the second insert just replaces the first.
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_entries=256):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            report = self._entries.get(key)
+            if report is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return report
+
+    def put(self, key, report):
+        size = _report_size(report)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= _report_size(self._entries.pop(key))
+            self._entries[key] = report
+            self._bytes += size
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= _report_size(evicted)
+                self.evictions += 1
+
+    def get_or_build(self, data):
+        # Returns (report, hit)
+        key = report_key(data)
+        report = self.get(key)
+        if report is not None:
+            return report, True
+        report = build_report(data)
+        self.put(key, report)
+        return report, False
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_bytes(self):
+        return self._bytes
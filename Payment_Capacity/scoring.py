@@ -0,0 +1,158 @@
+# scoring.py
+#
+# Credit rating rules for the payment capacity app. The scalar functions score
+# one company (manual input); score_batch applies the same rules column-wise to
+# a whole DataFrame (CSV batch) without a Python loop over rows.
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repository root
+from cents import round_cents
+
+INPUT_COLUMNS = [
+    "ativo_circulante", "passivo_circulante", "estoques", "disponivel",
+    "passivo_total", "ativo_total", "lucro_liquido", "patrimonio_liquido",
+    "fluxo_caixa_operacional", "servico_divida", "ebitda",
+]
+
+INDICATOR_NAMES = [
+    "Current Liquidity", "Quick Ratio", "Immediate Liquidity", "Total Debt Ratio",
+    "ROE", "DSCR", "Interest Coverage",
+]
+
+# Score thresholds: (indicator, thresholds, points, points when below every threshold)
+# "ge" rules award points when the value is >= threshold, "le" rules when <= threshold.
+SCORE_RULES = [
+    ("Current Liquidity", "ge", [1.5, 1], [3, 2], 1),
+    ("Total Debt Ratio", "le", [0.5, 0.7], [3, 2], 1),
+    ("DSCR", "ge", [2, 1.2], [6, 4], 2),
+    ("ROE", "ge", [0.15, 0.05], [3, 2], 1),
+]
+
+# Rating bands: minimum score, rating, bank's accepted collateral coverage
+RATING_BANDS = [(14, "A", 0.90), (10, "B", 0.75), (7, "C", 0.50)]
+DEFAULT_RATING = ("D", 0.00)
+
+
+# === 1. SCALAR RULES (one company) ===
+
+def safe_div(n, d):
+    return round(n / d, 2) if d else None
+
+def normalize(v, mi, ma):
+    return max(0, min((v - mi) / (ma - mi), 1)) if v is not None else 0
+
+def calculate_indicators(row):
+    indicators = {}
+    indicators["Current Liquidity"] = safe_div(row["ativo_circulante"], row["passivo_circulante"])
+    indicators["Quick Ratio"] = safe_div(row["ativo_circulante"] - row["estoques"], row["passivo_circulante"])
+    indicators["Immediate Liquidity"] = safe_div(row["disponivel"], row["passivo_circulante"])
+    indicators["Total Debt Ratio"] = safe_div(row["passivo_total"], row["ativo_total"])
+    indicators["ROE"] = safe_div(row["lucro_liquido"], row["patrimonio_liquido"])
+    indicators["DSCR"] = safe_div(row["fluxo_caixa_operacional"], row["servico_divida"])
+    indicators["Interest Coverage"] = safe_div(row["ebitda"], row["servico_divida"])
+    return indicators
+
+def classify_rating(ind):
+    # Same SCORE_RULES and RATING_BANDS as classify_rating_batch. A missing
+    # indicator scores nothing; NaN fails every comparison and gets the floor.
+    score = 0
+    for name, kind, thresholds, points, floor in SCORE_RULES:
+        v = ind[name]
+        if v is None:
+            continue
+        passed = [v >= t if kind == "ge" else v <= t for t in thresholds]
+        score += next((p for ok, p in zip(passed, points) if ok), floor)
+
+    for min_score, rating, coverage in RATING_BANDS:
+        if score >= min_score:
+            return rating, coverage
+    return DEFAULT_RATING
+
+
+# === 2. COLUMNAR RULES (whole batch) ===
+
+def vector_div(n, d):
+    # Same contract as safe_div: rounded to 2 decimals, missing where the
+    # denominator is zero. Returns the values (NaN where missing) and the mask
+    # of rows that safe_div would NOT have turned into None. A NaN denominator
+    # is truthy for safe_div, so it stays "present" here too.
+    n = np.asarray(n, dtype=float)
+    d = np.asarray(d, dtype=float)
+    present = d != 0
+    values = np.full(n.shape, np.nan)
+    np.divide(n, d, out=values, where=present)
+    # round_cents matches round(v, 2) exactly, half-cent values included
+    return round_cents(values), present
+
+def calculate_indicators_batch(df):
+    col = {c: df[c].to_numpy(dtype=float) for c in INPUT_COLUMNS}
+    pairs = {
+        "Current Liquidity": (col["ativo_circulante"], col["passivo_circulante"]),
+        "Quick Ratio": (col["ativo_circulante"] - col["estoques"], col["passivo_circulante"]),
+        "Immediate Liquidity": (col["disponivel"], col["passivo_circulante"]),
+        "Total Debt Ratio": (col["passivo_total"], col["ativo_total"]),
+        "ROE": (col["lucro_liquido"], col["patrimonio_liquido"]),
+        "DSCR": (col["fluxo_caixa_operacional"], col["servico_divida"]),
+        "Interest Coverage": (col["ebitda"], col["servico_divida"]),
+    }
+    values, present = {}, {}
+    for name, (n, d) in pairs.items():
+        values[name], present[name] = vector_div(n, d)
+    return values, present
+
+def classify_rating_batch(values, present):
+    n_rows = len(next(iter(values.values())))
+    score = np.zeros(n_rows, dtype=np.int64)
+    for name, kind, thresholds, points, floor in SCORE_RULES:
+        v = values[name]
+        # NaN fails every comparison, so it falls through to the floor points,
+        # as in classify_rating
+        conds = [v >= t for t in thresholds] if kind == "ge" else [v <= t for t in thresholds]
+        score += np.where(present[name], np.select(conds, points, default=floor), 0)
+
+    band_conds = [score >= min_score for min_score, _, _ in RATING_BANDS]
+    rating = np.select(band_conds, [r for _, r, _ in RATING_BANDS], default=DEFAULT_RATING[0])
+    coverage = np.select(band_conds, [c for _, _, c in RATING_BANDS], default=DEFAULT_RATING[1])
+    return score, rating, coverage
+
+def score_batch(df):
+    # One pass over the columns: seven indicators, score, rating, coverage
+    # and suggested limit for every company in df
+    values, present = calculate_indicators_batch(df)
+    score, rating, coverage = classify_rating_batch(values, present)
+
+    result = pd.DataFrame(values, index=df.index)
+    result["Score"] = score
+    result["Rating"] = rating
+    result["Coverage"] = coverage
+    result["Suggested Limit"] = df["valor_garantia"].to_numpy(dtype=float) * coverage
+    return result
+
+
+def random_financials(n_companies=100_000, seed=None):
+    # Synthetic balance sheets (CSV batch columns plus valor_garantia) on the
+    # scale of the app's manual input
+    rng = np.random.default_rng(seed)
+    n = n_companies
+    ativo_total = rng.uniform(1e6, 5e7, n)
+    ativo_circulante = ativo_total * rng.uniform(0.2, 0.6, n)
+    servico_divida = ativo_total * rng.uniform(0.02, 0.1, n)
+    return pd.DataFrame({
+        "ativo_circulante": ativo_circulante,
+        "passivo_circulante": ativo_circulante / rng.uniform(0.6, 2.5, n),
+        "estoques": ativo_circulante * rng.uniform(0.1, 0.4, n),
+        "disponivel": ativo_circulante * rng.uniform(0.05, 0.3, n),
+        "passivo_total": ativo_total * rng.uniform(0.3, 0.9, n),
+        "ativo_total": ativo_total,
+        "lucro_liquido": ativo_total * rng.uniform(-0.02, 0.1, n),
+        "patrimonio_liquido": ativo_total * rng.uniform(0.1, 0.7, n),
+        "fluxo_caixa_operacional": servico_divida * rng.uniform(0.5, 3, n),
+        "servico_divida": servico_divida,
+        "ebitda": servico_divida * rng.uniform(0.8, 4, n),
+        "valor_garantia": ativo_total * rng.uniform(0.1, 0.5, n),
+    }).round(2)
@@ -0,0 +1,317 @@
+# scoring_service.py
+#
+# HTTP scoring service for loan origination systems. Concurrent requests are
+# queued and scored together: the batcher waits at most max_wait_ms after the
+# first request (or until max_batch companies) and runs one score_batch call
+# for the whole group, the same column-wise rules used by the Streamlit app.
+# Built on asyncio streams only (HTTP/1.1 with keep-alive, JSON bodies).
+#
+# Usage: python scoring_service.py [--host 127.0.0.1] [--port 8080] [--max-batch 512] [--max-wait-ms 2]
+#
+#   POST /score    {"ativo_circulante": ..., ..., "valor_garantia": ...}   -> one result
+#                  {"companies": [{...}, {...}]}                          -> {"results": [...]}
+#   GET  /metrics  latency percentiles, throughput and batch sizes
+#   GET  /health
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from scoring import INPUT_COLUMNS, score_batch
+
+REQUEST_FIELDS = INPUT_COLUMNS + ["valor_garantia"]
+DEFAULT_MAX_BATCH = 512
+DEFAULT_MAX_WAIT_MS = 2.0
+METRICS_WINDOW = 10_000  # latencies kept for the percentiles
+MAX_BODY = 10_000_000
+
+
+# === 1. MICRO-BATCHING ===
+
+class Metrics:
+
+    def __init__(self, window=METRICS_WINDOW):
+        self.inicio = time.perf_counter()
+        self.requests = 0
+        self.companies = 0
+        self.errors = 0
+        self.batches = 0
+        self.latencies = deque(maxlen=window)   # (finished at, seconds) per request
+        self.batch_sizes = deque(maxlen=window)
+        self.batch_seconds = deque(maxlen=window)
+
+    def record_batch(self, n_companies, segundos):
+        self.batches += 1
+        self.batch_sizes.append(n_companies)
+        self.batch_seconds.append(segundos)
+
+    def record_request(self, n_companies, segundos):
+        self.requests += 1
+        self.companies += n_companies
+        self.latencies.append((time.perf_counter(), segundos))
+
+    def snapshot(self):
+        agora = time.perf_counter()
+        latencias = np.array([s for _, s in self.latencies]) * 1000
+        # Throughput over the last 10 seconds of completed requests (or since
+        # the oldest latency kept, when the window is already full)
+        recentes = sum(1 for t, _ in self.latencies if agora - t <= 10)
+        janela = min(10.0, agora - self.inicio)
+        if len(self.latencies) == self.latencies.maxlen:
+            janela = min(janela, agora - self.latencies[0][0])
+        q = np.percentile(latencias, [50, 95, 99, 100]).round(3).tolist() if len(latencias) else [None] * 4
+        return {
+            "uptime_s": round(agora - self.inicio, 1),
+            "requests": self.requests,
+            "companies": self.companies,
+            "errors": self.errors,
+            "batches": self.batches,
+            "requests_per_s_10s": round(recentes / janela, 1) if janela > 0 else 0.0,
+            "latency_ms": {"p50": q[0], "p95": q[1], "p99": q[2], "max": q[3]},
+            "batch_size": {"mean": round(float(np.mean(self.batch_sizes)), 1) if self.batch_sizes else 0.0,
+                           "max": max(self.batch_sizes, default=0)},
+            "score_ms_per_batch": round(float(np.mean(self.batch_seconds)) * 1000, 3) if self.batch_seconds else 0.0,
+        }
+
+
+class MicroBatcher:
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS, metrics=None):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.metrics = metrics or Metrics()
+        self.queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def score(self, rows):
+        # rows: list of validated dicts; resolves to one result dict per row
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((rows, future))
+        return await future
+
+    async def _collect(self):
+        # First request, then everything arriving within max_wait (or until
+        # max_batch companies)
+        lote = [await self.queue.get()]
+        n = len(lote[0][0])
+        prazo = asyncio.get_running_loop().time() + self.max_wait
+        while n < self.max_batch:
+            restante = prazo - asyncio.get_running_loop().time()
+            if restante <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), restante)
+            except asyncio.TimeoutError:
+                break
+            lote.append(item)
+            n += len(item[0])
+        return lote
+
+    async def _run(self):
+        while True:
+            lote = await self._collect()
+            rows = [row for r, _ in lote for row in r]
+            inicio = time.perf_counter()
+            try:
+                # One vectorized call; a few ms at most for max_batch rows, so it
+                # runs on the event loop instead of a thread
+                results = _records(score_batch(pd.DataFrame.from_records(rows, columns=REQUEST_FIELDS)))
+            except Exception as erro:  # resolve every waiting request, keep serving
+                for _, future in lote:
+                    if not future.done():
+                        future.set_exception(erro)
+                continue
+            self.metrics.record_batch(len(rows), time.perf_counter() - inicio)
+            k = 0
+            for r, future in lote:
+                if not future.done():
+                    future.set_result(results[k:k + len(r)])
+                k += len(r)
+
+
+def _records(result):
+    # DataFrame from score_batch -> JSON-ready dicts (missing indicators as null)
+    records = result.to_dict(orient="records")
+    for record in records:
+        for key, value in record.items():
+            if isinstance(value, float) and math.isnan(value):
+                record[key] = None
+            elif isinstance(value, np.generic):
+                record[key] = value.item()
+    return records
+
+
+def validate(company):
+    # Every request field present and a finite number (null allowed, like an
+    # empty CSV cell). json.loads accepts 1e400, NaN and Infinity as floats
+    # and integers of any size, so both are checked here.
+    if not isinstance(company, dict):
+        raise ValueError("Each company must be a JSON object")
+    missing = [f for f in REQUEST_FIELDS if f not in company]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    row = {}
+    for field in REQUEST_FIELDS:
+        value = company[field]
+        if value is None:
+            row[field] = math.nan
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Field {field!r} must be a number")
+        try:
+            value = float(value)
+        except OverflowError:
+            raise ValueError(f"Field {field!r} is out of range") from None
+        if not math.isfinite(value):
+            raise ValueError(f"Field {field!r} must be finite")
+        row[field] = value
+    return row
+
+
+# === 2. HTTP ===
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               500: "Internal Server Error"}
+
+
+class ScoringService:
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.metrics = Metrics()
+        self.batcher = MicroBatcher(max_batch, max_wait_ms, self.metrics)
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=8080):
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._connection, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.stop()
+
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, payload = await self._handle(method, path, body)
+                fechar = headers.get("connection", "").lower() == "close"
+                _write_response(writer, status, payload, fechar)
+                await writer.drain()
+                if fechar:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as erro:  # malformed HTTP
+            _write_response(writer, 400, {"error": str(erro)}, True)
+        finally:
+            writer.close()
+
+    async def _handle(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/metrics":
+            return 200, self.metrics.snapshot()
+        if path != "/score":
+            return 404, {"error": f"Unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST /score"}
+
+        inicio = time.perf_counter()
+        try:
+            payload = json.loads(body or b"null")
+            many = isinstance(payload, dict) and "companies" in payload
+            companies = payload["companies"] if many else [payload]
+            if not isinstance(companies, list) or not companies:
+                raise ValueError("'companies' must be a non-empty list")
+            rows = [validate(c) for c in companies]
+        except (ValueError, TypeError) as erro:
+            self.metrics.errors += 1
+            return 400, {"error": str(erro)}
+        except RecursionError:
+            # json.loads recurses once per nesting level ([[[[...)
+            self.metrics.errors += 1
+            return 400, {"error": "JSON body is nested too deeply"}
+        try:
+            results = await self.batcher.score(rows)
+        except Exception as erro:
+            self.metrics.errors += 1
+            return 500, {"error": str(erro)}
+        self.metrics.record_request(len(rows), time.perf_counter() - inicio)
+        return 200, {"results": results} if many else results[0]
+
+
+async def _read_request(reader):
+    # (method, path, headers, body) or None when the client closed the connection
+    linha = await reader.readline()
+    if not linha:
+        return None
+    partes = linha.decode("latin-1").split()
+    if len(partes) != 3:
+        raise ValueError("Malformed request line")
+    method, path, _ = partes
+    headers = {}
+    while True:
+        linha = await reader.readline()
+        if linha in (b"\r\n", b"\n", b""):
+            break
+        nome, _, valor = linha.decode("latin-1").partition(":")
+        headers[nome.strip().lower()] = valor.strip()
+    tamanho = int(headers.get("content-length", 0))
+    if tamanho > MAX_BODY:
+        raise ValueError("Request body too large")
+    body = await reader.readexactly(tamanho) if tamanho else b""
+    return method.upper(), path.split("?")[0], headers, body
+
+
+def _write_response(writer, status, payload, fechar=False):
+    body = json.dumps(payload).encode()
+    writer.write((f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                  f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                  f"Connection: {'close' if fechar else 'keep-alive'}\r\n\r\n").encode() + body)
+
+
+async def serve(host="127.0.0.1", port=8080, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+    service = ScoringService(max_batch, max_wait_ms)
+    host, port = await service.start(host, port)
+    print(f"✅ Scoring service on http://{host}:{port} (batches of up to {max_batch}, "
+          f"waiting at most {max_wait_ms} ms)")
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-batched HTTP scoring service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch, args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
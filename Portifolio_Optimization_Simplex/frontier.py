@@ -0,0 +1,206 @@
+# frontier.py
+#
+# Return-vs-risk frontier for the portfolio LP: the same model solved for
+# every (budget, risk cap) pair of a sweep. The constraint matrix is built
+# once as a scipy.sparse matrix and only the right-hand side changes between
+# solves.
+#
+# Solvers:
+# - "warm": a single HiGHS model (highspy) whose row bounds are updated
+#   between solves, so every solve starts from the previous optimal basis
+# - "parallel": the sweep split into contiguous blocks across a process pool;
+#   each worker warm-starts through its block (or uses linprog without highspy)
+# - "linprog": scipy.optimize.linprog(method="highs") per point, no warm start
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.optimize import linprog
+
+SOLVERS = ["auto", "warm", "parallel", "linprog"]
+SUMMARY_COLUMNS = ["Budget", "Max_Risk", "Status", "Return", "Cost", "Risk", "Seconds"]
+
+
+# === 1. MODEL ===
+
+class PortfolioModel:
+    # max returns @ x  s.t.  A_ub @ x <= b_ub,  lower <= x <= upper
+    # Row 0 of A_ub is the cost per unit and row 1 the risk per unit; the
+    # sweep replaces their right-hand sides (budget, risk cap).
+
+    def __init__(self, expected_returns, costs_per_unit, risk_per_unit, total_budget=np.inf,
+                 max_total_risk=np.inf, lower=0.0, upper=np.inf, labels=None):
+        self.expected_returns = np.asarray(expected_returns, dtype=float)
+        n = len(self.expected_returns)
+        self.A_ub = sparse.csr_matrix(np.vstack([np.asarray(costs_per_unit, dtype=float),
+                                                 np.asarray(risk_per_unit, dtype=float)]))
+        self.b_ub = np.array([total_budget, max_total_risk], dtype=float)
+        self.lower = np.broadcast_to(np.asarray(lower, dtype=float), n).copy()
+        self.upper = np.broadcast_to(np.asarray(upper, dtype=float), n).copy()
+        self.labels = list(labels) if labels is not None else [f"Asset {i+1}" for i in range(n)]
+
+    @property
+    def n_assets(self):
+        return len(self.expected_returns)
+
+    def add_rows(self, rows, rhs):
+        # Extra <= constraints (sparse or dense rows); they stay fixed in the sweep
+        self.A_ub = sparse.vstack([self.A_ub, sparse.csr_matrix(rows)], format="csr")
+        self.b_ub = np.concatenate([self.b_ub, np.atleast_1d(np.asarray(rhs, dtype=float))])
+        return self
+
+    def rhs(self, budget, max_risk):
+        b = self.b_ub.copy()
+        b[0], b[1] = budget, max_risk
+        return b
+
+
+# === 2. SOLVERS ===
+
+def _solve_linprog(model, b_ub):
+    res = linprog(-model.expected_returns, A_ub=model.A_ub, b_ub=b_ub,
+                  bounds=np.column_stack([model.lower, model.upper]), method="highs")
+    status = {0: "optimal", 2: "infeasible", 3: "unbounded"}.get(res.status, "failed")
+    return status, res.x if res.status == 0 else None
+
+
+class _WarmSolver:
+    # One HiGHS instance for the whole sweep; only the row upper bounds change
+
+    def __init__(self, model):
+        import highspy
+
+        self._highspy = highspy
+        self.h = highspy.Highs()
+        self.h.setOptionValue("output_flag", False)
+        n = model.n_assets
+        inf = highspy.kHighsInf
+        self.h.addCols(n, -model.expected_returns, model.lower,
+                       np.where(np.isinf(model.upper), inf, model.upper), 0, [], [], [])
+        A = model.A_ub
+        self.h.addRows(A.shape[0], np.full(A.shape[0], -inf), np.minimum(model.b_ub, inf),
+                       A.nnz, A.indptr[:-1], A.indices, A.data)
+
+    def __call__(self, model, b_ub):
+        self.h.changeRowsBounds(2, np.array([0, 1], dtype=np.int32),
+                                np.full(2, -self._highspy.kHighsInf), b_ub[:2])
+        self.h.run()
+        status = self.h.getModelStatus()
+        ms = self._highspy.HighsModelStatus
+        if status == ms.kOptimal:
+            return "optimal", np.array(self.h.getSolution().col_value)
+        names = {ms.kInfeasible: "infeasible", ms.kUnbounded: "unbounded"}
+        return names.get(status, "failed"), None
+
+
+def highspy_available():
+    try:
+        import highspy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _solve_block(model, points, warm):
+    # Solves a contiguous block of (budget, max_risk) points; returns
+    # (status, x, seconds) per point
+    solve = _WarmSolver(model) if warm else _solve_linprog
+    resultados = []
+    for budget, max_risk in points:
+        inicio = time.perf_counter()
+        status, x = solve(model, model.rhs(budget, max_risk))
+        resultados.append((status, x, time.perf_counter() - inicio))
+    return resultados
+
+_worker_model = None
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+def _worker_block(points):
+    return _solve_block(_worker_model, points, highspy_available())
+
+
+# === 3. FRONTIER ===
+
+def frontier(model, budgets, risk_caps, solver="auto", max_workers=None):
+    # Solves every (budget, risk cap) pair. Returns a DataFrame with one row
+    # per point: Budget, Max_Risk, Status, Return, Cost, Risk, Seconds (time of
+    # that solve) and the units allocated to each asset. The wall time of the
+    # whole sweep is in df.attrs["seconds"].
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver {solver!r}, expected one of {SOLVERS}")
+    # Budget-major, risk ascending: consecutive points differ in one bound,
+    # which keeps warm starts close to the previous basis
+    points = list(itertools.product(sorted(budgets), sorted(risk_caps)))
+    max_workers = max_workers or os.cpu_count() or 1
+    if solver == "auto":
+        if max_workers > 1 and len(points) >= 2 * max_workers:
+            solver = "parallel"
+        else:
+            solver = "warm" if highspy_available() else "linprog"
+
+    inicio = time.perf_counter()
+    if solver == "parallel":
+        blocks = [list(b) for b in np.array_split(np.array(points), max_workers) if len(b)]
+        with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(model,)) as pool:
+            resultados = [r for block in pool.map(_worker_block, blocks) for r in block]
+    else:
+        resultados = _solve_block(model, points, solver == "warm")
+    segundos = time.perf_counter() - inicio
+
+    allocations = np.full((len(points), model.n_assets), np.nan)
+    for i, (_, x, _) in enumerate(resultados):
+        if x is not None:
+            allocations[i] = x
+    costs, risks = model.A_ub[0].toarray().ravel(), model.A_ub[1].toarray().ravel()
+    summary = pd.DataFrame({
+        "Budget": [p[0] for p in points],
+        "Max_Risk": [p[1] for p in points],
+        "Status": [r[0] for r in resultados],
+        "Return": allocations @ model.expected_returns,
+        "Cost": allocations @ costs,
+        "Risk": allocations @ risks,
+        "Seconds": [r[2] for r in resultados],
+    })
+    df = pd.concat([summary, pd.DataFrame(allocations, columns=model.labels)], axis=1)
+    df.attrs["seconds"] = segundos
+    df.attrs["solver"] = solver
+    return df
+
+def plot_frontier(df, ax=None):
+    # Expected return vs. total risk, one line per budget
+    import matplotlib.pyplot as plt
+
+    if ax is None:
+        _, ax = plt.subplots(figsize=(8, 5))
+    for budget, pontos in df[df["Status"] == "optimal"].groupby("Budget"):
+        ax.plot(pontos["Risk"], pontos["Return"], marker="o", markersize=3, label=f"Budget R$ {budget:,.0f}")
+    ax.set_title("Efficient Frontier")
+    ax.set_xlabel("Total Risk")
+    ax.set_ylabel("Expected Return")
+    ax.grid(True, linestyle="--", alpha=0.5)
+    ax.legend()
+    return ax
+
+
+def random_model(n_assets=2_000, seed=0):
+    # Synthetic universe with the same scales as the script's five assets
+    rng = np.random.default_rng(seed)
+    return PortfolioModel(rng.uniform(0.05, 0.15, n_assets), rng.uniform(50, 250, n_assets),
+                          rng.uniform(0.02, 0.07, n_assets), upper=rng.uniform(5, 50, n_assets))
+
+
+if __name__ == "__main__":
+    model = random_model()
+    budgets = np.linspace(10_000, 200_000, 10)
+    risk_caps = np.linspace(1, 100, 20)
+    for solver in ["linprog", "warm" if highspy_available() else "linprog", "parallel"]:
+        df = frontier(model, budgets, risk_caps, solver=solver)
+        print(f"{solver:>9}: {len(df)} solves in {df.attrs['seconds']:.2f}s "
+              f"(median {df['Seconds'].median() * 1000:.1f} ms per solve)")
@@ -0,0 +1,165 @@
+# optimizer.py
+#
+# Portfolio optimizer for large books. It starts from a PortfolioModel
+# (frontier.py: budget and risk rows, per-asset bounds) and adds:
+# - sector caps: R$ invested per sector, one sparse row per sector
+# - turnover: R$ traded against the current holdings, sum(cost_i |x_i - h_i|),
+#   linearized with one auxiliary column t_i >= |x_i - h_i| per asset
+# - integer lots: x_i = lot_i * y_i with y_i integer, solved with
+#   scipy.optimize.milp instead of linprog
+# All constraint matrices are scipy.sparse, so the model size grows with the
+# number of non-zeros and not with assets x constraints.
+
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+
+from frontier import PortfolioModel
+
+DEFAULT_MIP_GAP = 1e-3
+DEFAULT_TIME_LIMIT = 60.0
+
+
+# === 1. CONSTRAINTS ===
+
+def sector_matrix(sectors, costs_per_unit):
+    # (sectors x assets) sparse matrix with the cost per unit of each asset in
+    # its sector's row; returns (matrix, sector names)
+    codes, names = pd.factorize(pd.Series(sectors))
+    n = len(codes)
+    matrix = sparse.csr_matrix((np.asarray(costs_per_unit, dtype=float), (codes, np.arange(n))),
+                               shape=(len(names), n))
+    return matrix, list(names)
+
+def add_sector_caps(model, sectors, caps):
+    # caps: R$ limit per sector, as a dict {sector: cap} (sectors not listed
+    # are uncapped) or a single value for every sector
+    costs = model.A_ub[0].toarray().ravel()
+    matrix, names = sector_matrix(sectors, costs)
+    if isinstance(caps, dict):
+        keep = [i for i, name in enumerate(names) if name in caps]
+        matrix = matrix[keep]
+        rhs = [caps[names[i]] for i in keep]
+    else:
+        rhs = np.full(len(names), float(caps))
+    return model.add_rows(matrix, rhs)
+
+def _problem(model, current=None, max_turnover=None, lot_size=None):
+    # Variables: [y (units, or lots when lot_size is given), t (turnover, optional)]
+    n = model.n_assets
+    lot = np.ones(n) if lot_size is None else np.broadcast_to(np.asarray(lot_size, dtype=float), n)
+    scale = sparse.diags(lot)
+    A = model.A_ub @ scale
+    b = model.b_ub
+    c = -model.expected_returns * lot
+    lower, upper = model.lower / lot, model.upper / lot
+    if lot_size is not None:
+        lower, upper = np.ceil(lower - 1e-9), np.floor(upper + 1e-9)
+
+    if max_turnover is not None:
+        h = np.zeros(n) if current is None else np.asarray(current, dtype=float)
+        costs = model.A_ub[0].toarray().ravel()
+        eye = sparse.identity(n, format="csr")
+        #  lot*y - t <= h   |   -lot*y - t <= -h   |   costs @ t <= max_turnover
+        A = sparse.bmat([[A, None],
+                         [scale, -eye],
+                         [-scale, -eye],
+                         [None, sparse.csr_matrix(costs)]], format="csr")
+        b = np.concatenate([b, h, -h, [max_turnover]])
+        c = np.concatenate([c, np.zeros(n)])
+        lower = np.concatenate([lower, np.zeros(n)])
+        upper = np.concatenate([upper, np.full(n, np.inf)])
+    return c, A, b, lower, upper, lot
+
+
+# === 2. SOLVE ===
+
+def optimize(model, current=None, max_turnover=None, lot_size=None,
+             mip_gap=DEFAULT_MIP_GAP, time_limit=DEFAULT_TIME_LIMIT):
+    # Maximizes expected return under the model's constraints, plus a
+    # turnover limit (R$) against current holdings and whole lots if
+    # lot_size is given. Returns a dict with status, units per asset and the
+    # portfolio totals; "lots" is included for integer problems.
+    c, A, b, lower, upper, lot = _problem(model, current, max_turnover, lot_size)
+    n = model.n_assets
+    inicio = time.perf_counter()
+    if lot_size is None:
+        res = linprog(c, A_ub=A, b_ub=b, bounds=np.column_stack([lower, upper]), method="highs")
+        status = {0: "optimal", 2: "infeasible", 3: "unbounded"}.get(res.status, "failed")
+        solver = "linprog"
+    else:
+        integrality = np.zeros(len(c))
+        integrality[:n] = 1
+        res = milp(c, constraints=LinearConstraint(A, -np.inf, b), integrality=integrality,
+                   bounds=Bounds(lower, upper),
+                   options={"mip_rel_gap": mip_gap, "time_limit": time_limit})
+        # status 1 = time limit reached; the best solution found so far is
+        # still returned (see mip_gap in the result)
+        status = {0: "optimal", 1: "time_limit", 2: "infeasible", 3: "unbounded"}.get(res.status, "failed")
+        solver = "milp"
+    segundos = time.perf_counter() - inicio
+
+    resultado = {"status": status, "solver": solver, "seconds": segundos}
+    if res.x is None:
+        return resultado
+    y = res.x[:n] if lot_size is None else np.round(res.x[:n])
+    units = y * lot + 0.0  # + 0.0 turns the solver's -0.0 into 0.0
+    costs, risks = model.A_ub[:2].toarray()
+    resultado.update({
+        "units": units,
+        "Return": float(model.expected_returns @ units),
+        "Cost": float(costs @ units),
+        "Risk": float(risks @ units),
+    })
+    if lot_size is not None:
+        resultado["lots"] = y.astype(np.int64)
+        resultado["mip_gap"] = float(res.mip_gap)
+    if max_turnover is not None:
+        h = np.zeros(n) if current is None else np.asarray(current, dtype=float)
+        resultado["Turnover"] = float(costs @ np.abs(units - h))
+    return resultado
+
+
+# === 3. BENCHMARK ===
+
+def random_book(n_assets, n_sectors=20, seed=0):
+    # Synthetic book with R$ 10,000 of budget per asset: positions capped at
+    # 3x the average, sector caps at 15% of the budget, current holdings worth
+    # about half of it and lots of 1, 10 or 100 units
+    rng = np.random.default_rng(seed)
+    costs = rng.uniform(50, 250, n_assets)
+    average_units = 10_000 / costs
+    model = PortfolioModel(rng.uniform(0.05, 0.15, n_assets) * costs, costs,
+                           rng.uniform(0.02, 0.07, n_assets), total_budget=10_000 * n_assets,
+                           max_total_risk=2.0 * n_assets, upper=3 * average_units)
+    add_sector_caps(model, rng.integers(0, n_sectors, n_assets), 0.15 * 10_000 * n_assets)
+    current = rng.uniform(0, 1, n_assets) * average_units
+    lots = rng.choice([1, 10, 100], n_assets, p=[0.6, 0.3, 0.1])
+    return model, current, lots
+
+def benchmark(sizes=(1_000, 5_000, 10_000, 50_000), time_limit=DEFAULT_TIME_LIMIT, seed=0):
+    # Solve time vs. number of assets for: the plain LP, LP + turnover, and
+    # LP + turnover + integer lots
+    linhas = []
+    for n in sizes:
+        model, current, lots = random_book(n, seed=seed)
+        budget = model.b_ub[0]
+        casos = {
+            "LP": {},
+            "LP + turnover": {"current": current, "max_turnover": 0.2 * budget},
+            "MILP + turnover + lots": {"current": current, "max_turnover": 0.2 * budget,
+                                       "lot_size": lots, "time_limit": time_limit},
+        }
+        for caso, kwargs in casos.items():
+            r = optimize(model, **kwargs)
+            linhas.append({"Assets": n, "Problem": caso, "Status": r["status"],
+                           "Seconds": r["seconds"], "Return": r.get("Return", np.nan),
+                           "MIP_Gap": r.get("mip_gap", np.nan)})
+    return pd.DataFrame(linhas)
+
+
+if __name__ == "__main__":
+    print(benchmark().to_string(index=False))
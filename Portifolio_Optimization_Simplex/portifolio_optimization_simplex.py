@@ -1,5 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
 from scipy.optimize import linprog
 
 # === 1. SIMULATED ASSET DATA ===
@@ -15,56 +14,72 @@ max_total_risk = 3.5       # Maximum allowed total risk
 
 # === 3. LINEAR PROGRAMMING FORMULATION ===
 
-# Objective: maximize total return → minimize -returns (linprog minimizes by default)
-c = -expected_returns
-
-# Constraints:
-# 1) total cost ≤ budget
-# 2) total risk ≤ max limit
-A = [costs_per_unit, risk_per_unit]
-b = [total_budget, max_total_risk]
-
-# Variables are non-negative
-x_bounds = [(0, None) for _ in range(len(expected_returns))]
-
-# === 4. SOLVING THE LP WITH SIMPLEX ===
-
-res = linprog(c, A_ub=A, b_ub=b, bounds=x_bounds, method='highs')
-
-if res.success:
-    allocation = res.x
-    total_return = np.dot(expected_returns, allocation)
-    total_cost = np.dot(costs_per_unit, allocation)
-    total_risk = np.dot(risk_per_unit, allocation)
-
-    asset_labels = [f"Asset {i+1}" for i in range(len(expected_returns))]
-
-    # === 5. PIE CHART - ALLOCATION ===
-    plt.figure(figsize=(10, 5))
-    plt.pie(allocation, labels=asset_labels, autopct='%1.1f%%', startangle=140)
+def run(total_budget=total_budget, max_total_risk=max_total_risk):
+    # Objective: maximize total return → minimize -returns (linprog minimizes by default)
+    c = -expected_returns
+
+    # Constraints:
+    # 1) total cost ≤ budget
+    # 2) total risk ≤ max limit
+    A = [costs_per_unit, risk_per_unit]
+    b = [total_budget, max_total_risk]
+
+    # Variables are non-negative
+    x_bounds = [(0, None) for _ in range(len(expected_returns))]
+
+    # === 4. SOLVING THE LP WITH SIMPLEX ===
+
+    res = linprog(c, A_ub=A, b_ub=b, bounds=x_bounds, method='highs')
+    resultado = {"success": res.success, "message": res.message,
+                 "asset_labels": [f"Asset {i+1}" for i in range(len(expected_returns))]}
+    if res.success:
+        allocation = res.x
+        resultado.update(allocation=allocation,
+                         total_return=np.dot(expected_returns, allocation),
+                         total_cost=np.dot(costs_per_unit, allocation),
+                         total_risk=np.dot(risk_per_unit, allocation))
+    return resultado
+
+# === 5. PRINT RESULTS ===
+
+def report(resultado):
+    if not resultado["success"]:
+        return f"❌ Optimization failed: {resultado['message']}"
+    linhas = ["\n📊 Optimization Results:"]
+    for i, qty in enumerate(resultado["allocation"]):
+        linhas.append(f" - Asset {i+1}: {qty:.2f} units")
+    linhas += [f"\n💰 Expected total return: R$ {resultado['total_return']:,.2f}",
+               f"📉 Total portfolio cost: R$ {resultado['total_cost']:,.2f}",
+               f"⚠️ Estimated total risk: {resultado['total_risk']:.2f} units"]
+    return "\n".join(linhas)
+
+# === 6. CHARTS - ALLOCATION AND SUMMARY ===
+
+def plot_results(resultado):
+    import matplotlib.pyplot as plt
+
+    if not resultado["success"]:
+        return []
+    allocation = plt.figure(figsize=(10, 5))
+    plt.pie(resultado["allocation"], labels=resultado["asset_labels"], autopct='%1.1f%%', startangle=140)
     plt.title("Optimal Portfolio Allocation (units per asset)")
     plt.axis('equal')
     plt.tight_layout()
-    plt.show()
 
-    # === 6. BAR CHART - SUMMARY ===
-    plt.figure(figsize=(8, 4))
+    summary = plt.figure(figsize=(8, 4))
     plt.bar(['Total Return', 'Total Cost', 'Total Risk'],
-            [total_return, total_cost, total_risk],
+            [resultado["total_return"], resultado["total_cost"], resultado["total_risk"]],
             color=['green', 'blue', 'red'])
     plt.title("Optimized Portfolio Summary")
     plt.ylabel("Value (R$ or units)")
     plt.grid(axis='y', linestyle='--', alpha=0.5)
     plt.tight_layout()
-    plt.show()
+    return [allocation, summary]
 
-    # === 7. PRINT RESULTS ===
-    print("\n📊 Optimization Results:")
-    for i, qty in enumerate(allocation):
-        print(f" - Asset {i+1}: {qty:.2f} units")
-    print(f"\n💰 Expected total return: R$ {total_return:,.2f}")
-    print(f"📉 Total portfolio cost: R$ {total_cost:,.2f}")
-    print(f"⚠️ Estimated total risk: {total_risk:.2f} units")
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
 
-else:
-    print("❌ Optimization failed:", res.message)
+    resultado = run()
+    plot_results(resultado)
+    print(report(resultado))
+    plt.show()
@@ -2,7 +2,9 @@
 
 import numpy_financial as npf
 import numpy as np
-import matplotlib.pyplot as plt
+
+from project_montecarlo import simulate_project, summary_text
+from scenario_grid import grid_frame, plot_tornado, tornado
 
 # --- Simulated Data ---
 initial_investment = 100000.0
@@ -20,27 +22,65 @@ def evaluate_project(cash_flows, rate):
     payback = next((i for i, val in enumerate(cumulative) if val >= 0), None)
     return npv, irr, payback, cumulative
 
-# --- Run evaluation ---
-npv, irr, payback, cumulative = evaluate_project(cash_flows, discount_rate)
+# --- Run evaluation, sensitivity and Monte Carlo ---
+def run(cash_flows=cash_flows, discount_rate=discount_rate, n_simulations=100_000, seed=42):
+    npv, irr, payback, cumulative = evaluate_project(cash_flows, discount_rate)
+
+    # Sensitivity: discount rate x inflow shocks
+    grid = grid_frame(cash_flows, [discount_rate - 0.02, discount_rate, discount_rate + 0.02],
+                      [0.8, 0.9, 1.0, 1.1, 1.2])
+    sensitivity = tornado(cash_flows, discount_rate)
+
+    # Monte Carlo: inflows uncertain by ±15% (1 sd), correlated across years
+    uncertain_flows = [cash_flows[0]] + [{"dist": "normal", "mean": cf, "sd": abs(0.15 * cf)}
+                                         for cf in cash_flows[1:]]
+    simulation = simulate_project(uncertain_flows, discount_rate, n_simulations=n_simulations,
+                                  correlation=0.5, seed=seed)
+    return {"cash_flows": list(cash_flows), "discount_rate": discount_rate, "npv": npv, "irr": irr,
+            "payback": payback, "cumulative": cumulative, "grid": grid,
+            "sensitivity": sensitivity, "simulation": simulation}
 
 # --- Display Results ---
-print("🔹 Simulated Project Evaluation")
-print(f"Initial Investment: R$ {initial_investment:,.2f}")
-print(f"Discount Rate: {discount_rate*100:.2f}%")
-print(f"Cash Flows: {cash_flows}")
-
-print("\n📊 Results:")
-print(f"NPV (Net Present Value): R$ {npv:,.2f}")
-print(f"IRR (Internal Rate of Return): {irr*100:.2f}%")
-print(f"Payback Period: {payback} year(s)" if payback is not None else "Payback Period: Not recovered")
-
-# --- Plot Cumulative Cash Flow ---
-plt.figure(figsize=(8, 5))
-plt.plot(cumulative, marker='o', color='green', linewidth=2)
-plt.axhline(0, color='red', linestyle='--')
-plt.title("Cumulative Cash Flow Over Time")
-plt.xlabel("Year")
-plt.ylabel("Cumulative Cash Flow (R$)")
-plt.grid(True)
-plt.tight_layout()
-plt.show()
+def report(resultado):
+    payback = resultado["payback"]
+    return "\n".join([
+        "🔹 Simulated Project Evaluation",
+        f"Initial Investment: R$ {-resultado['cash_flows'][0]:,.2f}",
+        f"Discount Rate: {resultado['discount_rate']*100:.2f}%",
+        f"Cash Flows: {resultado['cash_flows']}",
+        "\n📊 Results:",
+        f"NPV (Net Present Value): R$ {resultado['npv']:,.2f}",
+        f"IRR (Internal Rate of Return): {resultado['irr']*100:.2f}%",
+        f"Payback Period: {payback} year(s)" if payback is not None else "Payback Period: Not recovered",
+        "\n📈 NPV by Inflow Shock (rows) and Discount Rate (columns):",
+        resultado["grid"].pivot(index="Shock", columns="Rate", values="NPV").round(2).to_string(),
+        "\n🌪️ NPV Sensitivity (±20% per driver):",
+        resultado["sensitivity"].round(2).to_string(index=False),
+        "\n🎲 Monte Carlo Valuation:",
+        summary_text(resultado["simulation"]),
+    ])
+
+# --- Plot Cumulative Cash Flow and Tornado ---
+def plot_results(resultado):
+    import matplotlib.pyplot as plt
+
+    cumulative = plt.figure(figsize=(8, 5))
+    plt.plot(resultado["cumulative"], marker='o', color='green', linewidth=2)
+    plt.axhline(0, color='red', linestyle='--')
+    plt.title("Cumulative Cash Flow Over Time")
+    plt.xlabel("Year")
+    plt.ylabel("Cumulative Cash Flow (R$)")
+    plt.grid(True)
+    plt.tight_layout()
+
+    ax = plot_tornado(resultado["sensitivity"], resultado["npv"])
+    ax.figure.tight_layout()
+    return [cumulative, ax.figure]
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    resultado = run()
+    print(report(resultado))
+    plot_results(resultado)
+    plt.show()
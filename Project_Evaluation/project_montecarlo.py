@@ -0,0 +1,169 @@
+# project_montecarlo.py
+#
+# Monte Carlo valuation of a project with uncertain cash flows and discount
+# rate. Each year's cash flow follows its own distribution (normal, lognormal
+# or triangular); the years are linked by a Gaussian copula with the given
+# correlation. Simulations are drawn in chunks of (simulations x years)
+# matrices: NPV is a matrix-vector product with the discount vector (or a
+# row-wise product when the rate is also random) and payback is the first
+# year where the cumulative sum turns non-negative.
+
+import time
+
+import numpy as np
+
+DISTRIBUTIONS = ["normal", "lognormal", "triangular"]
+DEFAULT_CHUNK_SIZE = 100_000
+PERCENTILES = [1, 5, 10, 25, 50, 75, 90, 95, 99]
+RATE_FLOOR = -0.99  # (1 + r)^-t breaks down at r <= -1
+RATE_SDS = 6  # normal rates need mean - RATE_SDS * sd above RATE_FLOOR (tail mass ~1e-9)
+
+
+# === 1. DISTRIBUTIONS ===
+
+def _check_spec(spec, rate=False):
+    # A spec is a number (fixed value) or a dict:
+    #   {"dist": "normal", "mean": m, "sd": s}
+    #   {"dist": "lognormal", "mean": m, "sd": s}   (m > 0; mean/sd of the flow itself)
+    #   {"dist": "triangular", "low": a, "mode": c, "high": b}
+    # Rate specs must stay above RATE_FLOOR: fixed rates, triangular lows and
+    # normal rates up to RATE_SDS standard deviations below the mean. Near
+    # -100% the discount factors explode, so a normal rate with real mass
+    # down there gives a meaningless NPV distribution and is rejected.
+    if rate:
+        if not isinstance(spec, dict):
+            lowest = spec
+        elif spec.get("dist") == "triangular":
+            lowest = spec["low"]
+        elif spec.get("dist") == "normal":
+            lowest = spec["mean"] - RATE_SDS * spec["sd"]
+        else:
+            lowest = None  # lognormal rates are positive
+        if lowest is not None and lowest <= RATE_FLOOR:
+            raise ValueError(f"Discount rates must stay above {RATE_FLOOR:.0%}, "
+                             f"this rate reaches {lowest:.2%}")
+    if not isinstance(spec, dict):
+        return
+    dist = spec.get("dist")
+    if dist not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution {dist!r}, expected one of {DISTRIBUTIONS}")
+    if dist == "lognormal" and spec["mean"] <= 0:
+        raise ValueError("Lognormal cash flows need a positive mean")
+    if dist == "triangular" and not spec["low"] <= spec["mode"] <= spec["high"]:
+        raise ValueError("Triangular cash flows need low <= mode <= high")
+
+def _from_normal(spec, z):
+    # Maps standard normal draws z to the distribution in spec
+    if not isinstance(spec, dict):
+        return np.full_like(z, spec)
+    if spec["dist"] == "normal":
+        return spec["mean"] + spec["sd"] * z
+    if spec["dist"] == "lognormal":
+        sigma2 = np.log1p((spec["sd"] / spec["mean"]) ** 2)
+        return np.exp(np.log(spec["mean"]) - sigma2 / 2 + np.sqrt(sigma2) * z)
+    # Triangular: inverse CDF of the uniform u = Phi(z)
+    from scipy.special import ndtr
+
+    a, c, b = spec["low"], spec["mode"], spec["high"]
+    if b == a:
+        return np.full_like(z, a)
+    u = ndtr(z)
+    fc = (c - a) / (b - a)
+    return np.where(u < fc,
+                    a + np.sqrt(u * (b - a) * (c - a)),
+                    b - np.sqrt((1 - u) * (b - a) * (b - c)))
+
+def _draw_rates(spec, rng, n):
+    # Normal rates are drawn from the normal truncated at RATE_FLOOR (inverse
+    # CDF of a uniform above Phi(floor)). _check_spec keeps the cut tail below
+    # about 1e-9, so the distribution is the one asked for, and no draw can
+    # reach the floor.
+    if spec["dist"] != "normal":
+        return _from_normal(spec, rng.standard_normal(n))
+    from scipy.special import ndtr, ndtri
+
+    with np.errstate(divide="ignore"):
+        lower = max(ndtr((RATE_FLOOR - spec["mean"]) / spec["sd"]), np.finfo(float).tiny)
+    return spec["mean"] + spec["sd"] * ndtri(rng.uniform(lower, 1.0, n))
+
+def _correlation_factor(correlation, n_flows):
+    # Cholesky factor of the correlation between years: a scalar rho gives
+    # the same correlation for every pair of years
+    if np.isscalar(correlation):
+        corr = np.full((n_flows, n_flows), float(correlation))
+        np.fill_diagonal(corr, 1.0)
+    else:
+        corr = np.asarray(correlation, dtype=float)
+        if corr.shape != (n_flows, n_flows):
+            raise ValueError(f"Correlation must be a scalar or {n_flows}x{n_flows}, got {corr.shape}")
+    # Raises LinAlgError if the matrix is not positive definite
+    return np.linalg.cholesky(corr).T
+
+
+# === 2. SIMULATION ===
+
+def simulate_project(cash_flows, rate, n_simulations=1_000_000, correlation=0.0,
+                     chunk_size=DEFAULT_CHUNK_SIZE, seed=None, return_npv=False):
+    # cash_flows: one spec per year (year 0 is usually the fixed investment)
+    # rate: fixed discount rate or a spec, drawn once per simulation
+    # Returns the NPV mean, standard deviation and percentiles, the
+    # probability of a negative NPV and of no payback, and how many
+    # simulations pay back in each year.
+    for spec in cash_flows:
+        _check_spec(spec)
+    _check_spec(rate, rate=True)
+    rng = np.random.default_rng(seed)
+    n_flows = len(cash_flows)
+    chol_t = _correlation_factor(correlation, n_flows)
+    t = np.arange(n_flows)
+    fixed_rate = not isinstance(rate, dict)
+    discount = (1 + rate) ** -t if fixed_rate else None
+
+    npv = np.empty(n_simulations)
+    payback_counts = np.zeros(n_flows + 1, dtype=np.int64)  # last bin: never
+    inicio = time.perf_counter()
+    for start in range(0, n_simulations, chunk_size):
+        n = min(chunk_size, n_simulations - start)
+        z = rng.standard_normal((n, n_flows)) @ chol_t
+        flows = np.empty_like(z)
+        for year, spec in enumerate(cash_flows):
+            flows[:, year] = _from_normal(spec, z[:, year])
+
+        if fixed_rate:
+            npv[start:start + n] = flows @ discount
+        else:
+            rates = _draw_rates(rate, rng, n)
+            npv[start:start + n] = (flows * (1 + rates[:, None]) ** -t).sum(axis=1)
+
+        reached = np.cumsum(flows, axis=1) >= 0
+        payback = np.where(reached.any(axis=1), reached.argmax(axis=1), n_flows)
+        payback_counts += np.bincount(payback, minlength=n_flows + 1)
+    segundos = time.perf_counter() - inicio
+
+    resultado = {
+        "npv_mean": float(npv.mean()),
+        "npv_std": float(npv.std()),
+        "npv_percentiles": dict(zip(PERCENTILES, np.percentile(npv, PERCENTILES))),
+        "prob_negative_npv": float((npv < 0).mean()),
+        "prob_no_payback": float(payback_counts[-1] / n_simulations),
+        "payback_counts": payback_counts[:-1],
+        "n_simulations": n_simulations,
+        "seconds": segundos,
+    }
+    if return_npv:
+        resultado["npv"] = npv
+    return resultado
+
+def summary_text(resultado):
+    linhas = [f"Simulations: {resultado['n_simulations']:,} ({resultado['seconds']:.2f}s)",
+              f"NPV mean: R$ {resultado['npv_mean']:,.2f} (sd R$ {resultado['npv_std']:,.2f})"]
+    linhas += [f"  P{p:<2}: R$ {v:,.2f}" for p, v in resultado["npv_percentiles"].items()]
+    linhas += [f"P(NPV < 0): {resultado['prob_negative_npv']:.2%}",
+               f"P(no payback): {resultado['prob_no_payback']:.2%}"]
+    return "\n".join(linhas)
+
+
+if __name__ == "__main__":
+    flows = [-100000.0] + [{"dist": "normal", "mean": m, "sd": 0.15 * m}
+                           for m in [20000, 25000, 30000, 30000, 25000]]
+    print(summary_text(simulate_project(flows, 0.10, correlation=0.5, seed=42)))
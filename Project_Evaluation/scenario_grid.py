@@ -0,0 +1,160 @@
+# scenario_grid.py
+#
+# Sensitivity analysis for a single project: NPV, IRR and payback over a grid
+# of discount rates x multiplicative cash-flow shocks in one vectorized pass.
+#
+# - The discount factors (1+r)^-t are built once per grid and shared by every
+#   shock scenario: the NPV surface is one matrix product.
+# - IRR and payback do not depend on the discount rate, so they are computed
+#   per shock scenario, and IRR only once per distinct cash-flow vector (the
+#   results are also memoized across calls).
+# - tornado() ranks the drivers (investment, each year's cash flow and the
+#   discount rate) by the NPV swing between their low and high values.
+
+from functools import lru_cache
+
+import numpy as np
+import numpy_financial as npf
+import pandas as pd
+
+
+# === 1. SCENARIOS ===
+
+def shock_matrix(shocks, n_flows):
+    # Multiplicative shocks as an (scenarios, n_flows) matrix. A 1-D array
+    # holds one factor per scenario applied to the inflows (years 1..n), with
+    # the initial investment unchanged; a 2-D array is used as given.
+    shocks = np.asarray(shocks, dtype=float)
+    if shocks.ndim == 1:
+        matrix = np.ones((len(shocks), n_flows))
+        matrix[:, 1:] = shocks[:, None]
+        return matrix
+    if shocks.ndim != 2 or shocks.shape[1] != n_flows:
+        raise ValueError(f"Shocks must be 1-D or (scenarios, {n_flows}), got shape {shocks.shape}")
+    return shocks
+
+def discount_factors(rates, n_flows):
+    # (rates, n_flows) matrix of 1/(1+r)^t, t = 0..n
+    rates = np.atleast_1d(np.asarray(rates, dtype=float))
+    return (1 + rates[:, None]) ** -np.arange(n_flows)
+
+
+# === 2. EVALUATION ===
+
+@lru_cache(maxsize=65_536)
+def _irr(flows):
+    return float(npf.irr(np.array(flows)))
+
+def irr_unique(flows):
+    # IRR per row, solving each distinct cash-flow vector only once
+    unique, inverse = np.unique(flows, axis=0, return_inverse=True)
+    irr = np.array([_irr(tuple(row)) for row in unique])
+    return irr[inverse.ravel()]
+
+def evaluate_grid(cash_flows, rates, shocks):
+    # Vectorized evaluate_project over every (shock, rate) pair. Returns a
+    # dict with:
+    #   npv: (scenarios, rates) | irr, payback: (scenarios,)
+    #   cumulative: (scenarios, n_flows) | flows: the shocked cash flows
+    # payback is -1 where the investment is never recovered.
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    flows = shock_matrix(shocks, len(cash_flows)) * cash_flows
+    npv = flows @ discount_factors(rates, len(cash_flows)).T
+    cumulative = np.cumsum(flows, axis=1)
+    reached = cumulative >= 0
+    payback = np.where(reached.any(axis=1), reached.argmax(axis=1), -1)
+    return {"npv": npv, "irr": irr_unique(flows), "payback": payback,
+            "cumulative": cumulative, "flows": flows}
+
+def grid_frame(cash_flows, rates, shocks):
+    # Long table for 1-D (inflow) shocks: one row per (Shock, Rate)
+    shocks = np.asarray(shocks, dtype=float)
+    rates = np.atleast_1d(np.asarray(rates, dtype=float))
+    result = evaluate_grid(cash_flows, rates, shocks)
+    payback = np.repeat(result["payback"], len(rates))
+    return pd.DataFrame({
+        "Shock": np.repeat(shocks, len(rates)),
+        "Rate": np.tile(rates, len(shocks)),
+        "NPV": result["npv"].ravel(),
+        "IRR": np.repeat(result["irr"], len(rates)),
+        "Payback": pd.Series(payback, dtype="Int64").mask(payback < 0),
+    })
+
+
+# === 3. TORNADO ===
+
+def tornado(cash_flows, rate, low=0.8, high=1.2, rate_low=None, rate_high=None):
+    # NPV with one driver at a time moved to its low/high value and the rest
+    # at base. Cash-flow drivers are scaled by low/high; the discount rate
+    # goes to rate_low/rate_high (default: rate * low / rate * high).
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    n = len(cash_flows)
+    rate_low = rate * low if rate_low is None else rate_low
+    rate_high = rate * high if rate_high is None else rate_high
+
+    # One scenario per (driver, side): identity rows scaled by the shock
+    shocks = np.ones((2 * n, n))
+    shocks[np.arange(n), np.arange(n)] = low
+    shocks[n + np.arange(n), np.arange(n)] = high
+    npv_flows = evaluate_grid(cash_flows, [rate], shocks)["npv"][:, 0]
+    npv_rate = evaluate_grid(cash_flows, [rate_low, rate_high], np.ones((1, n)))["npv"][0]
+
+    drivers = ["Investment" if t == 0 else f"Year {t}" for t in range(n)] + ["Discount Rate"]
+    table = pd.DataFrame({
+        "Driver": drivers,
+        "NPV_Low": np.append(npv_flows[:n], npv_rate[0]),
+        "NPV_High": np.append(npv_flows[n:], npv_rate[1]),
+    })
+    table["Swing"] = (table["NPV_High"] - table["NPV_Low"]).abs()
+    return table.sort_values("Swing", ascending=False, ignore_index=True)
+
+def plot_tornado(table, base_npv, ax=None):
+    # Horizontal bars from the base NPV to the low/high NPV of each driver,
+    # largest swing on top
+    import matplotlib.pyplot as plt
+
+    if ax is None:
+        _, ax = plt.subplots(figsize=(8, 5))
+    rows = table.iloc[::-1]
+    y = np.arange(len(rows))
+    ax.barh(y, rows["NPV_Low"] - base_npv, left=base_npv, color="indianred", label="Low")
+    ax.barh(y, rows["NPV_High"] - base_npv, left=base_npv, color="seagreen", label="High")
+    ax.axvline(base_npv, color="black", linewidth=1)
+    ax.set_yticks(y)
+    ax.set_yticklabels(rows["Driver"])
+    ax.set_title("NPV Sensitivity (Tornado)")
+    ax.set_xlabel("NPV (R$)")
+    ax.legend()
+    return ax
+
+
+# === 4. VERIFICATION ===
+
+def check_against_loop(cash_flows, rates, shocks):
+    # Largest NPV/IRR difference vs. npf.npv / npf.irr called per scenario.
+    # Scenarios without an IRR are NaN on both sides; NaN in different
+    # scenarios counts as an infinite difference.
+    result = evaluate_grid(cash_flows, rates, shocks)
+    npv_loop = np.array([[npf.npv(rate, flows) for rate in rates] for flows in result["flows"]])
+    irr_loop = np.array([npf.irr(flows) for flows in result["flows"]])
+    worst = []
+    for got, expected in [(result["npv"], npv_loop), (result["irr"], irr_loop)]:
+        if not np.array_equal(np.isnan(got), np.isnan(expected)):
+            worst.append(np.inf)
+        else:
+            worst.append(float(np.nanmax(np.abs(got - expected), initial=0.0)))
+    return tuple(worst)
+
+
+if __name__ == "__main__":
+    import time
+
+    cash_flows = [-100000.0, 20000, 25000, 30000, 30000, 25000]
+    rates = np.linspace(0.0, 0.30, 301)
+    shocks = np.linspace(0.5, 1.5, 1001)
+    inicio = time.perf_counter()
+    result = evaluate_grid(cash_flows, rates, shocks)
+    segundos = time.perf_counter() - inicio
+    print(f"{result['npv'].size:,} scenarios in {segundos:.3f}s")
+    worst_npv, worst_irr = check_against_loop(cash_flows, rates[::30], shocks[::100])
+    print(f"Largest difference vs. numpy_financial: NPV {worst_npv:.2e} | IRR {worst_irr:.2e}")
@@ -0,0 +1,164 @@
+# quantile_sketch.py
+#
+# Streaming VaR/ES: a mergeable t-digest fed chunk by chunk, so the simulated
+# losses never need to be held in memory or sorted all at once.
+#
+# The digest keeps about two thousand weighted centroids. Centroids are small in
+# the tails and large around the median (arcsine scale function), so the
+# extreme quantiles used for VaR stay accurate. Digests built in different
+# processes can be merged, and the same structure yields the histogram bins
+# for the loss chart.
+
+import numpy as np
+
+DEFAULT_COMPRESSION = 4000
+
+
+class TDigest:
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    # === 1. CONSTRUÇÃO ===
+
+    def _compress(self, values, weights):
+        order = np.argsort(values, kind="stable")
+        x, w = values[order], weights[order]
+        total = w.sum()
+        q = (np.cumsum(w) - w / 2) / total
+        # Cada unidade inteira da escala k vira um centróide: como k cresce
+        # rápido perto de q=0 e q=1, as caudas ficam com centróides pequenos
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        ids = np.floor(k - k[0]).astype(np.int64)
+        ids = np.concatenate([[0], np.cumsum(np.diff(ids) > 0)])
+        self.weights = np.bincount(ids, weights=w)
+        self.means = np.bincount(ids, weights=w * x) / self.weights
+        self.count = total
+
+    def update(self, values):
+        # Acrescenta um bloco de observações (qualquer forma/dtype numérico)
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(values.size)]))
+        return self
+
+    def merge(self, other):
+        # Junta outro digest (ex.: vindo de outro processo) a este
+        if other.count == 0:
+            return self
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+        return self
+
+    # === 2. CONSULTAS ===
+
+    def _knots(self):
+        # Função quantil linear por partes: (peso acumulado, valor)
+        mids = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], mids, [self.count]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return positions, values
+
+    def quantile(self, q):
+        if self.count == 0:
+            return np.nan
+        positions, values = self._knots()
+        # Mesma convenção de np.percentile (posto q*(n-1)): com centróides
+        # unitários, o ponto médio do i-ésimo valor fica em i + 0.5
+        return np.interp(0.5 + np.asarray(q) * (self.count - 1), positions, values)
+
+    def cdf(self, x):
+        if self.count == 0:
+            return np.nan
+        positions, values = self._knots()
+        return np.interp(x, values, positions) / self.count
+
+    def var_es(self, nivel_confianca=0.95, n_grid=4096):
+        # VaR: quantil no nível de confiança; ES: média da função quantil
+        # acima dele (integral numérica sobre a cauda)
+        var = float(self.quantile(nivel_confianca))
+        # A integral usa a posição pela massa (u * n): cada observação pesa o
+        # mesmo na cauda, como na média das perdas acima do VaR
+        u = nivel_confianca + (1 - nivel_confianca) * (np.arange(n_grid) + 0.5) / n_grid
+        positions, values = self._knots()
+        es = float(np.interp(u * self.count, positions, values).mean())
+        return var, es
+
+    def histogram(self, bins=100, range=None):
+        # Contagens aproximadas por faixa, no formato de np.histogram:
+        # plt.stairs(counts, edges) ou plt.hist(edges[:-1], edges, weights=counts)
+        lo, hi = range if range is not None else (self.min, self.max)
+        edges = np.linspace(lo, hi, bins + 1)
+        acumulado = self.cdf(edges)
+        # As bordas que cobrem o mínimo/máximo incluem essas observações inteiras
+        if lo <= self.min:
+            acumulado[0] = 0.0
+        if hi >= self.max:
+            acumulado[-1] = 1.0
+        counts = np.diff(acumulado) * self.count
+        return counts, edges
+
+    def __len__(self):
+        return len(self.means)
+
+
+def merge_all(digests, compression=None):
+    digests = list(digests)
+    merged = TDigest(compression or (digests[0].compression if digests else DEFAULT_COMPRESSION))
+    for d in digests:
+        merged.merge(d)
+    return merged
+
+
+# === 3. VERIFICAÇÃO DE PRECISÃO ===
+
+# Erro aceito nas verificações, relativo ao desvio padrão das perdas
+TOLERANCIA = 0.005
+
+
+def accuracy_check(sizes=(10_000, 100_000, 1_000_000), niveis=(0.95, 0.99, 0.999),
+                   chunk_size=10_000, n_partes=4, seed=0):
+    # Compara VaR/ES do digest (construído em blocos e em partes mescladas,
+    # como nos processos paralelos) com np.percentile sobre todas as perdas.
+    # Devolve (n, nível, erro VaR, erro ES, centróides) por linha, com os
+    # erros relativos ao desvio padrão das perdas; quem chama compara com
+    # TOLERANCIA.
+    rng = np.random.default_rng(seed)
+    linhas = []
+    for n in sizes:
+        # Perdas assimétricas, como nas carteiras compostas dia a dia
+        perdas = 1_000_000 * (1 - np.exp(rng.normal(0.003, 0.06, n)))
+        escala = perdas.std()
+        partes = []
+        for parte in np.array_split(perdas, n_partes):
+            d = TDigest()
+            for inicio in np.arange(0, len(parte), chunk_size):
+                d.update(parte[inicio:inicio + chunk_size])
+            partes.append(d)
+        digest = merge_all(partes)
+
+        for nivel in niveis:
+            var_exato = np.percentile(perdas, 100 * nivel)
+            es_exato = perdas[perdas >= var_exato].mean()
+            var, es = digest.var_es(nivel)
+            linhas.append((n, nivel, abs(var - var_exato) / escala, abs(es - es_exato) / escala, len(digest)))
+    return linhas
+
+
+if __name__ == "__main__":
+    for n, nivel, erro_var, erro_es, centroides in accuracy_check():
+        status = "ok" if max(erro_var, erro_es) < TOLERANCIA else "ACIMA DA TOLERÂNCIA"
+        print(f"n={n:>9,}  nível={nivel:.3f}  erro VaR={erro_var:.4%}  "
+              f"erro ES={erro_es:.4%}  (desvio padrão; {centroides} centróides)  {status}")
@@ -1,14 +1,15 @@
-import numpy as np
-import matplotlib.pyplot as plt
+from var_engine import covariance_from_vols, simulate_var
 
 # === 1. INPUT PARAMETERS ===
 
 # Valor total investido
 valor_carteira = 1_000_000  # R$
 
-# Retorno esperado anual e volatilidade
-retorno_esperado_anual = 0.08   # 8%
-volatilidade_anual = 0.20       # 20%
+# Carteira: pesos, retorno esperado anual e volatilidade de cada ativo
+pesos = [1.0]
+retornos_esperados_anuais = [0.08]   # 8%
+volatilidades_anuais = [0.20]        # 20%
+correlacao = [[1.0]]
 
 # Horizonte de análise
 dias = 10
@@ -17,40 +18,52 @@ nivel_confianca = 0.95
 # Número de simulações Monte Carlo
 n_simulacoes = 100_000
 
-# === 2. CONVERSÃO PARA BASE DIÁRIA ===
+# === 2. SIMULAÇÃO E CÁLCULO DO VALUE AT RISK ===
 
-# O mercado considera 252 dias úteis por ano
-retorno_diario = retorno_esperado_anual / 252
-volatilidade_diaria = volatilidade_anual / np.sqrt(252)
+def run(seed=None, estimator="exact", valor_carteira=valor_carteira, dias=dias,
+        nivel_confianca=nivel_confianca, n_simulacoes=n_simulacoes):
+    # estimator="tdigest" não guarda as perdas (para centenas de milhões de cenários)
+    covariancia_anual = covariance_from_vols(volatilidades_anuais, correlacao)
+    return simulate_var(valor_carteira, pesos, retornos_esperados_anuais, covariancia_anual,
+                        dias=dias, nivel_confianca=nivel_confianca,
+                        n_simulacoes=n_simulacoes, seed=seed, estimator=estimator,
+                        return_losses=estimator == "exact")
 
-# === 3. SIMULAÇÃO DE RETORNOS ===
+# === 3. VISUALIZAÇÃO ===
 
-# Simula n retornos acumulados em 'dias'
-retornos_simulados = np.random.normal(
-    loc=retorno_diario * dias,
-    scale=volatilidade_diaria * np.sqrt(dias),
-    size=n_simulacoes
-)
+def report(resultado):
+    nivel = int(resultado["nivel_confianca"] * 100)
+    return (f"VaR ({nivel}%, {resultado['dias']} dias): R$ {resultado['VaR']:,.2f}\n"
+            f"Expected Shortfall: R$ {resultado['ES']:,.2f}")
 
-# Transforma os retornos simulados em perdas monetárias
-valores_finais = valor_carteira * (1 + retornos_simulados)
-perdas_simuladas = valor_carteira - valores_finais  # Perda positiva = prejuízo
+def plot_losses(resultado):
+    import matplotlib.pyplot as plt
 
-# === 4. CÁLCULO DO VALUE AT RISK ===
+    VaR, ES = resultado["VaR"], resultado["ES"]
+    nivel = int(resultado["nivel_confianca"] * 100)
+    fig = plt.figure(figsize=(10, 6))
+    if "perdas" in resultado:
+        plt.hist(resultado["perdas"], bins=100, color='lightgray', edgecolor='black')
+    else:
+        # Histograma aproximado a partir do digest
+        counts, edges = resultado["digest"].histogram(bins=100)
+        plt.hist(edges[:-1], edges, weights=counts, color='lightgray', edgecolor='black')
+    plt.axvline(VaR, color='red', linestyle='--', linewidth=2,
+                label=f'VaR ({nivel}%) = R$ {VaR:,.2f}')
+    plt.axvline(ES, color='darkred', linestyle=':', linewidth=2,
+                label=f'ES ({nivel}%) = R$ {ES:,.2f}')
+    plt.title("📉 Monte Carlo Simulation of Portfolio Losses")
+    plt.xlabel("Simulated Loss (R$)")
+    plt.ylabel("Frequency")
+    plt.legend()
+    plt.grid(True, linestyle="--", alpha=0.5)
+    plt.tight_layout()
+    return [fig]
 
-# Percentil de perda (ex: 5% das piores perdas)
-VaR = np.percentile(perdas_simuladas, 100 * nivel_confianca)
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
 
-# === 5. VISUALIZAÇÃO ===
-
-plt.figure(figsize=(10, 6))
-plt.hist(perdas_simuladas, bins=100, color='lightgray', edgecolor='black')
-plt.axvline(VaR, color='red', linestyle='--', linewidth=2,
-            label=f'VaR ({int(nivel_confianca*100)}%) = R$ {VaR:,.2f}')
-plt.title("📉 Monte Carlo Simulation of Portfolio Losses")
-plt.xlabel("Simulated Loss (R$)")
-plt.ylabel("Frequency")
-plt.legend()
-plt.grid(True, linestyle="--", alpha=0.5)
-plt.tight_layout()
-plt.show()
+    resultado = run()
+    print(report(resultado))
+    plot_losses(resultado)
+    plt.show()
@@ -0,0 +1,192 @@
+# var_engine.py
+#
+# Monte Carlo VaR and Expected Shortfall for multi-asset portfolios.
+# Daily returns are drawn for every asset over the whole horizon (correlated
+# through the Cholesky factor of the covariance matrix) and compounded day by
+# day, so each scenario is a full price path and not a single aggregated draw.
+# Scenarios are generated in chunks to keep memory bounded.
+
+import numpy as np
+
+from quantile_sketch import TDigest
+
+DIAS_UTEIS_ANO = 252  # O mercado considera 252 dias úteis por ano
+DEFAULT_CHUNK_SIZE = 100_000
+SAMPLING_METHODS = ["pseudo", "antithetic", "sobol"]
+ESTIMATORS = ["exact", "tdigest"]
+SOBOL_MAX_DIM = 21201  # dimensões suportadas por scipy.stats.qmc.Sobol (dias x ativos)
+
+
+# === 1. PARÂMETROS ===
+
+def covariance_from_vols(volatilidades, correlacao=None):
+    # Matriz de covariância a partir das volatilidades e da correlação
+    vols = np.atleast_1d(np.asarray(volatilidades, dtype=float))
+    corr = np.eye(len(vols)) if correlacao is None else np.asarray(correlacao, dtype=float)
+    return corr * np.outer(vols, vols)
+
+def sobol_count(n):
+    # Menor potência de 2 >= n: os pontos de Sobol só são equilibrados em blocos de 2^m
+    return 1 << max(int(n) - 1, 0).bit_length()
+
+def _daily_params(retornos_anuais, covariancia_anual, dtype):
+    mu = np.atleast_1d(np.asarray(retornos_anuais, dtype=float)) / DIAS_UTEIS_ANO
+    cov = np.atleast_2d(np.asarray(covariancia_anual, dtype=float)) / DIAS_UTEIS_ANO
+    if cov.shape != (len(mu), len(mu)):
+        raise ValueError(f"Covariance matrix must be {len(mu)}x{len(mu)}, got {cov.shape}")
+    # Raises LinAlgError if the matrix is not positive definite
+    chol = np.linalg.cholesky(cov)
+    return mu.astype(dtype), chol.T.astype(dtype)
+
+
+# === 2. SIMULAÇÃO ===
+
+class _NormalDraws:
+    # Choques normais padrão (cenários, dias, ativos) segundo o método de amostragem:
+    # - pseudo: Generator.standard_normal
+    # - antithetic: metade dos cenários sorteada, a outra metade espelhada (-z)
+    # - sobol: Sobol embaralhado (quasi-Monte Carlo) transformado pela inversa da normal
+
+    def __init__(self, rng, dias, n_ativos, dtype, sampling):
+        if sampling not in SAMPLING_METHODS:
+            raise ValueError(f"Unknown sampling {sampling!r}, expected one of {SAMPLING_METHODS}")
+        self.rng = rng
+        self.shape = (dias, n_ativos)
+        self.dtype = dtype
+        self.sampling = sampling
+        if sampling == "sobol":
+            if dias * n_ativos > SOBOL_MAX_DIM:
+                raise ValueError(f"Sobol sampling supports at most {SOBOL_MAX_DIM} dimensions "
+                                 f"(dias x ativos), got {dias} x {n_ativos} = {dias * n_ativos}")
+            # scipy só é necessário para a amostragem quasi-aleatória
+            from scipy.special import ndtri
+            from scipy.stats import qmc
+
+            self._ndtri = ndtri
+            self._sobol = qmc.Sobol(d=dias * n_ativos, scramble=True, seed=rng)
+
+    def __call__(self, n):
+        if self.sampling == "pseudo":
+            return self.rng.standard_normal((n, *self.shape), dtype=self.dtype)
+        if self.sampling == "antithetic":
+            metade = self.rng.standard_normal(((n + 1) // 2, *self.shape), dtype=self.dtype)
+            return np.concatenate([metade, -metade])[:n]
+        u = self._sobol.random(n)
+        # Evita ±inf nas pontas da inversa da normal
+        np.clip(u, 1e-12, 1 - 1e-12, out=u)
+        return self._ndtri(u).astype(self.dtype).reshape(n, *self.shape)
+
+def simulate_losses(valor_carteira, pesos, retornos_anuais, covariancia_anual, dias=10,
+                    n_simulacoes=100_000, chunk_size=DEFAULT_CHUNK_SIZE, seed=None,
+                    dtype=np.float64, intra_horizonte=False, sampling="pseudo"):
+    # Gera as perdas simuladas em blocos de até chunk_size cenários.
+    # Perda positiva = prejuízo. Com intra_horizonte=True cada bloco é um par
+    # (perda_final, pior_perda_no_caminho).
+    # seed: inteiro, SeedSequence ou np.random.Generator
+    # sampling: "pseudo", "antithetic" ou "sobol" (ver _NormalDraws); com
+    # "sobol", n_simulacoes é arredondado para cima até uma potência de 2
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    dtype = np.dtype(dtype)
+    mu, chol_t = _daily_params(retornos_anuais, covariancia_anual, dtype)
+    posicoes = (valor_carteira * np.asarray(pesos, dtype=float)).astype(dtype)
+    if posicoes.shape != mu.shape:
+        raise ValueError(f"Expected {len(mu)} weights, got {posicoes.shape[0]}")
+    n_ativos = len(mu)
+    valor_inicial = posicoes.sum()
+    draws = _NormalDraws(rng, dias, n_ativos, dtype, sampling)
+    if sampling == "sobol":
+        # Total e blocos em potência de 2 preservam o equilíbrio dos pontos de Sobol
+        n_simulacoes = sobol_count(n_simulacoes)
+        chunk_size = min(1 << (max(chunk_size, 1).bit_length() - 1), n_simulacoes)
+
+    restantes = n_simulacoes
+    while restantes > 0:
+        n = min(chunk_size, restantes)
+        restantes -= n
+
+        # Retornos diários correlacionados: (cenários, dias, ativos)
+        z = draws(n)
+        retornos = z @ chol_t
+        retornos += mu
+
+        # Caminho do valor de cada ativo, composto dia a dia, e da carteira
+        retornos += 1
+        np.cumprod(retornos, axis=1, out=retornos)
+        valores = retornos @ posicoes  # (cenários, dias)
+
+        perdas = valor_inicial - valores[:, -1]
+        if intra_horizonte:
+            yield perdas, valor_inicial - valores.min(axis=1)
+        else:
+            yield perdas
+
+
+# === 3. VALUE AT RISK E EXPECTED SHORTFALL ===
+
+def var_es(perdas, nivel_confianca=0.95):
+    # VaR: percentil das perdas; ES: média das perdas a partir do VaR
+    perdas = np.asarray(perdas)
+    var = float(np.percentile(perdas, 100 * nivel_confianca))
+    es = float(perdas[perdas >= var].mean())
+    return var, es
+
+class _LossBuffer:
+    # Guarda todas as perdas para o percentil exato (estimator="exact")
+
+    def __init__(self, n, dtype):
+        self.perdas = np.empty(n, dtype=dtype)
+        self.n = 0
+
+    def update(self, bloco):
+        self.perdas[self.n:self.n + len(bloco)] = bloco
+        self.n += len(bloco)
+
+    def var_es(self, nivel_confianca):
+        return var_es(self.perdas[:self.n], nivel_confianca)
+
+def _loss_collector(estimator, n_simulacoes, dtype):
+    if estimator == "exact":
+        return _LossBuffer(n_simulacoes, dtype)
+    if estimator == "tdigest":
+        return TDigest()
+    raise ValueError(f"Unknown estimator {estimator!r}, expected one of {ESTIMATORS}")
+
+def simulate_var(valor_carteira, pesos, retornos_anuais, covariancia_anual, dias=10,
+                 nivel_confianca=0.95, n_simulacoes=100_000, chunk_size=DEFAULT_CHUNK_SIZE,
+                 seed=None, dtype=np.float64, intra_horizonte=False, sampling="pseudo",
+                 estimator="exact", return_losses=False):
+    # VaR e ES da perda no fim do horizonte (e, se pedido, da pior perda ao
+    # longo do caminho). Os caminhos existem apenas bloco a bloco.
+    # estimator="exact": guarda as n_simulacoes perdas e usa np.percentile.
+    # estimator="tdigest": alimenta um TDigest bloco a bloco; nenhum vetor de
+    # perdas é criado e o digest (mesclável, com histograma) vai no resultado.
+    # Com sampling="sobol" o resultado traz o n_simulacoes arredondado (sobol_count).
+    dtype = np.dtype(dtype)
+    if sampling == "sobol":
+        n_simulacoes = sobol_count(n_simulacoes)
+    if return_losses and estimator != "exact":
+        raise ValueError("return_losses requires estimator='exact'")
+    perdas = _loss_collector(estimator, n_simulacoes, dtype)
+    perdas_intra = _loss_collector(estimator, n_simulacoes, dtype) if intra_horizonte else None
+
+    for bloco in simulate_losses(valor_carteira, pesos, retornos_anuais, covariancia_anual, dias,
+                                 n_simulacoes, chunk_size, seed, dtype, intra_horizonte, sampling):
+        if intra_horizonte:
+            bloco, bloco_intra = bloco
+            perdas_intra.update(bloco_intra)
+        perdas.update(bloco)
+
+    var, es = perdas.var_es(nivel_confianca)
+    resultado = {"VaR": var, "ES": es, "nivel_confianca": nivel_confianca,
+                 "dias": dias, "n_simulacoes": n_simulacoes}
+    if intra_horizonte:
+        resultado["VaR_intra"], resultado["ES_intra"] = perdas_intra.var_es(nivel_confianca)
+    if estimator == "tdigest":
+        resultado["digest"] = perdas
+        if intra_horizonte:
+            resultado["digest_intra"] = perdas_intra
+    if return_losses:
+        resultado["perdas"] = perdas.perdas
+        if intra_horizonte:
+            resultado["perdas_intra"] = perdas_intra.perdas
+    return resultado
@@ -0,0 +1,33 @@
+# cents.py
+#
+# Rounding to cents for the vectorized engines, shared by the project folders
+# (the scripts add the repository root to sys.path to import it).
+#
+# The scripts round with round(v, 2), which rounds the exact binary value of v.
+# np.round(v, 2) rounds v * 100 after that product has been rounded to a
+# double, so a value lying just off a half-cent can land on it and go the other
+# way: round(-0.475, 2) == -0.47 but np.round(-0.475, 2) == -0.48.
+#
+# round_cents gives round()'s result for every value, without a tolerance: the
+# rounding error of v * 100 is recovered exactly with Dekker's product, and
+# products that landed exactly on a half-cent go to the side the exact value
+# lies on. Only an exact half-cent is rounded half to even, as round() does.
+
+import numpy as np
+
+_SPLIT = 2.0 ** 27 + 1  # Veltkamp split of a double into two 26-bit halves
+
+
+def round_cents(values, out=None):
+    # Same result as [round(v, 2) for v in values]; NaN and inf pass through.
+    # out may be values itself (rounded in place).
+    values = np.asarray(values, dtype=float)
+    with np.errstate(invalid="ignore", over="ignore"):
+        scaled = values * 100
+        big = values * _SPLIT
+        high = big - (big - values)
+        # scaled + error == values * 100 exactly (100 needs no split)
+        error = (high * 100 - scaled) + (values - high) * 100
+        tie = (scaled - np.floor(scaled) == 0.5) & (error != 0)
+        rounded = np.where(tie, np.where(error > 0, np.ceil(scaled), np.floor(scaled)), np.rint(scaled))
+    return np.divide(rounded, 100, out=out)
@@ -0,0 +1,66 @@
+# financial_models
+#
+# Headless access to the repository's models. Each project folder keeps its
+# script; the script exposes run() (pure computation, returns a dict),
+# report() (text) and a plot function that imports matplotlib only when
+# called. This package adds the project folders to sys.path and imports a
+# model's script on first use, so importing financial_models itself costs
+# nothing and the compute path never loads matplotlib.
+#
+#   import financial_models as fm
+#   resultado = fm.run("loan", principal=80_000, years=10)
+#   print(fm.report("loan", resultado))
+#
+# Plots: financial_models.plots.render(); command line: python -m financial_models
+# Benchmarks: financial_models.benchmarks; stage timing and profiling:
+# financial_models.instrument (off unless FINANCIAL_MODELS_INSTRUMENT is set)
+
+import importlib
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name: (project folder, script module, plot function)
+MODELS = {
+    "loan": ("Loan_Amortization", "loan_amortization", "plot_schedule"),
+    "var": ("Value_at_Risk_Simulation_Monte_Carlo", "value_at_risk_simulation", "plot_losses"),
+    "npv": ("Net_Present_Value", "npv_analysis", "plot_results"),
+    "project": ("Project_Evaluation", "project_evaluation", "plot_results"),
+    "portfolio": ("Portifolio_Optimization_Simplex", "portifolio_optimization_simplex", "plot_results"),
+    "bank": ("Bank_Balance_Simulation", "bank_balance_simulation", "plot_composition"),
+    "credit": ("Credit_Risk_Simulation", "credit_risk_analysis", "plot_results"),
+}
+
+
+def add_path(folder):
+    # Project modules import their siblings by name
+    path = os.path.join(ROOT, folder)
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"Project folder {path} not found; install the repository with "
+                                f"'pip install -e .' instead of a regular install")
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def load(name):
+    # The model's script module (its engines are importable afterwards too)
+    if name not in MODELS:
+        raise KeyError(f"Unknown model {name!r}, expected one of {', '.join(MODELS)}")
+    folder, module, _ = MODELS[name]
+    add_path(folder)
+    script = importlib.import_module(module)
+    if os.environ.get("FINANCIAL_MODELS_INSTRUMENT"):
+        from financial_models import instrument
+
+        if instrument.enable_from_env():
+            instrument.install(name)
+    return script
+
+
+def run(name, **params):
+    return load(name).run(**params)
+
+
+def report(name, resultado):
+    return load(name).report(resultado)
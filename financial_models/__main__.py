@@ -0,0 +1,3 @@
+from financial_models.cli import main
+
+main()
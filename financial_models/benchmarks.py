@@ -0,0 +1,269 @@
+# benchmarks.py
+#
+# Benchmark suite for the models' hot paths. Every benchmark has a synthetic
+# generator scaled by one size (schedule rows, scenarios, cash-flow rows,
+# companies, assets, clients) and a run() that is timed on its own, without
+# the generation. For each model and size it records the best wall time of a
+# few runs, the tracemalloc peak of one extra run (so tracing does not skew
+# the timings) and the throughput in units per second.
+#
+# Runs are appended to a JSON history; each result is compared with the
+# median of the previous runs of the same model and size on the same
+# machine, and flagged when it is slower by more than the tolerance.
+#
+# Usage: python -m financial_models bench [--models loan var ...] [--sizes 1e3 1e4 1e5 1e6 1e7]
+#                                         [--check] [--stages] [--history PATH]
+
+import datetime
+import gc
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+from financial_models import ROOT, add_path
+
+DEFAULT_SIZES = [10**3, 10**4, 10**5, 10**6]
+DEFAULT_HISTORY = os.path.join(ROOT, ".benchmarks", "history.json")
+DEFAULT_TOLERANCE = 0.25   # 25% slower than the baseline is a regression
+MIN_REGRESSION_SECONDS = 0.005
+BASELINE_RUNS = 5
+LONG_RUN_SECONDS = 5.0     # no repeats once a single run takes this long
+
+
+def _module(folder, name):
+    add_path(folder)
+    return importlib.import_module(name)
+
+
+# === 1. BENCHMARKS ===
+# Each setup(n, seed) returns the data for run(data); n is in the unit of the benchmark
+
+def _loan_setup(n, seed):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    n_loans = max(1, n // 60)  # 5-year loans: 60 schedule rows each
+    return (rng.uniform(5_000, 500_000, n_loans), rng.uniform(2, 30, n_loans), np.full(n_loans, 60))
+
+def _loan_run(data):
+    engine = _module("Loan_Amortization", "amortization_engine")
+    return engine.amortization_arrays(*data)
+
+
+def _var_setup(n, seed):
+    engine = _module("Value_at_Risk_Simulation_Monte_Carlo", "var_engine")
+    vols = [0.20, 0.25, 0.15, 0.30, 0.10]
+    correlacao = [[1.0 if i == j else 0.3 for j in range(5)] for i in range(5)]
+    return {"valor_carteira": 1_000_000, "pesos": [0.2] * 5, "retornos_anuais": [0.08] * 5,
+            "covariancia_anual": engine.covariance_from_vols(vols, correlacao), "n_simulacoes": n,
+            "seed": seed}
+
+def _var_run(data):
+    engine = _module("Value_at_Risk_Simulation_Monte_Carlo", "var_engine")
+    return engine.simulate_var(**data)
+
+
+def _npv_setup(n, seed):
+    engine = _module("Net_Present_Value", "npv_engine")
+    return engine.random_cashflows(max(1, n // 8), seed=seed)  # 8.5 years per project on average
+
+def _npv_run(data):
+    engine = _module("Net_Present_Value", "npv_engine")
+    return engine.evaluate_projects(data)
+
+
+def _payment_setup(n, seed):
+    return _module("Payment_Capacity", "scoring").random_financials(n, seed)
+
+def _payment_run(data):
+    return _module("Payment_Capacity", "scoring").score_batch(data)
+
+
+def _portfolio_setup(n, seed):
+    # Budget, risk and sector caps (the turnover and lot variants scale far
+    # worse, see optimizer.benchmark)
+    return _module("Portifolio_Optimization_Simplex", "optimizer").random_book(n, seed=seed)[0]
+
+def _portfolio_run(data):
+    return _module("Portifolio_Optimization_Simplex", "optimizer").optimize(data)
+
+
+def _bank_setup(n, seed):
+    # Scenarios on the balance sheet of bank_balance_simulation.py
+    base = _module("Bank_Balance_Simulation", "bank_balance_simulation").base
+    return _module("Bank_Balance_Simulation", "stress_engine").random_scenarios(n, seed=seed), base
+
+def _bank_run(data):
+    return _module("Bank_Balance_Simulation", "stress_engine").stress_test(*data)
+
+
+def _credit_setup(n, seed):
+    import numpy as np
+
+    filters = _module("Credit_Risk_Simulation", "credit_filters")
+    rng = np.random.default_rng(seed)
+    consultas = [(sorted(rng.integers(18, 75, 2)), sorted(rng.integers(300, 851, 2)),
+                  list(rng.choice(["Low", "Medium", "High"], rng.integers(1, 4), replace=False)))
+                 for _ in range(100)]
+    return filters.random_clients(n, seed), consultas
+
+def _credit_run(data):
+    # Index build plus 100 slider moves
+    filters = _module("Credit_Risk_Simulation", "credit_filters")
+    df, consultas = data
+    index = filters.CreditIndex(df)
+    return [index.summary(*consulta) for consulta in consultas]
+
+
+# name: (unit, largest size that fits in a few GB, setup, run, instrument.STAGES key)
+BENCHMARKS = {
+    "loan": ("schedule rows", 10**7, _loan_setup, _loan_run, "loan"),
+    "var": ("scenarios", 10**7, _var_setup, _var_run, "var"),
+    "npv": ("cash-flow rows", 10**7, _npv_setup, _npv_run, "npv"),
+    "payment": ("companies", 10**7, _payment_setup, _payment_run, "payment"),
+    "portfolio": ("assets", 10**5, _portfolio_setup, _portfolio_run, "portfolio"),
+    "bank": ("scenarios", 10**7, _bank_setup, _bank_run, "bank"),
+    "credit_filters": ("clients", 10**7, _credit_setup, _credit_run, "credit"),
+}
+
+
+# === 2. MEASUREMENT ===
+
+def measure(name, size, repeats=3, memory=True, stages=False, seed=0):
+    # The timed runs never go through the instrumentation: stages and the
+    # memory peak each get one extra run of their own
+    unit, _, setup, run, stage_key = BENCHMARKS[name]
+    data = setup(size, seed)
+    run(data)  # warm-up: imports, caches
+    tempos = []
+    for _ in range(repeats):
+        gc.collect()
+        inicio = time.perf_counter()
+        run(data)
+        tempos.append(time.perf_counter() - inicio)
+        if tempos[-1] > LONG_RUN_SECONDS:
+            break
+    resultado = {"model": name, "size": size, "unit": unit, "seconds": min(tempos),
+                 "median_seconds": statistics.median(tempos), "runs": len(tempos),
+                 "throughput": size / min(tempos)}
+    if stages:
+        from financial_models import instrument
+
+        instrument.enable("time")
+        instrument.install(stage_key)
+        instrument.reset()
+        try:
+            run(data)
+            resultado["stages"] = {stage: round(v["seconds"] / v["calls"], 6)
+                                   for stage, v in instrument.stats().items()}
+        finally:
+            instrument.disable()
+            instrument.uninstall()
+    if memory:
+        gc.collect()
+        ja_rastreando = tracemalloc.is_tracing()
+        if ja_rastreando:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+        try:
+            base = tracemalloc.get_traced_memory()[0]
+            run(data)
+            resultado["peak_mb"] = (tracemalloc.get_traced_memory()[1] - base) / 2**20
+        finally:
+            if not ja_rastreando:
+                tracemalloc.stop()
+    del data
+    gc.collect()
+    return resultado
+
+
+def machine():
+    import numpy as np
+
+    return {"python": platform.python_version(), "numpy": np.__version__,
+            "platform": platform.platform(), "cpus": os.cpu_count(), "node": platform.node()}
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(models=None, sizes=DEFAULT_SIZES, repeats=3, memory=True, stages=False, seed=0, progress=None):
+    # Sizes above a benchmark's limit are skipped
+    resultados = []
+    for name in models or BENCHMARKS:
+        if name not in BENCHMARKS:
+            raise KeyError(f"Unknown benchmark {name!r}, expected one of {', '.join(BENCHMARKS)}")
+        for size in sizes:
+            if size > BENCHMARKS[name][1]:
+                continue
+            resultado = measure(name, size, repeats, memory, stages, seed)
+            resultados.append(resultado)
+            if progress is not None:
+                progress(resultado)
+    return {"timestamp": datetime.datetime.now().isoformat(timespec="seconds"), "commit": _commit(),
+            "machine": machine(), "results": resultados}
+
+
+# === 3. HISTORY AND REGRESSIONS ===
+
+def load_history(path=DEFAULT_HISTORY):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_history(history, path=DEFAULT_HISTORY):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp, path)
+
+
+def _key(resultado):
+    # The stages get a run of their own, so runs with and without --stages
+    # time the same thing
+    return resultado["model"], resultado["size"]
+
+def compare(run, history, tolerance=DEFAULT_TOLERANCE, baseline_runs=BASELINE_RUNS):
+    # Adds "baseline_seconds", "change" and "regression" to each result of
+    # `run`, against the median of the last baseline_runs runs with the same
+    # model and size on the same machine. Returns the regressions.
+    anteriores = [r for r in history if r["machine"].get("node") == run["machine"]["node"]
+                  and r["machine"].get("cpus") == run["machine"]["cpus"]]
+    regressions = []
+    for resultado in run["results"]:
+        passados = [p["seconds"] for r in anteriores for p in r["results"]
+                    if _key(p) == _key(resultado)][-baseline_runs:]
+        if not passados:
+            continue
+        base = statistics.median(passados)
+        resultado["baseline_seconds"] = base
+        resultado["change"] = resultado["seconds"] / base - 1
+        resultado["regression"] = (resultado["change"] > tolerance
+                                   and resultado["seconds"] - base > MIN_REGRESSION_SECONDS)
+        if resultado["regression"]:
+            regressions.append(resultado)
+    return regressions
+
+
+def format_result(resultado):
+    linha = (f"{resultado['model']:>15} {resultado['size']:>10,} {resultado['unit']:<15}"
+             f"{resultado['seconds']:>10.4f}s {resultado['throughput']:>14,.0f}/s")
+    if "peak_mb" in resultado:
+        linha += f" {resultado['peak_mb']:>9.1f} MB"
+    if "change" in resultado:
+        linha += f" {resultado['change']:>+8.1%}{'  REGRESSION' if resultado['regression'] else ''}"
+    return linha
@@ -0,0 +1,169 @@
+# cli.py
+#
+# Usage: python -m financial_models <model> [options] [--plot none|save|show] [--output-dir DIR]
+#                                            [--instrument time,memory,profile]
+#        python -m financial_models imports
+#        python -m financial_models bench [--models ...] [--sizes ...] [--check]
+#
+# --plot none (default) never imports matplotlib; --plot save renders with
+# the Agg backend into --output-dir, so it also works without a display.
+# --instrument prints the time (and tracemalloc peak / cProfile) of the
+# model's core stages, see instrument.py.
+# "imports" times loading each model's compute path in a fresh interpreter;
+# "bench" runs the benchmark suite of benchmarks.py.
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from financial_models import MODELS, ROOT, load, report, run
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog="python -m financial_models",
+                                     description="Run the financial models headless")
+    plot = argparse.ArgumentParser(add_help=False)
+    plot.add_argument("--plot", choices=["none", "save", "show"], default="none",
+                      help="none: numbers only (default); save: PNGs via Agg; show: open windows")
+    plot.add_argument("--output-dir", default=".", help="Where --plot save writes the PNGs")
+    plot.add_argument("--instrument", help="Comma-separated: time, memory, profile")
+    sub = parser.add_subparsers(dest="model", required=True)
+
+    p = sub.add_parser("loan", parents=[plot], help="Loan amortization schedule")
+    p.add_argument("--principal", type=float, default=50_000.0)
+    p.add_argument("--rate", dest="annual_rate", type=float, default=12.0, help="Annual rate in %%")
+    p.add_argument("--years", type=int, default=5)
+
+    p = sub.add_parser("var", parents=[plot], help="Monte Carlo Value at Risk")
+    p.add_argument("--value", dest="valor_carteira", type=float, default=1_000_000)
+    p.add_argument("--days", dest="dias", type=int, default=10)
+    p.add_argument("--confidence", dest="nivel_confianca", type=float, default=0.95)
+    p.add_argument("--simulations", dest="n_simulacoes", type=int, default=100_000)
+    p.add_argument("--estimator", choices=["exact", "tdigest"], default="exact")
+    p.add_argument("--seed", type=int)
+
+    p = sub.add_parser("npv", parents=[plot], help="NPV, IRR, payback and ROI per project")
+    p.add_argument("path", nargs="?", default=os.path.join(ROOT, "Net_Present_Value", "project_cashflows.xlsx"))
+    p.add_argument("--no-cache", dest="use_cache", action="store_false")
+    p.add_argument("-o", "--output", help="Also write the summary (.xlsx, .csv, .parquet, .feather)")
+
+    p = sub.add_parser("project", parents=[plot], help="Project evaluation, sensitivity and Monte Carlo")
+    p.add_argument("--flows", dest="cash_flows", type=float, nargs="+",
+                   default=[-100000.0, 20000, 25000, 30000, 30000, 25000])
+    p.add_argument("--rate", dest="discount_rate", type=float, default=0.10)
+    p.add_argument("--simulations", dest="n_simulations", type=int, default=100_000)
+    p.add_argument("--seed", type=int, default=42)
+
+    p = sub.add_parser("portfolio", parents=[plot], help="Portfolio allocation by linear programming")
+    p.add_argument("--budget", dest="total_budget", type=float, default=10_000)
+    p.add_argument("--max-risk", dest="max_total_risk", type=float, default=3.5)
+
+    p = sub.add_parser("bank", parents=[plot], help="Bank balance sheet, stress test and projection")
+    p.add_argument("--scenarios", dest="n_scenarios", type=int, default=10_000)
+    p.add_argument("--months", dest="n_periods", type=int, default=36)
+    p.add_argument("--seed", type=int, default=42)
+
+    p = sub.add_parser("credit", parents=[plot], help="Credit risk summary and portfolio loss distribution")
+    p.add_argument("path", nargs="?", default=os.path.join(ROOT, "Credit_Risk_Simulation",
+                                                           "client_credit_risk_base_en.xlsx"))
+    p.add_argument("--scenarios", dest="n_scenarios", type=int, default=50_000)
+    p.add_argument("--correlation", type=float, default=0.15)
+    p.add_argument("--seed", type=int, default=42)
+
+    sub.add_parser("imports", help="Time the compute-only import of every model")
+
+    p = sub.add_parser("bench", help="Benchmark suite with a JSON history")
+    p.add_argument("--models", nargs="+", help="Default: all benchmarks")
+    p.add_argument("--sizes", nargs="+", type=lambda v: int(float(v)), help="e.g. 1e3 1e4 1e5 1e6 1e7")
+    p.add_argument("--repeats", type=int, default=3)
+    p.add_argument("--no-memory", dest="memory", action="store_false", help="Skip the tracemalloc run")
+    p.add_argument("--stages", action="store_true", help="Record the time of each core stage")
+    p.add_argument("--history", help="JSON history file (default: .benchmarks/history.json)")
+    p.add_argument("--no-history", dest="save", action="store_false", help="Do not append this run")
+    p.add_argument("--tolerance", type=float, help="Slowdown flagged as a regression (default 0.25)")
+    p.add_argument("--check", action="store_true", help="Exit with status 1 if anything regressed")
+    return parser
+
+
+def _bench(args):
+    from financial_models import benchmarks
+
+    history_path = args["history"] or benchmarks.DEFAULT_HISTORY
+    tolerance = benchmarks.DEFAULT_TOLERANCE if args["tolerance"] is None else args["tolerance"]
+    history = benchmarks.load_history(history_path)
+    run = benchmarks.run_suite(args["models"], args["sizes"] or benchmarks.DEFAULT_SIZES, args["repeats"],
+                               args["memory"], args["stages"], progress=lambda r: print(benchmarks.format_result(r)))
+    regressions = benchmarks.compare(run, history, tolerance)
+    if args["save"]:
+        benchmarks.save_history(history + [run], history_path)
+        print(f"\n📁 Run appended to '{history_path}'")
+    if any("change" in r for r in run["results"]):
+        print("\n📈 Against the previous runs:")
+        for resultado in run["results"]:
+            print(benchmarks.format_result(resultado))
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) slower than +{tolerance:.0%}")
+    if args["check"] and regressions:
+        sys.exit(1)
+    return run
+
+
+def import_times(models=None, repeats=3):
+    # Median seconds to `import financial_models` and load each model in a
+    # fresh interpreter, and whether matplotlib got imported on the way
+    codigo = ("import sys, time; t = time.perf_counter(); import financial_models; "
+              "financial_models.load({!r}); "
+              "print(time.perf_counter() - t, 'matplotlib' in sys.modules)")
+    tempos = {}
+    for name in models or MODELS:
+        medidas = []
+        for _ in range(repeats):
+            saida = subprocess.run([sys.executable, "-c", codigo.format(name)], cwd=ROOT,
+                                   capture_output=True, text=True, check=True).stdout.split()
+            medidas.append(float(saida[0]))
+        tempos[name] = {"seconds": sorted(medidas)[len(medidas) // 2], "matplotlib": saida[1] == "True"}
+    return tempos
+
+
+def main(argv=None):
+    args = vars(_parser().parse_args(argv))
+    name = args.pop("model")
+    if name == "imports":
+        for model, medida in import_times().items():
+            print(f"{model:>10}: {medida['seconds']:.3f}s"
+                  f"{'  (imports matplotlib)' if medida['matplotlib'] else ''}")
+        return None
+    if name == "bench":
+        return _bench(args)
+
+    plot, output_dir, output = args.pop("plot"), args.pop("output_dir"), args.pop("output", None)
+    instrumentation = args.pop("instrument")
+    if instrumentation:
+        from financial_models import instrument
+
+        instrument.enable(*[o.strip() for o in instrumentation.split(",")])
+        load(name)
+        instrument.install(name)
+    inicio = time.perf_counter()
+    resultado = run(name, **args)
+    print(report(name, resultado))
+    print(f"\n⏱️ {name} computed in {time.perf_counter() - inicio:.2f}s")
+    if instrumentation:
+        print("\n" + instrument.report())
+        if "profile" in instrumentation:
+            print(instrument.profile_report())
+    if output:
+        # Only the npv model takes -o; run() put its folder on sys.path
+        from npv_io import write_table
+
+        write_table(resultado["summary"], output)
+        print(f"✅ Summary written to '{output}'")
+    if plot != "none":
+        from financial_models.plots import render
+
+        _, paths = render(name, resultado, mode=plot, output_dir=output_dir)
+        for path in paths:
+            print(f"🖼️ Figure saved to '{path}'")
+    return resultado
@@ -0,0 +1,248 @@
+# instrument.py
+#
+# Opt-in instrumentation of the models' core stages. Nothing here runs unless
+# it is enabled, either from code (enable()) or with the environment variable
+#
+#   FINANCIAL_MODELS_INSTRUMENT=time            wall time per stage
+#   FINANCIAL_MODELS_INSTRUMENT=time,memory     + tracemalloc peak per stage
+#   FINANCIAL_MODELS_INSTRUMENT=time,profile    + cProfile of the stages
+#
+# stage(name) is a context manager for any block. install(model) wraps the
+# engine functions listed in STAGES in a stage of the same name (the engines
+# are left untouched on disk and when instrumentation is off), including the
+# copies bound by "from engine import function" in the other project modules;
+# uninstall() puts the originals back.
+
+import cProfile
+import functools
+import importlib
+import io
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+from financial_models import add_path
+
+ENV_VAR = "FINANCIAL_MODELS_INSTRUMENT"
+OPTIONS = ["time", "memory", "profile"]
+
+# model: (project folder, {module: [functions or Class.method]})
+STAGES = {
+    "loan": ("Loan_Amortization", {
+        "amortization_engine": ["amortization_arrays", "amortization_frame"],
+        "amortization_store": ["write_book"],
+    }),
+    "var": ("Value_at_Risk_Simulation_Monte_Carlo", {
+        "var_engine": ["simulate_losses", "simulate_var", "var_es"],
+        "var_parallel": ["parallel_var"],
+    }),
+    "npv": ("Net_Present_Value", {
+        "npv_io": ["read_table", "write_table"],
+        "npv_engine": ["pivot_cashflows", "npv_batch", "irr_batch", "payback_batch", "roi_batch",
+                       "evaluate_projects"],
+    }),
+    "project": ("Project_Evaluation", {
+        "scenario_grid": ["evaluate_grid", "grid_frame", "tornado"],
+        "project_montecarlo": ["simulate_project"],
+    }),
+    "portfolio": ("Portifolio_Optimization_Simplex", {
+        "portifolio_optimization_simplex": ["run"],
+        "frontier": ["frontier"],
+        "optimizer": ["_problem", "optimize"],
+    }),
+    "bank": ("Bank_Balance_Simulation", {
+        "stress_engine": ["stress_test", "breach_summary"],
+        "balance_projection": ["BalanceProjection.project", "BalanceProjection.ratios",
+                               "BalanceProjection.consolidate", "BalanceProjection.consolidated_ratios"],
+    }),
+    "credit": ("Credit_Risk_Simulation", {
+        "credit_loss": ["simulate_credit_losses", "loss_summary"],
+        "credit_filters": ["CreditIndex.__init__", "CreditIndex.summary", "CreditIndex.rows"],
+    }),
+    "payment": ("Payment_Capacity", {
+        "scoring": ["calculate_indicators_batch", "classify_rating_batch", "score_batch"],
+        "batch_stream": ["stream_scores"],
+    }),
+}
+
+
+# === 1. STAGES ===
+
+class _State:
+
+    def __init__(self):
+        self.enabled = set()
+        self.stats = {}       # name: {"calls", "seconds", "peak_bytes"}
+        self.profiler = None
+        self.pilha = []       # open stages: [name, inicio, base memory, peak so far]
+        self.own_tracemalloc = False  # tracing started by enable(), stopped by disable()
+        self.patches = []     # (owner, attribute, value before install) for uninstall()
+
+_state = _State()
+
+
+def enable(*options):
+    # enable("time", "memory", "profile"); no options = "time"
+    options = set(options or ["time"])
+    unknown = options - set(OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown instrumentation {', '.join(sorted(unknown))}, expected {OPTIONS}")
+    _state.enabled = options | {"time"}
+    if "memory" in options and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _state.own_tracemalloc = True
+    if "profile" in options and _state.profiler is None:
+        _state.profiler = cProfile.Profile()
+
+
+def disable():
+    # Tracing started by the caller before enable() keeps running
+    _state.enabled = set()
+    if _state.own_tracemalloc and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _state.own_tracemalloc = False
+
+
+def enabled():
+    return bool(_state.enabled)
+
+
+def enable_from_env():
+    valor = os.environ.get(ENV_VAR, "")
+    options = [o.strip() for o in valor.split(",") if o.strip()]
+    if options:
+        enable(*options)
+    return enabled()
+
+
+def reset():
+    _state.stats = {}
+    _state.profiler = cProfile.Profile() if "profile" in _state.enabled else None
+
+
+def stage(name):
+    # No-op context unless instrumentation is enabled
+    return _stage(name) if _state.enabled else nullcontext()
+
+
+@contextmanager
+def _stage(name):
+    memory = "memory" in _state.enabled and tracemalloc.is_tracing()
+    if memory:
+        current, peak = tracemalloc.get_traced_memory()
+        if _state.pilha:
+            # Keep the parent's peak before resetting it for this stage
+            _state.pilha[-1][3] = max(_state.pilha[-1][3], peak)
+        tracemalloc.reset_peak()
+    profiler = _state.profiler if not _state.pilha else None  # profile the outermost stage only
+    entrada = [name, time.perf_counter(), current if memory else 0, 0]
+    _state.pilha.append(entrada)
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        segundos = time.perf_counter() - entrada[1]
+        _state.pilha.pop()
+        stats = _state.stats.setdefault(name, {"calls": 0, "seconds": 0.0, "peak_bytes": 0})
+        stats["calls"] += 1
+        stats["seconds"] += segundos
+        if memory:
+            peak = max(entrada[3], tracemalloc.get_traced_memory()[1])
+            stats["peak_bytes"] = max(stats["peak_bytes"], peak - entrada[2])
+            if _state.pilha:
+                _state.pilha[-1][3] = max(_state.pilha[-1][3], peak)
+
+
+# === 2. HOOKS ===
+
+def _wrap(function, name):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not _state.enabled:
+            return function(*args, **kwargs)
+        with _stage(name):
+            return function(*args, **kwargs)
+    wrapper.__instrumented__ = function
+    return wrapper
+
+
+def _patch(owner, attribute, name):
+    # Replaces owner.attribute with its instrumented version; classmethods
+    # and staticmethods are unwrapped and rewrapped
+    raw = owner.__dict__[attribute] if isinstance(owner, type) else getattr(owner, attribute)
+    if getattr(raw, "__instrumented__", None) is not None:
+        return None
+    if isinstance(raw, (classmethod, staticmethod)):
+        wrapped = type(raw)(_wrap(raw.__func__, name))
+        original = raw.__func__
+    else:
+        wrapped = _wrap(raw, name)
+        original = raw
+    setattr(owner, attribute, wrapped)
+    _state.patches.append((owner, attribute, raw))
+    return original, wrapped
+
+
+def install(model):
+    # Wraps the STAGES of `model`. Modules of the model that cannot be
+    # imported (optional dependencies) are skipped.
+    folder, modules = STAGES[model]
+    add_path(folder)
+    installed = []
+    for module_name, attributes in modules.items():
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        for attribute in attributes:
+            owner, _, metodo = attribute.rpartition(".")
+            target = getattr(module, owner) if owner else module
+            patched = _patch(target, metodo, f"{module_name}.{attribute}")
+            if patched is None:
+                continue
+            original, wrapped = patched
+            installed.append(f"{module_name}.{attribute}")
+            if not owner:
+                # Names bound elsewhere with "from module import function"
+                for other in list(sys.modules.values()):
+                    namespace = getattr(other, "__dict__", None)
+                    if namespace is not None and other is not module and namespace.get(metodo) is original:
+                        setattr(other, metodo, wrapped)
+                        _state.patches.append((other, metodo, original))
+    return installed
+
+
+def uninstall():
+    # Puts back every function wrapped by install()
+    while _state.patches:
+        owner, attribute, value = _state.patches.pop()
+        setattr(owner, attribute, value)
+
+
+# === 3. REPORTS ===
+
+def stats():
+    return {name: dict(valores) for name, valores in _state.stats.items()}
+
+
+def report():
+    largura = max([len(name) + 2 for name in _state.stats] + [52])
+    linhas = [f"{'Stage':<{largura}}{'Calls':>7}{'Seconds':>10}{'Peak MB':>10}"]
+    for name, valores in sorted(_state.stats.items(), key=lambda item: -item[1]["seconds"]):
+        peak = f"{valores['peak_bytes'] / 2**20:>10.1f}" if "memory" in _state.enabled else f"{'-':>10}"
+        linhas.append(f"{name:<{largura}}{valores['calls']:>7}{valores['seconds']:>10.4f}{peak}")
+    return "\n".join(linhas)
+
+
+def profile_report(limit=25, sort="cumulative"):
+    if _state.profiler is None:
+        return "cProfile not enabled (FINANCIAL_MODELS_INSTRUMENT=time,profile)"
+    saida = io.StringIO()
+    pstats.Stats(_state.profiler, stream=saida).sort_stats(sort).print_stats(limit)
+    return saida.getvalue()
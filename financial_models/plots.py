@@ -0,0 +1,41 @@
+# plots.py
+#
+# Renderers for the models' results. matplotlib is imported here, on the
+# first render, never by the compute path. mode="save" switches to the Agg
+# backend (no display needed) and writes one PNG per figure; mode="show"
+# opens the figures with the current backend.
+
+import os
+
+from financial_models import MODELS, load
+
+RENDER_MODES = ["show", "save"]
+
+
+def use_backend(mode):
+    # Must run before pyplot is first imported to take effect
+    import matplotlib
+
+    if mode == "save":
+        matplotlib.use("Agg")
+
+
+def render(name, resultado, mode="save", output_dir="."):
+    # Returns the figures; with mode="save" also the paths of the PNG files
+    if mode not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode {mode!r}, expected one of {RENDER_MODES}")
+    use_backend(mode)
+    import matplotlib.pyplot as plt
+
+    figures = getattr(load(name), MODELS[name][2])(resultado)
+    if mode == "show":
+        plt.show()
+        return figures, []
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for i, fig in enumerate(figures, start=1):
+        path = os.path.join(output_dir, f"{name}_{i}.png")
+        fig.savefig(path, dpi=100)
+        plt.close(fig)
+        paths.append(path)
+    return figures, paths
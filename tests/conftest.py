@@ -0,0 +1,16 @@
+# conftest.py
+#
+# The projects are plain script folders whose modules import their siblings by
+# name, so every folder (and the repository root, for cents.py) goes on
+# sys.path. Module names are unique across the folders.
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for entry in sorted(os.listdir(ROOT)):
+    path = os.path.join(ROOT, entry)
+    if os.path.isdir(path) and entry[0].isupper():
+        sys.path.insert(0, path)
+sys.path.insert(0, ROOT)
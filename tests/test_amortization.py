@@ -0,0 +1,35 @@
+# test_amortization.py
+#
+# The vectorized schedules must match the month-by-month loop of
+# loan_amortization.py to the cent, for whole books with mixed terms.
+
+import numpy as np
+import pytest
+
+from amortization_engine import SCHEDULE_COLUMNS, amortization_arrays, amortization_frame, check_against_loop, loop_schedule
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_loop_to_the_cent(seed):
+    assert check_against_loop(600, seed) == 0.0
+
+
+def test_mixed_terms_and_zero_rate():
+    schedule = amortization_arrays([50_000, 120_000, 12_000], [12.0, 9.5, 0.0], [60, 360, 12])
+    for name in SCHEDULE_COLUMNS:
+        assert schedule[name].shape == (3, 360)
+        assert np.isnan(schedule[name][0, 60:]).all() and not np.isnan(schedule[name][0, :60]).any()
+    expected = loop_schedule(120_000, 9.5, 360)
+    for name in SCHEDULE_COLUMNS:
+        assert (schedule[name][1] == expected[name].to_numpy()).all(), name
+    # Zero-rate loans: equal installments, no interest
+    assert (schedule["Payment"][2, :12] == 1_000).all()
+    assert (schedule["Interest"][2, :12] == 0).all()
+    assert schedule["Balance"][2, 11] == 0
+
+
+def test_frame_is_loan_major():
+    frame = amortization_frame([10_000, 20_000], [10.0, 5.0], [3, 2])
+    assert frame[["Loan", "Month"]].values.tolist() == [[0, 1], [0, 2], [0, 3], [1, 1], [1, 2]]
+    expected = loop_schedule(10_000, 10.0, 3)
+    assert (frame.loc[frame["Loan"] == 0, "Balance"].to_numpy() == expected["Balance"].to_numpy()).all()
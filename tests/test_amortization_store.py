@@ -0,0 +1,65 @@
+# test_amortization_store.py
+#
+# A book written batch by batch must read back the same schedules as
+# amortization_arrays, through every lookup and in both formats.
+
+import numpy as np
+import pytest
+
+from amortization_engine import SCHEDULE_COLUMNS, amortization_arrays
+from amortization_store import MemmapBook, ParquetBook, open_book, write_book
+
+
+def _loans(n_loans, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(1_000, 1_000_000, n_loans), rng.uniform(1, 30, n_loans), rng.integers(1, 361, n_loans)
+
+
+def test_memmap_book_round_trip(tmp_path):
+    principal, annual_rate, n_periods = _loans(2_500)
+    write_book(principal, annual_rate, n_periods, tmp_path, batch_size=700, columns=["Balance", "Interest"])
+    book = open_book(tmp_path)
+    expected = amortization_arrays(principal, annual_rate, n_periods)
+
+    # Month-major on disk, loans x months through array()
+    assert isinstance(book, MemmapBook)
+    assert np.load(tmp_path / "balance.npy", mmap_mode="r").shape == (n_periods.max(), 2_500)
+    for name in ["Balance", "Interest"]:
+        assert np.array_equal(book.array(name), expected[name], equal_nan=True)
+    assert np.array_equal(book.month(37), expected["Balance"][:, 36], equal_nan=True)
+    assert book.get(123, 5) == expected["Balance"][123, 4]
+    term = n_periods[7]
+    assert (book.loan(7)["Interest"].to_numpy() == expected["Interest"][7, :term]).all()
+
+
+def test_parquet_book_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    principal, annual_rate, n_periods = _loans(900, seed=1)
+    write_book(principal, annual_rate, n_periods, tmp_path, format="parquet", batch_size=250)
+    book = open_book(tmp_path)
+    expected = amortization_arrays(principal, annual_rate, n_periods)
+
+    assert isinstance(book, ParquetBook)
+    assert sorted(p.name for p in tmp_path.glob("*.parquet")) == [f"part-{k:05d}.parquet" for k in range(4)]
+    # Loans in the first, a middle and the last (partial) batch
+    for loan in [0, 251, 899]:
+        schedule = book.loan(loan)
+        term = n_periods[loan]
+        assert schedule["Month"].tolist() == list(range(1, term + 1))
+        for name in SCHEDULE_COLUMNS:
+            assert (schedule[name].to_numpy() == expected[name][loan, :term]).all(), (loan, name)
+    assert np.array_equal(book.month(120), expected["Balance"][:, 119], equal_nan=True)
+    assert book.get(600, 3, "Interest") == expected["Interest"][600, 2]
+    short = int(np.argmin(n_periods))
+    assert np.isnan(book.get(short, n_periods[short] + 1))  # past its term
+
+
+def test_lookups_are_checked(tmp_path):
+    write_book([10_000, 20_000], [10.0, 5.0], [3, 2], tmp_path, columns=["Balance"])
+    book = open_book(tmp_path)
+    with pytest.raises(IndexError):
+        book.get(2, 1)
+    with pytest.raises(IndexError):
+        book.month(4)
+    with pytest.raises(KeyError):
+        book.month(1, "Interest")
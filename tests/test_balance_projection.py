@@ -0,0 +1,74 @@
+# test_balance_projection.py
+#
+# Projected balances against the month-by-month recurrence, and consolidated
+# figures against the sums of the entities in each group.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from balance_projection import DEFAULT_SCHEMA, BalanceProjection, BalanceSchema, random_network
+
+BANK = {"Loans": 7_000_000, "Reserves": 2_000_000, "Investments": 1_500_000, "Deposits": 8_000_000,
+        "Interbank Loans": 500_000, "Short-term Debt": 300_000, "Capital": 1_000_000}
+
+
+def test_projection_follows_recurrence():
+    rng = np.random.default_rng(0)
+    n_entities, n_periods, n_items = 6, 24, len(DEFAULT_SCHEMA.items)
+    opening = rng.uniform(1e5, 1e7, (n_entities, n_items))
+    growth = rng.uniform(0, 0.02, (n_entities, 1, n_items))  # per entity
+    runoff = rng.uniform(0, 0.02, (n_periods, n_items))  # per month
+    projection = BalanceProjection.project(opening, growth, runoff, n_periods)
+
+    expected = np.empty((n_entities, n_periods + 1, n_items))
+    expected[:, 0] = opening
+    for t in range(1, n_periods + 1):
+        expected[:, t] = expected[:, t - 1] * (1 + growth[:, 0] - runoff[t - 1])
+    np.testing.assert_allclose(projection.balances, expected, rtol=1e-12)
+
+
+def test_consolidation_identity():
+    network = random_network(BANK, n_entities=60, n_groups=5, n_periods=12, growth={"Loans": 0.01},
+                             runoff={"Deposits": 0.003}, seed=1)
+    # Per-entity risk weights: consolidated RWA must use each entity's own table
+    weights = np.zeros((60, 1, len(DEFAULT_SCHEMA.items)))
+    weights[..., DEFAULT_SCHEMA.index["Loans"]] = np.random.default_rng(1).uniform(0.5, 1.5, (60, 1))
+    weights[..., DEFAULT_SCHEMA.index["Investments"]] = 0.5
+
+    consolidated = network.consolidate()
+    entity_ratios = network.ratios(risk_weights=weights)
+    group_ratios = network.consolidated_ratios(risk_weights=weights)
+    groups = pd.Series(network.groups, index=network.entities)
+    entity_ratios["Group"] = groups.loc[entity_ratios["Entity"]].to_numpy()
+
+    assert consolidated.entities == sorted(set(network.groups))
+    for g, name in enumerate(consolidated.entities):
+        members = network.groups == name
+        # Balances: the group is the sum of its entities, item by item
+        np.testing.assert_allclose(consolidated.balances[g], network.balances[members].sum(axis=0), rtol=1e-12)
+    sums = entity_ratios.groupby(["Group", "Period"])[["Total Assets", "Total Liabilities", "Equity", "RWA"]].sum()
+    group_ratios = group_ratios.set_index(["Entity", "Period"])
+    np.testing.assert_allclose(group_ratios[sums.columns].to_numpy(), sums.to_numpy(), rtol=1e-12)
+    # Ratios of sums, not sums or means of ratios
+    capital = consolidated.item("Capital").ravel()
+    np.testing.assert_allclose(group_ratios["Basel Ratio"].to_numpy(), capital / sums["RWA"].to_numpy(), rtol=1e-12)
+    assert (group_ratios["Equity"] == group_ratios["Total Assets"] - group_ratios["Total Liabilities"]).all()
+
+
+def test_single_bank_matches_script_formulas():
+    data = {"Item": list(BANK), "Value (R$)": list(BANK.values()),
+            "Type": ["Asset", "Asset", "Asset", "Liability", "Liability", "Liability", "Equity"]}
+    projection = BalanceProjection.project([data["Value (R$)"]], n_periods=3, schema=BalanceSchema.from_data(data))
+    row = projection.ratios(risk_weights={"Loans": 1.0, "Investments": 0.5}).iloc[-1]
+    assert row["Total Assets"] == 10_500_000 and row["Total Liabilities"] == 8_800_000
+    assert row["RWA"] == 7_750_000
+    assert row["Liquidity Ratio"] == 0.25 and row["Leverage Ratio"] == 10.5
+    assert row["Basel Ratio"] == pytest.approx(1_000_000 / 7_750_000)
+
+
+def test_schema_is_checked():
+    with pytest.raises(ValueError, match="Reserve"):
+        BalanceSchema(["Loans"], ["Reserve"])
+    with pytest.raises(KeyError, match="Bonds"):
+        DEFAULT_SCHEMA.vector({"Bonds": 1.0})
@@ -0,0 +1,82 @@
+# test_batch_stream.py
+#
+# Streaming a CSV in chunks must write exactly what score_batch gives for the
+# whole file, whatever the chunk boundaries, in CSV and Parquet.
+
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch_stream import stream_scores
+from outputs import evict, new_output_path
+from scoring import INPUT_COLUMNS, score_batch
+
+COLUMNS = INPUT_COLUMNS + ["valor_garantia"]
+
+
+def _read(path, fmt):
+    if fmt == "csv":
+        return pd.read_csv(path, index_col="Company")
+    return pd.read_parquet(path)
+
+
+def _batch_csv(n_rows, seed=0):
+    # Small integers give zero denominators and exact threshold ties
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.integers(0, 60, (n_rows, len(COLUMNS))).astype(float), columns=COLUMNS)
+    df["extra"] = "ignored"
+    return df, df.to_csv(index=False).encode()
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+@pytest.mark.parametrize("chunksize", [1, 7, 250, 1_000])
+def test_chunks_match_score_batch(tmp_path, fmt, chunksize):
+    df, data = _batch_csv(250)
+    out = tmp_path / f"scores.{fmt}"
+    progress = []
+    rows, counts = stream_scores(io.BytesIO(data), out, fmt=fmt, chunksize=chunksize,
+                                 progress=lambda fraction, done: progress.append((fraction, done)))
+
+    esperado = score_batch(df)
+    esperado.index = pd.RangeIndex(1, len(df) + 1, name="Company")
+    obtido = _read(out, fmt)
+    assert rows == len(df)
+    assert counts.to_dict() == esperado["Rating"].value_counts().reindex(list("ABCD"), fill_value=0).to_dict()
+    pd.testing.assert_frame_equal(obtido, esperado, check_dtype=False, check_index_type=False)
+    assert progress[-1] == (1.0, len(df))
+    assert [done for _, done in progress[:-1]] == list(range(chunksize, len(df), chunksize)) + [len(df)]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+@pytest.mark.parametrize("data", [b"", (",".join(COLUMNS) + "\n").encode()], ids=["empty", "header-only"])
+def test_empty_input_gives_readable_empty_file(tmp_path, fmt, data):
+    out = tmp_path / f"scores.{fmt}"
+    rows, counts = stream_scores(io.BytesIO(data), out, fmt=fmt)
+    assert rows == 0 and counts.sum() == 0
+    obtido = _read(out, fmt)
+    assert len(obtido) == 0
+    assert list(obtido.columns) == list(score_batch(_batch_csv(1)[0]).columns)
+
+
+def test_path_source(tmp_path):
+    df, data = _batch_csv(30)
+    source = tmp_path / "batch.csv"
+    source.write_bytes(data)
+    rows, _ = stream_scores(str(source), tmp_path / "scores.csv", chunksize=8)
+    assert rows == 30
+
+
+def test_outputs_are_evicted_by_age_and_size(tmp_path):
+    paths = [new_output_path(".csv", directory=tmp_path) for _ in range(4)]
+    for k, path in enumerate(paths):
+        with open(path, "wb") as f:
+            f.write(b"x" * 100)
+        os.utime(path, (1_000 + k, 1_000 + k))
+
+    # The oldest file is past the age limit, the next one goes for size
+    assert evict(tmp_path, max_age=2.5, max_total_bytes=250, now=1_003) == paths[:2]
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(p) for p in paths[2:])
+    assert evict(tmp_path, max_age=2.5, max_total_bytes=250, now=1_003) == []
@@ -0,0 +1,50 @@
+# test_benchmarks.py
+#
+# Stage timings are collected outside the timed runs, and the regression
+# check only compares runs of the same model and size on the same machine.
+
+import importlib
+
+import pytest
+
+from financial_models import benchmarks
+
+
+def _run(seconds, stages=False, node="a"):
+    resultado = {"model": "loan", "size": 1_000, "seconds": seconds}
+    if stages:
+        resultado["stages"] = {"amortization_engine.amortization_arrays": seconds}
+    return {"machine": {"node": node, "cpus": 1}, "results": [resultado]}
+
+
+def test_stages_leave_the_engine_unwrapped():
+    resultado = benchmarks.measure("loan", 1_000, repeats=1, memory=False, stages=True)
+    assert "amortization_engine.amortization_arrays" in resultado["stages"]
+    engine = importlib.import_module("amortization_engine")
+    assert not hasattr(engine.amortization_arrays, "__instrumented__")
+
+
+def test_compare_flags_regressions():
+    history = [_run(1.0), _run(1.1), _run(0.9)]
+    run = _run(1.5)
+    assert benchmarks.compare(run, history) == run["results"]
+    assert run["results"][0]["baseline_seconds"] == 1.0
+    run = _run(1.2)
+    assert benchmarks.compare(run, history) == []
+
+
+def test_compare_keeps_machines_apart():
+    history = [_run(1.0, stages=True), _run(0.1, node="b")]
+    # The --stages run is a baseline like any other, the other machine is not
+    run = _run(0.5)
+    assert benchmarks.compare(run, history) == []
+    assert run["results"][0]["baseline_seconds"] == 1.0
+    run = _run(0.5, node="c")
+    benchmarks.compare(run, history)
+    assert "baseline_seconds" not in run["results"][0]
+
+
+@pytest.mark.parametrize("name", list(benchmarks.BENCHMARKS))
+def test_every_benchmark_runs(name):
+    resultado = benchmarks.measure(name, 1_000, repeats=1, memory=False)
+    assert resultado["seconds"] > 0 and resultado["throughput"] > 0
@@ -0,0 +1,43 @@
+# test_bulk_reports.py
+#
+# The ZIP must hold one valid PDF per company, named after its row and the
+# rating score_batch gives it.
+
+import io
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bulk_reports import export_reports_zip
+from report_cache import REPORT_INPUTS
+from scoring import score_batch
+
+
+def test_one_pdf_per_company():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.uniform(1e5, 1e7, (7, len(REPORT_INPUTS))).round(2), columns=REPORT_INPUTS)
+    df.loc[3, "passivo_circulante"] = 0  # indicators missing in the report
+    out = io.BytesIO()
+    progress = []
+
+    stats = export_reports_zip(df, out, max_workers=2, batch_size=3,
+                               progress=lambda done, total: progress.append((done, total)))
+
+    ratings = score_batch(df)["Rating"].tolist()
+    with zipfile.ZipFile(out) as archive:
+        assert archive.testzip() is None
+        names = archive.namelist()
+        assert names == [f"company_{k + 1:06d}_{rating}.pdf" for k, rating in enumerate(ratings)]
+        for name in names:
+            pdf = archive.read(name)
+            assert pdf.startswith(b"%PDF-") and pdf.rstrip().endswith(b"%%EOF"), name
+            assert b"/Count 3" in pdf, name  # summary, bar chart and radar pages
+    assert stats["reports"] == len(df)
+    assert progress == [(3, 7), (6, 7), (7, 7)]
+
+
+def test_missing_columns():
+    with pytest.raises(ValueError, match="valor_garantia"):
+        export_reports_zip(pd.DataFrame(columns=REPORT_INPUTS[:-1]), io.BytesIO())
@@ -0,0 +1,48 @@
+# test_cli.py
+#
+# The command line runs the models headless: no matplotlib unless a plot is
+# asked for, and the npv summary written with npv_io.
+
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+import financial_models
+from financial_models.cli import main
+
+
+@pytest.mark.parametrize("name", list(financial_models.MODELS))
+def test_load_does_not_import_matplotlib(name):
+    codigo = (f"import sys, financial_models; financial_models.load({name!r}); "
+              "print('matplotlib' in sys.modules)")
+    saida = subprocess.run([sys.executable, "-c", codigo], cwd=financial_models.ROOT,
+                           capture_output=True, text=True, check=True).stdout
+    assert saida.strip() == "False"
+
+
+def test_loan_numbers_only(capsys):
+    resultado = main(["loan", "--principal", "12000", "--rate", "12", "--years", "1"])
+    assert len(resultado["schedule"]) == 12
+    assert "Monthly payment: R$ 1,066.19" in capsys.readouterr().out
+
+
+def test_npv_summary_output(tmp_path):
+    pytest.importorskip("openpyxl")
+    output = tmp_path / "summary.csv"
+    resultado = main(["npv", "-o", str(output)])
+    written = pd.read_csv(output)
+    assert list(written["Project"]) == list(resultado["summary"]["Project"])
+    assert (written["NPV"] - resultado["summary"]["NPV"]).abs().max() < 1e-6
+
+
+def test_plot_save(tmp_path):
+    pytest.importorskip("matplotlib")
+    main(["bank", "--scenarios", "100", "--months", "12", "--plot", "save", "--output-dir", str(tmp_path)])
+    assert (tmp_path / "bank_1.png").stat().st_size > 0
+
+
+def test_unknown_model():
+    with pytest.raises(KeyError, match="loan"):
+        financial_models.load("bond")
@@ -0,0 +1,63 @@
+# test_credit_filters.py
+#
+# CreditIndex against the mask + describe() filtering it replaces, including
+# rows with missing keys.
+
+import numpy as np
+import pytest
+
+from credit_filters import CreditIndex, random_clients
+
+QUERIES = [((25, 60), (400, 800), ["Low", "Medium"]), ((18, 74), (300, 850), None),
+           ((40, 40), (500, 700), ["High"]), ((80, 90), (300, 850), None)]
+
+
+def _mask(df, age_range, score_range, risk_levels):
+    levels = df["Risk_Level"].dropna().unique() if risk_levels is None else risk_levels
+    return (df["Age"].between(*age_range) & df["Credit_Score"].between(*score_range)
+            & df["Risk_Level"].isin(levels))
+
+
+def _with_missing(n=20_000, seed=0):
+    df = random_clients(n, seed=seed)
+    df["Age"] = df["Age"].astype(float)
+    df["Credit_Score"] = df["Credit_Score"].astype(float)
+    rng = np.random.default_rng(seed)
+    for col in ["Risk_Level", "Age", "Credit_Score", "Monthly_Income"]:
+        df.loc[rng.choice(n, 50, replace=False), col] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("df", [random_clients(20_000, seed=1), _with_missing()], ids=["complete", "missing"])
+@pytest.mark.parametrize("age_range, score_range, risk_levels", QUERIES)
+def test_matches_mask(df, age_range, score_range, risk_levels):
+    index = CreditIndex(df)
+    mask = _mask(df, age_range, score_range, risk_levels)
+    assert index.count(age_range, score_range, risk_levels) == mask.sum()
+    assert index.rows(age_range, score_range, risk_levels).index.equals(df.index[mask])
+    if mask.sum() > 1:
+        stats = ["count", "mean", "std", "min", "max"]
+        esperado = df[mask].describe().loc[stats]
+        summary = index.summary(age_range, score_range, risk_levels).loc[stats, esperado.columns]
+        assert np.allclose(summary, esperado, rtol=1e-6, atol=1e-6, equal_nan=True)
+
+
+def test_missing_keys_are_left_out():
+    df = _with_missing()
+    index = CreditIndex(df)
+    missing = df[["Risk_Level", "Age", "Credit_Score"]].isna().any(axis=1)
+    assert index.n_missing == missing.sum()
+    assert index.count((0, 200), (0, 1_000)) == (~missing).sum()
+    assert set(index.levels) == {"Low", "Medium", "High"}
+
+
+def test_extremes_by_level_and_empty_selection():
+    df = _with_missing()
+    index = CreditIndex(df)
+    mask = _mask(df, (30, 50), (450, 700), None)
+    for stat in ["min", "max"]:
+        esperado = df[mask].groupby("Risk_Level")[index.value_cols].agg(stat)
+        obtido = index.summary_by_level((30, 50), (450, 700), stat=stat)
+        assert np.allclose(obtido.loc[esperado.index], esperado, equal_nan=True)
+    vazio = index.summary((100, 120), (300, 850))
+    assert (vazio.loc["count"] == 0).all() and vazio.loc[["min", "max"]].isna().all().all()
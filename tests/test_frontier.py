@@ -0,0 +1,45 @@
+# test_frontier.py
+#
+# The warm-started, parallel and linprog sweeps must find the same optimal
+# returns, with allocations inside the budget, risk cap and bounds.
+
+import numpy as np
+import pytest
+
+from frontier import frontier, highspy_available, random_model
+
+BUDGETS = np.linspace(2_000, 40_000, 4)
+RISK_CAPS = np.linspace(0.5, 30, 6)
+
+
+def _check_feasible(model, df):
+    units = df[model.labels].to_numpy()
+    ok = df["Status"] == "optimal"
+    assert ok.all()
+    costs, risks = model.A_ub[0].toarray().ravel(), model.A_ub[1].toarray().ravel()
+    assert (units @ costs <= df["Budget"].to_numpy() * (1 + 1e-9)).all()
+    assert (units @ risks <= df["Max_Risk"].to_numpy() * (1 + 1e-9)).all()
+    assert (units >= model.lower - 1e-9).all() and (units <= model.upper + 1e-9).all()
+
+
+@pytest.mark.parametrize("solver", ["warm", "parallel"])
+def test_solvers_agree_with_linprog(solver):
+    if solver == "warm" and not highspy_available():
+        pytest.skip("highspy is not installed")
+    model = random_model(300, seed=1)
+    reference = frontier(model, BUDGETS, RISK_CAPS, solver="linprog")
+    df = frontier(model, BUDGETS, RISK_CAPS, solver=solver, max_workers=2)
+
+    assert df.attrs["solver"] == solver
+    assert df[["Budget", "Max_Risk"]].equals(reference[["Budget", "Max_Risk"]])
+    _check_feasible(model, df)
+    np.testing.assert_allclose(df["Return"], reference["Return"], rtol=1e-9)
+
+
+def test_infeasible_points_are_reported():
+    # A minimum holding that costs more than the budget
+    model = random_model(50, seed=2)
+    model.lower[:] = 1.0
+    df = frontier(model, [10.0], [100.0], solver="linprog")
+    assert df["Status"].tolist() == ["infeasible"]
+    assert df[model.labels].isna().all(axis=None)
@@ -0,0 +1,51 @@
+# test_instrument.py
+#
+# Opt-in stage instrumentation: no effect when off, and tracemalloc left as
+# the caller had it.
+
+import tracemalloc
+
+import pytest
+
+from financial_models import instrument
+
+
+@pytest.fixture(autouse=True)
+def _off():
+    instrument.disable()
+    instrument.reset()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+def test_stage_is_a_no_op_when_disabled():
+    with instrument.stage("bloco"):
+        pass
+    assert instrument.stats() == {}
+
+
+def test_nested_stages():
+    instrument.enable("time", "memory")
+    with instrument.stage("externo"):
+        with instrument.stage("interno"):
+            dados = bytearray(5 * 2**20)
+        del dados
+    stats = instrument.stats()
+    assert stats["externo"]["calls"] == stats["interno"]["calls"] == 1
+    assert stats["externo"]["peak_bytes"] >= stats["interno"]["peak_bytes"] >= 5 * 2**20
+
+
+def test_disable_stops_only_its_own_tracing():
+    instrument.enable("memory")
+    assert tracemalloc.is_tracing()
+    instrument.disable()
+    assert not tracemalloc.is_tracing()
+
+    tracemalloc.start()
+    try:
+        instrument.enable("memory")
+        instrument.disable()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
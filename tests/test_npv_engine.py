@@ -0,0 +1,40 @@
+# test_npv_engine.py
+#
+# The batch engine against numpy_financial called project by project.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from npv_engine import check_against_npf, evaluate_projects, irr_batch
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_numpy_financial(seed):
+    # Both sides are rounded (NPV to cents, IRR to 4 places) after summing in
+    # a different order, so at most one unit of the last digit apart
+    worst_npv, worst_irr = check_against_npf(1_000, seed)
+    assert worst_npv <= 0.01
+    assert worst_irr <= 1e-4
+
+
+def test_irr_status():
+    cash = np.array([
+        [-100.0, 110.0, 0.0],     # single root, 10%
+        [-100.0, 230.0, -132.0],  # roots at 10% and 20%
+        [100.0, 100.0, 0.0],      # never changes sign
+    ])
+    irr, status, n_roots = irr_batch(cash)
+    assert irr[0] == pytest.approx(0.1) and status[0] == "ok"
+    assert irr[1] == pytest.approx(0.1) and status[1] == "multiple" and n_roots[1] == 2
+    assert np.isnan(irr[2]) and status[2] == "no_root"
+
+
+def test_summary_columns():
+    df = pd.DataFrame({"Project": ["A"] * 3 + ["B"] * 2, "Year": [0, 1, 2, 0, 1],
+                       "Cash_Flow": [-1_000.0, 600.0, 600.0, -500.0, 100.0], "Discount_Rate": 0.1})
+    result = evaluate_projects(df).set_index("Project")
+    assert result.at["A", "NPV"] == round(-1_000 + 600 / 1.1 + 600 / 1.21, 2)
+    assert result.at["A", "Payback_Year"] == 2
+    assert pd.isna(result.at["B", "Payback_Year"])
+    assert result.at["B", "ROI"] == -0.8
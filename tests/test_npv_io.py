@@ -0,0 +1,79 @@
+# test_npv_io.py
+#
+# Tables round-trip through every format, and the Feather copy of an Excel
+# input is reused only while the workbook is unchanged.
+
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("openpyxl")
+pytest.importorskip("pyarrow")
+
+import npv_io
+from npv_io import read_table, write_table
+
+
+def _frame(n=4):
+    return pd.DataFrame({"Project": [f"P{k}" for k in range(n)], "Year": range(n),
+                         "Cash_Flow": [-1_000.0 + 250.5 * k for k in range(n)]})
+
+
+@pytest.mark.parametrize("ext", [".csv", ".parquet", ".feather", ".xlsx"])
+def test_round_trip(tmp_path, ext):
+    path = tmp_path / f"flows{ext}"
+    write_table(_frame(), path)
+    pd.testing.assert_frame_equal(read_table(path, cache_dir=tmp_path / "cache"), _frame())
+
+
+def test_unknown_extension():
+    with pytest.raises(ValueError, match=".txt"):
+        read_table("flows.txt")
+
+
+def test_excel_cache_invalidation(tmp_path):
+    path = tmp_path / "flows.xlsx"
+    cache = tmp_path / "cache"
+    write_table(_frame(), path)
+
+    df, hit = npv_io._read_excel_cached(path, cache)
+    assert not hit
+    pd.testing.assert_frame_equal(df, _frame())
+    # Same size and mtime: the Feather copy is read
+    assert npv_io._read_excel_cached(path, cache)[1]
+
+    # Only the mtime changed (file copied or touched): same hash, still a hit
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert npv_io._read_excel_cached(path, cache)[1]
+
+    # New content: parsed again, and the new values are returned
+    write_table(_frame(6), path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    df, hit = npv_io._read_excel_cached(path, cache)
+    assert not hit
+    pd.testing.assert_frame_equal(df, _frame(6))
+    assert npv_io._read_excel_cached(path, cache)[1]
+
+
+def test_same_name_in_other_folder_is_not_shared(tmp_path):
+    cache = tmp_path / "cache"
+    for folder, n in [("a", 3), ("b", 5)]:
+        os.makedirs(tmp_path / folder)
+        write_table(_frame(n), tmp_path / folder / "flows.xlsx")
+    assert len(read_table(tmp_path / "a" / "flows.xlsx", cache_dir=cache)) == 3
+    assert len(read_table(tmp_path / "b" / "flows.xlsx", cache_dir=cache)) == 5
+
+
+def test_without_pyarrow_the_workbook_is_parsed_once(tmp_path, monkeypatch):
+    path = tmp_path / "flows.xlsx"
+    write_table(_frame(), path)
+    calls = []
+    read_excel = pd.read_excel
+    monkeypatch.setattr(npv_io, "_has_pyarrow", lambda: False)
+    monkeypatch.setattr(npv_io.pd, "read_excel", lambda *a, **k: calls.append(a) or read_excel(*a, **k))
+
+    pd.testing.assert_frame_equal(read_table(path, cache_dir=tmp_path / "cache"), _frame())
+    assert len(calls) == 1
+    assert not (tmp_path / "cache").exists()
@@ -0,0 +1,71 @@
+# test_optimizer.py
+#
+# Solutions must satisfy every constraint of the book: budget, risk, bounds,
+# sector caps, turnover and whole lots.
+
+import itertools
+
+import numpy as np
+import pytest
+
+from frontier import PortfolioModel
+from optimizer import add_sector_caps, optimize, random_book, sector_matrix
+
+TOL = 1e-6
+
+
+def _check_constraints(model, resultado, current=None, max_turnover=None, lots=None):
+    units = resultado["units"]
+    assert resultado["status"] == "optimal"
+    # Budget, risk and sector rows are all in A_ub
+    assert (model.A_ub @ units <= model.b_ub * (1 + TOL) + TOL).all()
+    assert (units >= model.lower - TOL).all() and (units <= model.upper + TOL).all()
+    if max_turnover is not None:
+        costs = model.A_ub[0].toarray().ravel()
+        assert resultado["Turnover"] == pytest.approx(costs @ np.abs(units - current))
+        assert resultado["Turnover"] <= max_turnover * (1 + TOL)
+    if lots is not None:
+        assert (resultado["lots"] * lots == units).all()
+
+
+def test_lp_with_sector_caps_and_turnover():
+    model, current, _ = random_book(400, n_sectors=8, seed=0)
+    max_turnover = 0.2 * model.b_ub[0]
+    resultado = optimize(model, current=current, max_turnover=max_turnover)
+    _check_constraints(model, resultado, current, max_turnover)
+    # Dropping the turnover limit can only raise the return
+    assert optimize(model)["Return"] >= resultado["Return"] - TOL
+
+
+def test_milp_lots_satisfy_every_constraint():
+    model, current, lots = random_book(150, n_sectors=5, seed=1)
+    max_turnover = 0.2 * model.b_ub[0]
+    resultado = optimize(model, current=current, max_turnover=max_turnover, lot_size=lots, time_limit=30)
+    _check_constraints(model, resultado, current, max_turnover, lots)
+    assert resultado["solver"] == "milp" and resultado["lots"].dtype == np.int64
+    # The LP relaxation bounds the integer optimum
+    relaxed = optimize(model, current=current, max_turnover=max_turnover)
+    assert resultado["Return"] <= relaxed["Return"] * (1 + TOL)
+
+
+def test_milp_matches_enumeration():
+    # Three assets small enough to try every combination of lots
+    lots = np.array([10, 5, 1])
+    model = PortfolioModel([1.0, 0.6, 0.15], [100.0, 55.0, 12.0], [0.3, 0.1, 0.05],
+                           total_budget=2_000, max_total_risk=4.0, upper=[60, 40, 30])
+    add_sector_caps(model, ["A", "B", "B"], {"B": 900})
+    resultado = optimize(model, lot_size=lots, mip_gap=0)
+    _check_constraints(model, resultado, lots=lots)
+
+    best = -np.inf
+    for y in itertools.product(*(range(int(u // l) + 1) for u, l in zip(model.upper, lots))):
+        units = np.array(y) * lots
+        if (model.A_ub @ units <= model.b_ub + TOL).all():
+            best = max(best, model.expected_returns @ units)
+    assert resultado["Return"] == pytest.approx(best)
+
+
+def test_sector_matrix():
+    matrix, names = sector_matrix(["x", "y", "x"], [10.0, 20.0, 30.0])
+    assert names == ["x", "y"]
+    assert matrix.toarray().tolist() == [[10.0, 0.0, 30.0], [0.0, 20.0, 0.0]]
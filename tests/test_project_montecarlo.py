@@ -0,0 +1,52 @@
+# test_project_montecarlo.py
+#
+# Random discount rates must never reach r <= -1, where (1 + r)^-t is
+# infinite or flips sign, and must give NPVs on a plausible scale.
+
+import numpy as np
+import pytest
+from scipy import integrate, stats
+
+from project_montecarlo import RATE_FLOOR, simulate_project
+
+FLOWS = [-100_000.0] + [{"dist": "normal", "mean": 30_000, "sd": 3_000}] * 5
+
+
+def _expected_npv(mean, sd):
+    # E[NPV] = sum_t E[CF_t] E[(1 + r)^-t]: the rate is independent of the flows
+    t = np.arange(6)
+    cash = np.array([-100_000.0] + [30_000.0] * 5)
+    discount = [integrate.quad(lambda r: (1 + r) ** -k * stats.norm.pdf(r, mean, sd), RATE_FLOOR, np.inf)[0]
+                for k in t]
+    return float(cash @ discount)
+
+
+def test_wide_normal_rate_is_rejected():
+    # N(10%, 60%) puts 3% of the draws below -100%: the NPV would be garbage
+    with pytest.raises(ValueError, match="-99%"):
+        simulate_project(FLOWS, {"dist": "normal", "mean": 0.1, "sd": 0.6}, n_simulations=100)
+
+
+def test_widest_accepted_normal_rate_gives_plausible_npv():
+    # mean - 6 sd = -80%: accepted, and the mean NPV matches the integral
+    resultado = simulate_project(FLOWS, {"dist": "normal", "mean": 0.1, "sd": 0.15},
+                                 n_simulations=400_000, seed=0, return_npv=True)
+    npv = resultado["npv"]
+    assert np.isfinite(npv).all()
+    esperado = _expected_npv(0.1, 0.15)
+    assert abs(resultado["npv_mean"] - esperado) < 5 * npv.std() / np.sqrt(len(npv))
+    # P99 is about the NPV at the rate's 1st percentile (-25%): R$ 285k
+    assert -100_000 < resultado["npv_percentiles"][1] < resultado["npv_percentiles"][99] < 400_000
+
+
+@pytest.mark.parametrize("rate", [-1.0, RATE_FLOOR,
+                                  {"dist": "triangular", "low": -1.2, "mode": 0.1, "high": 0.2},
+                                  {"dist": "normal", "mean": -1.0, "sd": 0.1}])
+def test_rates_at_or_below_floor_are_rejected(rate):
+    with pytest.raises(ValueError):
+        simulate_project(FLOWS, rate, n_simulations=100)
+
+
+def test_narrow_rate_matches_integral():
+    resultado = simulate_project(FLOWS, {"dist": "normal", "mean": 0.1, "sd": 0.01}, n_simulations=50_000, seed=0)
+    assert resultado["npv_mean"] == pytest.approx(_expected_npv(0.1, 0.01), abs=200)
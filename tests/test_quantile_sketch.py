@@ -0,0 +1,63 @@
+# test_quantile_sketch.py
+#
+# VaR/ES from the t-digest against np.percentile on the full loss vector, and
+# digests merged from parallel parts against one digest fed every chunk.
+
+import numpy as np
+import pytest
+
+from quantile_sketch import TOLERANCIA, TDigest, accuracy_check, merge_all
+from var_engine import covariance_from_vols, simulate_var
+
+NIVEIS = [0.95, 0.99, 0.999]
+
+
+def _perdas(n, seed=0):
+    # Skewed losses, like portfolios compounded day by day
+    rng = np.random.default_rng(seed)
+    return 1_000_000 * (1 - np.exp(rng.normal(0.003, 0.06, n)))
+
+
+def _digest(perdas, chunk_size=10_000):
+    d = TDigest()
+    for inicio in range(0, len(perdas), chunk_size):
+        d.update(perdas[inicio:inicio + chunk_size])
+    return d
+
+
+@pytest.mark.parametrize("n", [10_000, 100_000, 1_000_000])
+def test_var_es_against_percentile(n):
+    # Digests built in chunks and merged from parts, as in the parallel runs
+    linhas = accuracy_check(sizes=[n], niveis=NIVEIS)
+    assert [nivel for _, nivel, _, _, _ in linhas] == NIVEIS
+    for _, nivel, erro_var, erro_es, _ in linhas:
+        assert erro_var < TOLERANCIA and erro_es < TOLERANCIA, nivel
+
+
+@pytest.mark.parametrize("n", [10_000, 100_000, 1_000_000])
+def test_merged_parts_match_single_digest(n):
+    perdas = _perdas(n, seed=1)
+    unico = _digest(perdas)
+    mesclado = merge_all(_digest(parte) for parte in np.array_split(perdas, 8))
+    escala = perdas.std()
+    assert mesclado.count == unico.count == n
+    assert (mesclado.min, mesclado.max) == (unico.min, unico.max) == (perdas.min(), perdas.max())
+    for nivel in NIVEIS:
+        var_unico, es_unico = unico.var_es(nivel)
+        var_mesclado, es_mesclado = mesclado.var_es(nivel)
+        assert abs(var_mesclado - var_unico) / escala < TOLERANCIA, nivel
+        assert abs(es_mesclado - es_unico) / escala < TOLERANCIA, nivel
+    counts, _ = mesclado.histogram(100)
+    assert counts.sum() == pytest.approx(n)
+
+
+def test_simulate_var_estimators_agree():
+    # Same seed, same scenarios: only the estimator differs
+    kwargs = dict(valor_carteira=1_000_000, pesos=[0.5, 0.3, 0.2], retornos_anuais=[0.08, 0.05, 0.1],
+                  covariancia_anual=covariance_from_vols([0.2, 0.15, 0.3]), n_simulacoes=200_000,
+                  seed=3)
+    exato = simulate_var(**kwargs, estimator="exact", return_losses=True)
+    digest = simulate_var(**kwargs, estimator="tdigest")
+    escala = exato["perdas"].std()
+    assert abs(digest["VaR"] - exato["VaR"]) / escala < TOLERANCIA
+    assert abs(digest["ES"] - exato["ES"]) / escala < TOLERANCIA
@@ -0,0 +1,40 @@
+# test_scenario_grid.py
+#
+# The vectorized rate x shock grid against npf.npv / npf.irr per scenario.
+
+import numpy as np
+import pytest
+
+import scenario_grid
+from scenario_grid import check_against_loop, evaluate_grid, tornado
+
+
+@pytest.mark.parametrize("cash_flows, shocks", [
+    ([-100_000.0, 20_000, 25_000, 30_000, 30_000, 25_000], np.linspace(0.5, 1.5, 21)),
+    ([-500.0, 400, 300, -200, 100], np.linspace(0.2, 2.0, 19)),  # non-conventional flows
+])
+def test_matches_numpy_financial(cash_flows, shocks):
+    worst_npv, worst_irr = check_against_loop(cash_flows, np.linspace(0.0, 0.3, 16), shocks)
+    assert worst_npv < 1e-6
+    assert worst_irr < 1e-9
+
+
+def test_missing_irr_positions_are_compared(monkeypatch):
+    # No sign change: no IRR in any scenario, on both sides
+    cash_flows = [-1_000.0, -200, -100]
+    assert check_against_loop(cash_flows, [0.0, 0.1], np.linspace(0.5, 1.5, 5)) == (0.0, 0.0)
+    # An IRR on one side only is a mismatch, not a difference nanmax skips
+    monkeypatch.setattr(scenario_grid, "irr_unique", lambda flows: np.full(len(flows), 0.05))
+    assert check_against_loop(cash_flows, [0.0, 0.1], np.linspace(0.5, 1.5, 5))[1] == np.inf
+
+
+def test_per_year_shocks_and_tornado():
+    cash_flows = [-1_000.0, 400, 400, 400]
+    shocks = np.array([[1.0, 1.0, 1.0, 1.0], [1.2, 0.9, 0.9, 0.9]])
+    result = evaluate_grid(cash_flows, [0.0, 0.1], shocks)
+    assert result["npv"][0, 0] == pytest.approx(200)
+    assert result["npv"][1, 0] == pytest.approx(-1_200 + 1_080)
+    table = tornado(cash_flows, 0.1)
+    # Ranked by swing; +/-20% on the investment moves the NPV by 400
+    assert (np.diff(table["Swing"].to_numpy()) <= 0).all()
+    assert table["Driver"].iloc[0] == "Investment" and table["Swing"].iloc[0] == pytest.approx(400)
@@ -0,0 +1,75 @@
+# test_scoring.py
+#
+# score_batch must give every company the same indicators and rating as the
+# scalar rules used by the manual input.
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scoring import INDICATOR_NAMES, INPUT_COLUMNS, calculate_indicators, classify_rating, score_batch
+
+
+def random_financials(n, seed):
+    # Balance sheets on the scale of the app's manual input, in cents
+    rng = np.random.default_rng(seed)
+    ativo_total = rng.uniform(1e6, 5e7, n)
+    df = pd.DataFrame({c: ativo_total * rng.uniform(0.01, 1.5, n) for c in INPUT_COLUMNS})
+    df["ativo_total"] = ativo_total
+    df["lucro_liquido"] = ativo_total * rng.uniform(-0.02, 0.1, n)
+    df["valor_garantia"] = ativo_total * rng.uniform(0.1, 0.5, n)
+    return df.round(2)
+
+
+def _assert_same_as_scalar(df):
+    result = score_batch(df)
+    for i, row in enumerate(df.to_dict(orient="records")):
+        indicators = calculate_indicators(row)
+        rating, coverage = classify_rating(indicators)
+        for name in INDICATOR_NAMES:
+            esperado, obtido = indicators[name], result[name].iloc[i]
+            if esperado is None or math.isnan(esperado):
+                assert math.isnan(obtido), (i, name)
+            else:
+                assert obtido == esperado, (i, name)
+        assert result["Rating"].iloc[i] == rating, i
+        assert result["Coverage"].iloc[i] == coverage, i
+        assert result["Suggested Limit"].iloc[i] == row["valor_garantia"] * coverage
+
+
+def test_random_companies():
+    _assert_same_as_scalar(random_financials(5_000, seed=0))
+
+
+def test_small_integer_ratios():
+    # Ratios of small integers hit the rounding half-way points and the
+    # thresholds (1.5, 0.7, 1.2, 0.05, ...) exactly
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.integers(-20, 201, (5_000, len(INPUT_COLUMNS) + 1)).astype(float),
+                      columns=INPUT_COLUMNS + ["valor_garantia"])
+    _assert_same_as_scalar(df)
+
+
+@pytest.mark.parametrize("value", [0.0, np.nan])
+def test_zero_and_missing_columns(value):
+    base = random_financials(len(INPUT_COLUMNS), seed=2)
+    for k, col in enumerate(INPUT_COLUMNS):
+        base.loc[k, col] = value
+    _assert_same_as_scalar(base)
+
+
+def test_threshold_ties():
+    # Current Liquidity 1.5 / 1, Total Debt 0.5 / 0.7, DSCR 2 / 1.2, ROE 0.15 / 0.05
+    linhas = []
+    for cl, td, dscr, roe in [(1.5, 0.5, 2, 0.15), (1, 0.7, 1.2, 0.05), (1.49, 0.71, 1.19, 0.04)]:
+        linhas.append({
+            "ativo_circulante": cl * 100, "passivo_circulante": 100, "estoques": 10, "disponivel": 5,
+            "passivo_total": td * 1000, "ativo_total": 1000, "lucro_liquido": roe * 100,
+            "patrimonio_liquido": 100, "fluxo_caixa_operacional": dscr * 50, "servico_divida": 50,
+            "ebitda": 80, "valor_garantia": 1_000,
+        })
+    df = pd.DataFrame(linhas)
+    _assert_same_as_scalar(df)
+    assert score_batch(df)["Rating"].tolist() == ["A", "B", "D"]
@@ -0,0 +1,67 @@
+# test_scoring_service.py
+#
+# Request validation and the HTTP round trip of the scoring service.
+
+import asyncio
+import json
+import math
+
+import pytest
+
+from load_test import _request, random_companies
+from scoring import calculate_indicators, classify_rating
+from scoring_service import ScoringService, validate
+
+
+def _company(**valores):
+    return {**random_companies(1, seed=0)[0], **valores}
+
+
+def test_validate_accepts_numbers_and_null():
+    row = validate(_company(estoques=None, ativo_total=10**6))
+    assert math.isnan(row["estoques"]) and row["ativo_total"] == 1e6
+
+
+@pytest.mark.parametrize("value", [10**400, float("inf"), float("-inf"), float("nan"), "1", True, [1]])
+def test_validate_rejects(value):
+    with pytest.raises(ValueError):
+        validate(_company(ativo_total=value))
+
+
+def test_missing_field():
+    company = _company()
+    del company["ebitda"]
+    with pytest.raises(ValueError, match="ebitda"):
+        validate(company)
+
+
+async def _round_trip():
+    service = ScoringService(max_wait_ms=1)
+    host, port = await service.start("127.0.0.1", 0)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        company = _company()
+        respostas = [await _request(reader, writer, "POST", "/score", json.dumps(company).encode())]
+        # Out of range and non-finite values: 400 on the same connection (the
+        # repeated key overrides the valid ativo_total)
+        for literal in ["1" + "0" * 400, "1e400"]:
+            corpo = json.dumps(company)[:-1] + f', "ativo_total": {literal}}}'
+            respostas.append(await _request(reader, writer, "POST", "/score", corpo.encode()))
+        # Deeply nested JSON makes json.loads recurse past the limit
+        respostas.append(await _request(reader, writer, "POST", "/score", b"[" * 100_000))
+        respostas.append(await _request(reader, writer, "GET", "/health"))
+        return company, respostas
+    finally:
+        writer.close()
+        await service.stop()
+
+
+def test_http_round_trip():
+    company, respostas = asyncio.run(_round_trip())
+    (status, resultado), grande, infinito, aninhado, saude = respostas
+    rating, coverage = classify_rating(calculate_indicators(company))
+    assert status == 200 and resultado["Rating"] == rating and resultado["Coverage"] == coverage
+    assert grande[0] == 400 and "out of range" in grande[1]["error"]
+    assert infinito[0] == 400 and "finite" in infinito[1]["error"]
+    assert aninhado[0] == 400 and "nested" in aninhado[1]["error"]
+    assert saude == (200, {"status": "ok"})
@@ -0,0 +1,69 @@
+# test_stress_engine.py
+#
+# Stressed indicators against the scalar formulas of bank_balance_simulation.py,
+# and breach flags on both sides of each threshold.
+
+import numpy as np
+import pytest
+
+from stress_engine import SHOCKS, THRESHOLDS, breach_summary, random_scenarios, stress_test
+
+# The bank of bank_balance_simulation.py (the script runs its report on import)
+BANK = {"deposits": 8_000_000, "loans": 7_000_000, "reserves": 2_000_000, "capital": 1_000_000,
+        "investments": 1_500_000, "interbank_loans": 500_000, "short_term_debt": 300_000,
+        "rw_loans": 1.0, "rw_investments": 0.5, "rw_reserves": 0.0}
+
+
+def test_no_shock_matches_scalar_indicators():
+    row = stress_test({"loan_loss": [0.0]}, BANK).iloc[0]
+    total_assets = 7_000_000 + 2_000_000 + 1_500_000
+    assert row["Equity"] == total_assets - (8_000_000 + 500_000 + 300_000)
+    assert row["RWA"] == 7_000_000 * 1.0 + 1_500_000 * 0.5
+    assert row["Liquidity_Ratio"] == 2_000_000 / 8_000_000
+    assert row["Leverage_Ratio"] == total_assets / 1_000_000
+    assert row["Basel_Ratio"] == 1_000_000 / 7_750_000
+    assert not row[["Breach_Basel", "Breach_Liquidity", "Breach_Leverage", "Insolvent", "Any_Breach"]].any()
+
+
+def test_breach_flags_at_thresholds():
+    # Loan losses that put the Basel ratio exactly at 8%, then just below:
+    # (1M - 7M x) / (7M (1 - x) + 0.75M) = 0.08
+    at_min = (1_000_000 - 0.08 * 7_750_000) / (7_000_000 * (1 - 0.08))
+    result = stress_test({"loan_loss": [at_min * (1 - 1e-9), at_min * (1 + 1e-6)]}, BANK)
+    assert result["Basel_Ratio"].iloc[0] >= THRESHOLDS["basel_min"]
+    assert result["Breach_Basel"].tolist() == [False, True]
+
+    # Deposit runs: reserves / deposits falls below 10% past a 16.7% run, and
+    # a run larger than the reserves becomes short-term funding
+    result = stress_test({"deposit_run": [0.16, 0.17, 0.3]}, BANK)
+    assert result["Breach_Liquidity"].tolist() == [False, True, True]
+    assert result["Funding_Gap"].tolist() == [0.0, 0.0, 400_000.0]
+    assert result["Liquidity_Ratio"].iloc[2] == 0.0
+
+
+def test_wiped_out_capital():
+    result = stress_test({"loan_loss": [0.15], "investment_markdown": [0.0]}, BANK)
+    row = result.iloc[0]
+    assert row["Capital"] == 1_000_000 - 1_050_000
+    assert row["Insolvent"] and row["Breach_Basel"] and row["Breach_Leverage"] and row["Any_Breach"]
+    assert row["Leverage_Ratio"] == np.inf
+
+
+def test_flags_match_ratios_on_random_scenarios():
+    result = stress_test(random_scenarios(20_000, seed=0), BANK, thresholds={"basel_min": 0.105})
+    assert (result["Breach_Basel"] == ~(result["Basel_Ratio"] >= 0.105)).all()
+    assert (result["Breach_Liquidity"] == (result["Liquidity_Ratio"] < THRESHOLDS["liquidity_min"])).all()
+    assert (result["Breach_Leverage"] == ~(result["Leverage_Ratio"] <= THRESHOLDS["leverage_max"])).all()
+    any_breach = result[["Breach_Basel", "Breach_Liquidity", "Breach_Leverage"]].any(axis=1)
+    assert (result["Any_Breach"] == any_breach).all()
+    summary = breach_summary(result)
+    assert summary.loc["Breach_Basel", "Scenarios"] == result["Breach_Basel"].sum()
+    assert summary.loc["Any_Breach", "Share"] == pytest.approx(any_breach.mean())
+
+
+def test_inputs_are_checked():
+    with pytest.raises(ValueError, match="capital"):
+        stress_test({"loan_loss": [0.1]}, {k: v for k, v in BANK.items() if k != "capital"})
+    with pytest.raises(ValueError, match="rate_shock"):
+        stress_test({"rate_shock": [0.1]}, BANK)
+    assert set(stress_test({}, BANK).columns) >= set(SHOCKS)